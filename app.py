@@ -4,29 +4,39 @@ The Mushroom Project — Dashboard interactif.
 Application Streamlit pour explorer visuellement l'analyse ACM,
 le clustering et la classification des champignons.
 
+Démarrage rapide : Plotly n'est importé qu'au premier graphique, et chaque
+page ne charge que les artefacts qu'elle affiche (coordonnées ACM, plis,
+tables, grilles pré-calculées), une fois pour toutes les sessions. Budget
+de la première page : ``python src/benchmark.py startup``.
+
 Lancer : streamlit run app.py
 """
 
 from __future__ import annotations
 
+import sys
 from pathlib import Path
+from typing import Callable, Optional
 
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
-from sklearn.cluster import KMeans
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
-from sklearn.metrics import classification_report, confusion_matrix, silhouette_score
-from sklearn.model_selection import cross_val_predict, cross_val_score
 
 # ── Configuration ─────────────────────────────────────────────
 
 ROOT = Path(__file__).resolve().parent
-DATA = ROOT / "data" / "processed"
 TABLES = ROOT / "reports" / "tables"
 GITHUB_URL = "https://github.com/Pchambet/mushroom-project"
+CLASS_COLORS = {"Comestible": "#2ecc71", "Vénéneux": "#e74c3c"}
+PENDING_POLL_S = 0.5           # vérification des calculs à la demande en cours (s)
+
+sys.path.insert(0, str(ROOT / "src"))
+from precomputed import (  # noqa: E402
+    CLASS_NAMES, DASHBOARD_DIR, BackgroundTasks, ClassificationGrid, ClusteringGrid, DensityTiles,
+    class_codes, compute_cell, compute_classification, files_digest, inputs_digest, variable_codes,
+)
+from scatter import MAX_POINTS, ScatterPoints, decimate, scatter_figure  # noqa: E402
+from utils import load_cv_folds, load_mca_coordinates, load_processed_data  # noqa: E402
 
 # ── Configuration page ───────────────────────────────────────
 
@@ -40,35 +50,181 @@ st.set_page_config(
 
 # ── Chargement des données ───────────────────────────────────
 
-@st.cache_data
-def load_data():
-    """Charge le dataset et les coordonnées ACM."""
-    df = pd.read_csv(DATA / "mushroom_processed.csv")
-    coords = pd.read_csv(DATA / "mca_coords.csv")
-    return df, coords
+@st.cache_resource
+def load_dataset():
+    """Charge le dataset (binaire projeté en mémoire).
+
+    ``cache_resource`` partage les objets entre sessions sans les copier :
+    ils ne doivent pas être modifiés en place.
+    """
+    return load_processed_data(mmap=True)
+
+
+@st.cache_resource
+def load_coordinates():
+    """Charge les coordonnées ACM (binaire projeté en mémoire)."""
+    return load_mca_coordinates(mmap=True)
+
+
+@st.cache_resource
+def load_folds():
+    """Charge les plis de validation croisée."""
+    return load_cv_folds(len(load_dataset()))
+
+
+def grid_version(files: tuple[str, ...]) -> str:
+    """Empreinte des fichiers d'une grille pré-calculée, clé de son cache."""
+    return files_digest(ROOT / DASHBOARD_DIR / name for name in files)
+
+
+@st.cache_resource(max_entries=2)
+def load_clustering_grid(version: str, inputs: str):
+    """Charge la grille de clustering pré-calculée par ``08_dashboard.py``.
+
+    Indexée sur l'empreinte de ses fichiers (``version``) : une grille
+    régénérée est relue. Partagée entre sessions, avec son cache LRU par
+    combinaison ; ``None`` si elle est absente ou issue d'autres données
+    que ``inputs`` (combinaisons calculées à la demande).
+    """
+    try:
+        return ClusteringGrid.load(ROOT / DASHBOARD_DIR, inputs=inputs)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@st.cache_resource(max_entries=2)
+def load_classification_grid(version: str, inputs: str):
+    """Charge les validations croisées pré-calculées par ``08_dashboard.py``.
+
+    Même invalidation que :func:`load_clustering_grid`.
+    """
+    try:
+        return ClassificationGrid.load(ROOT / DASHBOARD_DIR, inputs=inputs)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@st.cache_resource(max_entries=2)
+def load_density_tiles(version: str, inputs: str):
+    """Charge les tuiles de densité pré-calculées par ``08_dashboard.py``.
+
+    Même invalidation que :func:`load_clustering_grid` ; les tuiles lues
+    sont gardées en cache par couple d'axes et niveau.
+    """
+    try:
+        return DensityTiles.load(ROOT / DASHBOARD_DIR, inputs=inputs)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+@st.cache_resource
+def background_tasks():
+    """Calculs à la demande des combinaisons non pré-calculées, partagés entre sessions."""
+    return BackgroundTasks()
 
 
 @st.cache_data
-def load_tables():
-    """Charge toutes les tables CSV du projet."""
-    tables = {}
-    for f in TABLES.glob("*.csv"):
-        tables[f.stem] = pd.read_csv(f)
-    return tables
+def load_table(name: str) -> Optional[pd.DataFrame]:
+    """Charge une table CSV du projet (``None`` si elle est absente)."""
+    path = TABLES / f"{name}.csv"
+    return pd.read_csv(path) if path.exists() else None
+
+
+def require(loader: Callable):
+    """Artefact d'une page ; s'il manque, affiche la marche à suivre et arrête la page."""
+    try:
+        return loader()
+    except Exception:
+        st.error(
+            "**Données introuvables.** Le pipeline n'a pas été exécuté ou les fichiers "
+            "sont manquants. Pour générer les données :\n\n"
+            "```bash\n"
+            "git clone https://github.com/Pchambet/mushroom-project.git\n"
+            "cd mushroom-project\n"
+            "make install && make run-all\n"
+            "```\n\n"
+            f"Voir le [README]({GITHUB_URL}) pour plus de détails."
+        )
+        st.stop()
+
 
+def await_result(future, message: str):
+    """Résultat d'un calcul à la demande, sans bloquer l'exécution de la page.
 
-# ── Chargement sécurisé ──────────────────────────────────────
+    Tant que le calcul tourne en arrière-plan, la page affiche ``message``
+    et s'arrête là : un fragment vérifie le calcul toutes les
+    ``PENDING_POLL_S`` secondes et relance la page à la fin. Entre-temps,
+    l'utilisateur peut changer de réglage ou de page.
+    """
+    if future.done():
+        return future.result()
 
-try:
-    df, coords = load_data()
-    tables = load_tables()
-    data_ready = True
-except FileNotFoundError as e:
-    data_ready = False
-    load_error = str(e)
-except Exception as e:
-    data_ready = False
-    load_error = str(e)
+    @st.fragment(run_every=PENDING_POLL_S)
+    def pending():
+        if future.done():
+            st.rerun()
+        st.info(message, icon="⏳")
+
+    pending()
+    st.stop()
+
+
+# ── Nuages de points ─────────────────────────────────────────
+
+Range = Optional[tuple[float, float]]
+
+
+def raw_points(x: np.ndarray, y: np.ndarray, codes: np.ndarray, n_categories: int):
+    """Points de la vue calculés sur les individus (``scatter.decimate``)."""
+    return lambda x_range, y_range: decimate(x, y, codes, n_categories, x_range, y_range)
+
+
+def scatter_chart(
+    key: str,
+    view_points: Callable[[Range, Range], ScatterPoints],
+    names: list[str],
+    colors: dict[str, str] | None = None,
+    legend_title: str = "",
+    x_title: str = "",
+    y_title: str = "",
+    size: float = 4,
+    height: int = 500,
+) -> None:
+    """Nuage WebGL, agrégé côté serveur au-delà de ``scatter.MAX_POINTS`` individus.
+
+    ``view_points(x_range, y_range)`` fournit les points de la vue (cf.
+    :func:`raw_points`). Une sélection rectangulaire redessine la zone
+    choisie, ré-agrégée sur sa propre étendue (pleine résolution dès
+    qu'elle est assez petite) ; la vue est conservée par session sous ``key``.
+    """
+    view_key, generation_key = f"{key}:view", f"{key}:generation"
+    x_range, y_range = st.session_state.get(view_key, (None, None))
+    points = view_points(x_range, y_range)
+    fig = scatter_figure(points, names, colors, legend_title, x_title, y_title, x_range, y_range, size)
+    fig.update_layout(height=height, dragmode="select" if points.aggregated or x_range else "zoom")
+    # Nouvelle clé après chaque zoom : la sélection qui l'a déclenché est oubliée
+    event = st.plotly_chart(
+        fig, use_container_width=True, key=f"{key}:{st.session_state.get(generation_key, 0)}",
+        on_select="rerun", selection_mode="box",
+    )
+    boxes = event.selection.box if event else []
+    if boxes:
+        st.session_state[view_key] = (tuple(sorted(boxes[0]["x"])), tuple(sorted(boxes[0]["y"])))
+        st.session_state[generation_key] = st.session_state.get(generation_key, 0) + 1
+        st.rerun()
+
+    col_caption, col_reset = st.columns([4, 1])
+    if points.aggregated:
+        col_caption.caption(
+            f"{points.n_view:,} individus agrégés en {len(points.x):,} points (densité conservée) — "
+            "sélectionnez une zone pour l'afficher à pleine résolution."
+        )
+    elif x_range is not None:
+        col_caption.caption(f"Zone sélectionnée : {points.n_view:,} individus sur {points.n_total:,}.")
+    if x_range is not None and col_reset.button("Vue complète", key=f"{key}:reset"):
+        del st.session_state[view_key]
+        st.session_state[generation_key] = st.session_state.get(generation_key, 0) + 1
+        st.rerun()
 
 
 # ── Sidebar ──────────────────────────────────────────────────
@@ -101,25 +257,13 @@ st.sidebar.markdown(
 )
 
 
-# ── Blocage si données manquantes ────────────────────────────
-
-if not data_ready:
-    st.error(
-        "**Données introuvables.** Le pipeline n'a pas été exécuté ou les fichiers "
-        "sont manquants. Pour générer les données :\n\n"
-        "```bash\n"
-        "git clone https://github.com/Pchambet/mushroom-project.git\n"
-        "cd mushroom-project\n"
-        "make install && make run-all\n"
-        "```\n\n"
-        f"Voir le [README]({GITHUB_URL}) pour plus de détails."
-    )
-    st.stop()
-
-
 # ── Page : Vue d'ensemble ───────────────────────────────────
 
 if page == "Vue d'ensemble":
+    import plotly.graph_objects as go
+
+    df = require(load_dataset)
+
     st.title("The Mushroom Project")
     st.markdown(
         "> Pipeline d'analyse statistique sur **données catégorielles** — "
@@ -143,12 +287,11 @@ if page == "Vue d'ensemble":
     st.subheader("Distribution de la variable cible")
     class_counts = df["class"].value_counts()
     labels = [f"Comestible ({c})" if c == "e" else f"Vénéneux ({c})" for c in class_counts.index]
-    fig = px.bar(
+    fig = go.Figure(go.Bar(
         x=labels,
         y=class_counts.values,
-        color=class_counts.index.map({"e": "Comestible", "p": "Vénéneux"}),
-        color_discrete_map={"Comestible": "#2ecc71", "Vénéneux": "#e74c3c"},
-    )
+        marker_color=[CLASS_COLORS["Comestible" if c == "e" else "Vénéneux"] for c in class_counts.index],
+    ))
     fig.update_layout(
         showlegend=False,
         xaxis_title="",
@@ -161,13 +304,14 @@ if page == "Vue d'ensemble":
     st.caption("Les 20 premières lignes — 22 variables morphologiques (forme, odeur, couleur…) et la classe.")
     st.dataframe(df.head(20), use_container_width=True)
 
-    if "univariate_summary" in tables:
+    univ = load_table("univariate_summary")
+    if univ is not None:
         st.subheader("Résumé univarié")
         st.caption(
             "Pour chaque variable : nombre de modalités distinctes, modalité la plus fréquente, "
             "fréquence (%) et part des valeurs manquantes."
         )
-        univ = tables["univariate_summary"].copy()
+        univ = univ.copy()
         univ.columns = ["Variable", "Modalités", "Plus fréquent", "Fréq. %", "Manquants %"]
         st.dataframe(univ, use_container_width=True)
 
@@ -175,6 +319,10 @@ if page == "Vue d'ensemble":
 # ── Page : Espace ACM ────────────────────────────────────────
 
 elif page == "Espace ACM":
+    import plotly.graph_objects as go
+
+    df, coords = require(load_dataset), require(load_coordinates)
+
     st.title("Espace factoriel ACM")
     st.markdown(
         "L'ACM transforme 22 variables **catégorielles** en un espace euclidien continu. "
@@ -186,34 +334,33 @@ elif page == "Espace ACM":
     dim_y = col2.selectbox("Axe Y", [f"Dim{i+1}" for i in range(10)], index=1)
     point_size = col3.slider("Taille des points", 2, 12, 4, help="Ajustez la lisibilité du nuage")
 
-    plot_df = coords.copy()
-    plot_df["class"] = df["class"].map({"e": "Comestible", "p": "Vénéneux"})
-
     color_var = st.selectbox(
         "Colorer par",
         ["Classe (comestible/vénéneux)"] + [c for c in df.columns if c != "class"],
     )
 
-    if color_var == "Classe (comestible/vénéneux)":
-        fig = px.scatter(
-            plot_df, x=dim_x, y=dim_y, color="class",
-            color_discrete_map={"Comestible": "#2ecc71", "Vénéneux": "#e74c3c"},
-            opacity=0.5, hover_data={"class": True},
-        )
-    else:
-        plot_df[color_var] = df[color_var].fillna("Manquant").astype(str)
-        fig = px.scatter(
-            plot_df, x=dim_x, y=dim_y, color=color_var,
-            opacity=0.5,
-        )
-
-    fig.update_layout(height=600)
-    fig.update_traces(marker=dict(size=point_size))
-    st.plotly_chart(fig, use_container_width=True)
+    variable = "class" if color_var == "Classe (comestible/vénéneux)" else color_var
+    colors = CLASS_COLORS if variable == "class" else None
+    axis_x, axis_y = int(dim_x[3:]) - 1, int(dim_y[3:]) - 1
+    tiles = load_density_tiles(grid_version(DensityTiles.FILES), inputs_digest(ROOT))
+
+    def acm_points(x_range: Range, y_range: Range) -> ScatterPoints:
+        """Tuiles pré-calculées si la vue compte plus de ``MAX_POINTS`` individus, sinon individus."""
+        tile = tiles.points(axis_x, axis_y, variable, x_range, y_range) if tiles is not None else None
+        if tile is not None and tile[3].sum() > MAX_POINTS:
+            return ScatterPoints(*tile, n_total=tiles.n_rows, n_view=int(tile[3].sum()))
+        codes, names = variable_codes(df, variable)
+        return decimate(coords[dim_x].to_numpy(), coords[dim_y].to_numpy(), codes, len(names), x_range, y_range)
+
+    names = tiles.names[variable] if tiles is not None else variable_codes(df, variable)[1]
+    scatter_chart(
+        f"acm:{dim_x}:{dim_y}", acm_points, names, colors, variable, dim_x, dim_y,
+        size=point_size, height=600,
+    )
 
-    if "mca_eigenvalues" in tables:
+    eigen = load_table("mca_eigenvalues")
+    if eigen is not None:
         st.subheader("Inertie expliquée")
-        eigen = tables["mca_eigenvalues"]
 
         fig = go.Figure()
         fig.add_trace(go.Bar(
@@ -236,6 +383,8 @@ elif page == "Espace ACM":
 # ── Page : Clustering ────────────────────────────────────────
 
 elif page == "Clustering":
+    df, coords = require(load_dataset), require(load_coordinates)
+
     st.title("Clustering (K-Means sur espace ACM)")
     st.markdown(
         "Régroupez les champignons par similarité morphologique. "
@@ -247,75 +396,61 @@ elif page == "Clustering":
         k_axes = st.slider("Nombre d'axes ACM", 2, 10, 5)
         n_clusters = st.slider("Nombre de clusters", 2, 8, 3)
 
-    X_clust = coords.iloc[:, :k_axes].values
-
-    with st.spinner("Calcul du clustering…"):
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-        labels = kmeans.fit_predict(X_clust)
-        sil = silhouette_score(X_clust, labels)
+    inputs = inputs_digest(ROOT)
+    grid = load_clustering_grid(grid_version(ClusteringGrid.FILES), inputs)
+    if grid is not None and (k_axes, n_clusters) in grid:
+        cell = grid.cell(k_axes, n_clusters)
+    else:
+        future = background_tasks().submit(
+            ("clustering", inputs, k_axes, n_clusters), compute_cell,
+            coords.to_numpy(), class_codes(df["class"]), k_axes, n_clusters, random_state=42,
+        )
+        cell = await_result(future, "Calcul du clustering…")
+    labels = cell.labels
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Clusters", n_clusters)
-    col2.metric("Silhouette", f"{sil:.3f}")
+    col2.metric(
+        "Silhouette", f"{cell.silhouette:.3f}",
+        help=f"Mode {cell.silhouette_mode}" + (
+            f" — IC 95 % [{cell.silhouette_ci_low:.3f}, {cell.silhouette_ci_high:.3f}]"
+            if cell.silhouette_mode == "sampled" else ""
+        ),
+    )
     col3.metric("Axes ACM", k_axes)
 
-    plot_df = coords.copy()
-    plot_df["cluster"] = labels.astype(str)
-    plot_df["class"] = df["class"].map({"e": "Comestible", "p": "Vénéneux"})
+    dim1, dim2 = coords["Dim1"].to_numpy(), coords["Dim2"].to_numpy()
 
     col_l, col_r = st.columns(2)
 
     with col_l:
         st.subheader("Clusters sur plan ACM")
-        fig = px.scatter(
-            plot_df, x="Dim1", y="Dim2", color="cluster",
-            opacity=0.5,
+        scatter_chart(
+            "clusters", raw_points(dim1, dim2, labels, n_clusters), [str(c) for c in range(n_clusters)],
+            legend_title="cluster", x_title="Dim1", y_title="Dim2",
         )
-        fig.update_traces(marker=dict(size=4))
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
 
     with col_r:
         st.subheader("Classes réelles")
-        fig = px.scatter(
-            plot_df, x="Dim1", y="Dim2", color="class",
-            color_discrete_map={"Comestible": "#2ecc71", "Vénéneux": "#e74c3c"},
-            opacity=0.5,
+        scatter_chart(
+            "classes", raw_points(dim1, dim2, class_codes(df["class"]), len(CLASS_NAMES)),
+            list(CLASS_NAMES), CLASS_COLORS,
+            legend_title="class", x_title="Dim1", y_title="Dim2",
         )
-        fig.update_traces(marker=dict(size=4))
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
 
     st.subheader("Clusters vs classe réelle")
-    ct = pd.crosstab(
-        pd.Series(labels, name="Cluster"),
-        df["class"].map({"e": "Comestible", "p": "Vénéneux"}),
-        margins=True,
-    )
-    st.dataframe(ct, use_container_width=True)
-
-    purity_rows = []
-    for cid in range(n_clusters):
-        mask = labels == cid
-        size = mask.sum()
-        n_e = (df.loc[mask, "class"] == "e").sum()
-        n_p = size - n_e
-        dominant = "Comestible" if n_e > n_p else "Vénéneux"
-        purity = max(n_e, n_p) / size * 100
-        purity_rows.append({
-            "Cluster": cid,
-            "Taille": size,
-            "Comestibles": n_e,
-            "Vénéneux": n_p,
-            "Dominant": dominant,
-            "Pureté (%)": round(purity, 1),
-        })
-    st.dataframe(pd.DataFrame(purity_rows), use_container_width=True)
+    st.dataframe(cell.crosstab(), use_container_width=True)
+    st.dataframe(cell.purity(), use_container_width=True)
 
 
 # ── Page : Classification ────────────────────────────────────
 
 elif page == "Classification":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    df, coords = require(load_dataset), require(load_coordinates)
+
     st.title("Classification (LDA sur espace ACM)")
     st.markdown(
         "L'analyse discriminante linéaire trace la meilleure frontière de séparation "
@@ -324,28 +459,30 @@ elif page == "Classification":
 
     k_axes = st.slider("Nombre d'axes ACM (k)", 2, 10, 5)
 
-    X = coords.iloc[:, :k_axes].values
-    y = (df["class"] == "e").astype(int)
-
-    with st.spinner("Calcul de la validation croisée…"):
-        lda = LinearDiscriminantAnalysis()
-        cv_scores = cross_val_score(lda, X, y, cv=5, scoring="accuracy")
-        y_pred_cv = cross_val_predict(lda, X, y, cv=5)
-        lda.fit(X, y)
-        train_acc = lda.score(X, y)
+    inputs = inputs_digest(ROOT)
+    grid = load_classification_grid(grid_version(ClassificationGrid.FILES), inputs)
+    if grid is not None and k_axes in grid:
+        result = grid.cell(k_axes)
+    else:
+        y = (df["class"] == "e").astype(int).to_numpy()
+        future = background_tasks().submit(
+            ("classification", inputs, k_axes), compute_classification,
+            coords.to_numpy(), y, require(load_folds), [k_axes],
+        )
+        result = await_result(future, "Calcul de la validation croisée…")[0]
+    cv_scores, train_acc = result.fold_scores, result.train_accuracy
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Accuracy entraînement", f"{train_acc:.1%}")
-    col2.metric("Accuracy CV (5-fold)", f"{cv_scores.mean():.1%}", f"± {cv_scores.std():.1%}")
+    col2.metric(f"Accuracy CV ({len(cv_scores)}-fold)", f"{cv_scores.mean():.1%}", f"± {cv_scores.std():.1%}")
     col3.metric("Axes ACM", k_axes)
 
     col_l, col_r = st.columns(2)
 
     with col_l:
         st.subheader("Matrice de confusion (validation croisée)")
-        cm = confusion_matrix(y, y_pred_cv)
         fig = px.imshow(
-            cm,
+            result.confusion,
             labels=dict(x="Prédit", y="Réel", color="Effectif"),
             x=["Vénéneux", "Comestible"],
             y=["Vénéneux", "Comestible"],
@@ -359,7 +496,7 @@ elif page == "Classification":
         st.subheader("Scores par fold")
         fig = go.Figure()
         fig.add_trace(go.Bar(
-            x=[f"Fold {i+1}" for i in range(5)],
+            x=[f"Fold {i+1}" for i in range(len(cv_scores))],
             y=cv_scores,
             marker_color="steelblue",
         ))
@@ -371,26 +508,39 @@ elif page == "Classification":
         st.plotly_chart(fig, use_container_width=True)
 
     st.subheader("Rapport de classification")
-    report = classification_report(
-        y, y_pred_cv,
-        target_names=["Vénéneux", "Comestible"],
-        output_dict=True,
-    )
-    report_df = pd.DataFrame(report).T
-    st.dataframe(report_df.style.format("{:.3f}"), use_container_width=True)
+    st.dataframe(result.report.style.format("{:.3f}"), use_container_width=True)
 
-    if "model_comparison" in tables:
+    mc = load_table("model_comparison")
+    if mc is not None:
         st.subheader("Comparaison de modèles")
         st.caption("Résultats pré-calculés par le pipeline (LDA, Random Forest, SVM, Régression logistique).")
-        mc = tables["model_comparison"].copy()
-        mc.columns = [
-            "Modèle", "Accuracy train", "Accuracy CV", "Écart-type CV",
-            "Préc. vénéneux", "Recall vénéneux", "Préc. comestible", "Recall comestible",
-            "F1 macro", "Écart overfitting"
+        # Renommage par nom : les colonnes de coût (temps, mémoire, taille)
+        # n'existent que dans les tables produites par l'étape 07 récente.
+        mc_labels = {
+            "model": "Modèle",
+            "train_accuracy": "Accuracy train",
+            "cv_accuracy_mean": "Accuracy CV",
+            "cv_accuracy_std": "Écart-type CV",
+            "precision_poisonous": "Préc. vénéneux",
+            "recall_poisonous": "Recall vénéneux",
+            "precision_edible": "Préc. comestible",
+            "recall_edible": "Recall comestible",
+            "f1_macro": "F1 macro",
+            "overfitting_gap": "Écart overfitting",
+            "fit_time_s": "Ajustement (s)",
+            "predict_ms_per_1k": "Prédiction (ms / 1k)",
+            "peak_memory_mb": "Mémoire pic (Mo)",
+            "model_size_kb": "Taille modèle (Ko)",
+        }
+        mc = mc.rename(columns=mc_labels)
+        cost_cols = [
+            c for c in ("Ajustement (s)", "Prédiction (ms / 1k)", "Mémoire pic (Mo)", "Taille modèle (Ko)")
+            if c in mc.columns
         ]
-        mc_display = mc[["Modèle", "Accuracy train", "Accuracy CV", "F1 macro"]]
+        mc_display = mc[["Modèle", "Accuracy train", "Accuracy CV", "F1 macro", *cost_cols]]
         st.dataframe(
-            mc_display.style.highlight_max(subset=["Accuracy CV", "F1 macro"], color="#c8e6c9"),
+            mc_display.style.highlight_max(subset=["Accuracy CV", "F1 macro"], color="#c8e6c9")
+            .highlight_min(subset=cost_cols, color="#c8e6c9"),
             use_container_width=True,
         )
 
@@ -398,14 +548,17 @@ elif page == "Classification":
 # ── Page : Sensibilité ───────────────────────────────────────
 
 elif page == "Sensibilité":
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.title("Analyse de sensibilité — Impact de k")
     st.markdown(
         "Comment le nombre d'axes ACM retenus affecte-t-il la performance "
         "de la classification et la qualité du clustering ?"
     )
 
-    if "sensitivity_k" in tables:
-        sens = tables["sensitivity_k"]
+    sens = load_table("sensitivity_k")
+    if sens is not None:
 
         col1, col2 = st.columns(2)
 
@@ -465,17 +618,33 @@ elif page == "Sensibilité":
         st.plotly_chart(fig, use_container_width=True)
 
         st.subheader("Tableau complet")
-        sens_display = sens.copy()
-        sens_display.columns = [
-            "k", "Inertie cum. %", "Accuracy train", "Accuracy CV", "Écart-type CV",
-            "Silhouette", "Inertie K-Means", "Écart overfitting"
-        ]
+        # Renommage par nom : les tables produites par d'anciennes versions
+        # de l'étape 06 n'ont pas toutes les colonnes.
+        sens_labels = {
+            "k": "k",
+            "cumulative_inertia_%": "Inertie cum. %",
+            "lda_train_accuracy": "Accuracy train",
+            "lda_cv_mean": "Accuracy CV",
+            "lda_cv_std": "Écart-type CV",
+            "lda_repeated_cv_mean": "Accuracy CV répétée",
+            "lda_repeated_cv_std": "Écart-type CV répétée",
+            "silhouette_score": "Silhouette",
+            "silhouette_mode": "Mode silhouette",
+            "silhouette_ci_low": "Silhouette IC bas",
+            "silhouette_ci_high": "Silhouette IC haut",
+            "kmeans_inertia": "Inertie K-Means",
+            "overfitting_gap": "Écart overfitting",
+        }
+        sens_display = sens[
+            [c for c in sens_labels if c in sens.columns]
+        ].rename(columns=sens_labels)
+        shown = set(sens_display.columns)
         st.dataframe(
             sens_display.style.highlight_max(
-                subset=["Accuracy CV", "Silhouette"],
+                subset=[c for c in ("Accuracy CV", "Silhouette") if c in shown],
                 color="#c8e6c9",
             ).highlight_min(
-                subset=["Écart overfitting"],
+                subset=[c for c in ("Écart overfitting",) if c in shown],
                 color="#c8e6c9",
             ),
             use_container_width=True,
@@ -10,9 +10,12 @@ Source : https://archive.ics.uci.edu/ml/datasets/Mushroom
 
 from __future__ import annotations
 
+import argparse
 import urllib.request
 from pathlib import Path
 
+from profiling import add_profile_arguments, profiled
+
 
 # ── Configuration ──────────────────────────────────────────
 
@@ -52,4 +55,8 @@ def download_mushroom_dataset() -> None:
 
 
 if __name__ == "__main__":
-    download_mushroom_dataset()
+    parser = argparse.ArgumentParser(description="Téléchargement du dataset UCI Mushroom.")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("00_download", args):
+        download_mushroom_dataset()
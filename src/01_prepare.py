@@ -1,16 +1,26 @@
 """
 01 — Préparation des données.
 
-Parse le dataset brut, ajoute les en-têtes de colonnes, remplace les
-valeurs manquantes ``"?"`` par ``pd.NA``, et sauvegarde le dataset
-nettoyé dans ``data/processed/mushroom_processed.csv``.
+Parse le dataset brut, ajoute les en-têtes de colonnes, encode chaque
+variable en catégorielle (codes int8, dictionnaire des modalités UCI),
+remplace les valeurs manquantes ``"?"`` par ``NaN`` (code -1), et
+sauvegarde le dataset nettoyé dans ``data/processed/mushroom_processed.csv`` (et sa version
+binaire ``mushroom_processed.arrow``, lue en priorité par le pipeline).
+
+Génère aussi les plis de validation croisée (``cv_folds.npz``), partagés
+par toutes les étapes d'évaluation (voir ``validation.py``).
 """
 
 from __future__ import annotations
 
+import argparse
 import pandas as pd
 from pathlib import Path
 
+from profiling import add_profile_arguments, profiled
+from utils import print_section, print_step, save_cv_folds, save_processed_data
+from validation import make_folds
+
 
 # ── Configuration ──────────────────────────────────────────
 
@@ -28,7 +38,69 @@ COLUMN_NAMES = [
     "population", "habitat",
 ]
 
+# Modalités officielles (lettres UCI, cf. ``agaricus-lepiota.names``),
+# triées : l'ordre des catégories fixe celui des codes entiers.
+MODALITIES = {
+    "class": ["e", "p"],
+    "cap-shape": ["b", "c", "f", "k", "s", "x"],
+    "cap-surface": ["f", "g", "s", "y"],
+    "cap-color": ["b", "c", "e", "g", "n", "p", "r", "u", "w", "y"],
+    "bruises": ["f", "t"],
+    "odor": ["a", "c", "f", "l", "m", "n", "p", "s", "y"],
+    "gill-attachment": ["a", "d", "f", "n"],
+    "gill-spacing": ["c", "d", "w"],
+    "gill-size": ["b", "n"],
+    "gill-color": ["b", "e", "g", "h", "k", "n", "o", "p", "r", "u", "w", "y"],
+    "stalk-shape": ["e", "t"],
+    "stalk-root": ["b", "c", "e", "r", "u", "z"],
+    "stalk-surface-above-ring": ["f", "k", "s", "y"],
+    "stalk-surface-below-ring": ["f", "k", "s", "y"],
+    "stalk-color-above-ring": ["b", "c", "e", "g", "n", "o", "p", "w", "y"],
+    "stalk-color-below-ring": ["b", "c", "e", "g", "n", "o", "p", "w", "y"],
+    "veil-type": ["p", "u"],
+    "veil-color": ["n", "o", "w", "y"],
+    "ring-number": ["n", "o", "t"],
+    "ring-type": ["c", "e", "f", "l", "n", "p", "s", "z"],
+    "spore-print-color": ["b", "h", "k", "n", "o", "r", "u", "w", "y"],
+    "population": ["a", "c", "n", "s", "v", "y"],
+    "habitat": ["d", "g", "l", "m", "p", "u", "w"],
+}
+
 MISSING_SENTINEL = "?"
+CV_FOLDS = 5
+
+
+# ── Encodage ───────────────────────────────────────────────
+
+def encode_categories(raw: pd.DataFrame) -> pd.DataFrame:
+    """Convertit chaque colonne en catégorielle selon ``MODALITIES``.
+
+    Parameters
+    ----------
+    raw : pd.DataFrame
+        Dataset brut (lettres UCI, ``"?"`` pour les valeurs manquantes).
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataset à colonnes catégorielles ; les valeurs manquantes sont NaN.
+
+    Raises
+    ------
+    ValueError
+        Si une valeur n'appartient pas au dictionnaire des modalités.
+    """
+    encoded = {}
+    for col in COLUMN_NAMES:
+        values = raw[col].where(raw[col] != MISSING_SENTINEL)
+        cat = pd.Categorical(values, categories=MODALITIES[col])
+        unknown = values.notna() & (cat.codes == -1)
+        if unknown.any():
+            raise ValueError(
+                f"Modalités inconnues pour {col!r} : {sorted(values[unknown].unique())}"
+            )
+        encoded[col] = cat
+    return pd.DataFrame(encoded, index=raw.index)
 
 
 # ── Pipeline ───────────────────────────────────────────────
@@ -43,27 +115,30 @@ def prepare_data() -> pd.DataFrame:
     """
     project_root = Path(__file__).resolve().parent.parent
     raw_file = project_root / "data" / "raw" / "agaricus-lepiota.data"
-    processed_dir = project_root / "data" / "processed"
-    processed_dir.mkdir(parents=True, exist_ok=True)
-    processed_file = processed_dir / "mushroom_processed.csv"
 
-    print("=" * 60)
-    print("  01 — Préparation des données")
-    print("=" * 60)
+    print_section("01 — Préparation des données")
     print()
 
     # Chargement
-    df = pd.read_csv(raw_file, header=None, names=COLUMN_NAMES)
-    print(f"  [load] Dataset chargé : {df.shape[0]:,} lignes x {df.shape[1]} colonnes")
+    df = pd.read_csv(raw_file, header=None, names=COLUMN_NAMES, dtype=str)
+    print_step(f"Dataset chargé : {df.shape[0]:,} lignes x {df.shape[1]} colonnes")
 
     # Gestion des valeurs manquantes
     n_missing = (df == MISSING_SENTINEL).sum().sum()
-    print(f"  [clean] Valeurs manquantes ('{MISSING_SENTINEL}') détectées : {n_missing:,}")
-    df = df.replace(MISSING_SENTINEL, pd.NA)
+    print_step(f"Valeurs manquantes ('{MISSING_SENTINEL}') détectées : {n_missing:,}")
+
+    # Encodage catégoriel : les valeurs hors dictionnaire (dont '?') deviennent NaN
+    df = encode_categories(df)
+    n_bytes = df.memory_usage(deep=True).sum()
+    print_step(f"Codes catégoriels int8 : {n_bytes / 1024:,.0f} Ko en mémoire")
 
     # Sauvegarde
-    df.to_csv(processed_file, index=False)
-    print(f"  [save] Dataset nettoyé : {processed_file}")
+    processed_file = save_processed_data(df)
+    print_step(f"Dataset nettoyé : {processed_file.with_suffix('.csv')} (+ .arrow)")
+
+    # Plis de validation croisée, partagés par les étapes 05 à 07
+    folds_file = save_cv_folds(make_folds((df["class"] == "e").astype(int).to_numpy(), CV_FOLDS))
+    print_step(f"Plis de validation ({CV_FOLDS}-fold stratifiés) : {folds_file}")
 
     # Résumé
     print()
@@ -88,4 +163,8 @@ def prepare_data() -> pd.DataFrame:
 
 
 if __name__ == "__main__":
-    prepare_data()
+    parser = argparse.ArgumentParser(description="Préparation des données.")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profiled("01_prepare", args):
+        prepare_data()
@@ -8,13 +8,15 @@ et les visualisations des variables clés. Exporte les résultats dans
 
 from __future__ import annotations
 
+import argparse
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 
+from profiling import add_profile_arguments, profiled
 from utils import (
     get_project_root, load_processed_data,
     save_figure, save_table, print_section, print_step,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
 
 
@@ -62,61 +64,65 @@ def describe_data() -> None:
     )
     save_table(target_dist, "target_distribution.csv")
 
-    # ── Figure : bar chart cible ──
+    if figures_enabled():
+        import matplotlib.pyplot as plt
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    colors = [TARGET_COLORS.get(c, "#888") for c in target_dist["class"]]
-    bars = ax.bar(
-        target_dist["class"], target_dist["count"],
-        color=colors, alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    ax.set_title(
-        "Distribution de la classe (Edible vs Poisonous)",
-        fontsize=14, fontweight="bold",
-    )
-    ax.set_xlabel("Classe", fontsize=12)
-    ax.set_ylabel("Fréquence", fontsize=12)
-    for bar in bars:
-        h = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2, h,
-            f"{int(h):,}", ha="center", va="bottom", fontsize=11,
-        )
-    fig.tight_layout()
-    save_figure(fig, "desc_target_bar.png")
-
-    # ── Figures : variables clés ──
-
-    for var in KEY_VARIABLES:
-        if var not in df.columns:
-            continue
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        vc = df[var].value_counts().head(10)
-        palette = plt.cm.Set3(range(len(vc)))
+        # ── Figure : bar chart cible ──
 
+        fig, ax = plt.subplots(figsize=(8, 6))
+        colors = [TARGET_COLORS.get(c, "#888") for c in target_dist["class"]]
         bars = ax.bar(
-            range(len(vc)), vc.values,
-            color=palette, alpha=0.85, edgecolor="black", linewidth=0.5,
+            target_dist["class"], target_dist["count"],
+            color=colors, alpha=0.85, edgecolor="black", linewidth=0.5,
         )
-        ax.set_xticks(range(len(vc)))
-        ax.set_xticklabels(vc.index, rotation=45, ha="right")
         ax.set_title(
-            f"Distribution des modalités : {var}",
+            "Distribution de la classe (Edible vs Poisonous)",
             fontsize=14, fontweight="bold",
         )
-        ax.set_xlabel("Modalité", fontsize=12)
+        ax.set_xlabel("Classe", fontsize=12)
         ax.set_ylabel("Fréquence", fontsize=12)
-        ax.grid(axis="y", alpha=0.3)
-
         for bar in bars:
             h = bar.get_height()
             ax.text(
                 bar.get_x() + bar.get_width() / 2, h,
-                f"{int(h):,}", ha="center", va="bottom", fontsize=9,
+                f"{int(h):,}", ha="center", va="bottom", fontsize=11,
             )
         fig.tight_layout()
-        save_figure(fig, f"desc_top_modalities_{var}.png")
+        save_figure(fig, "desc_target_bar.png")
+
+        # ── Figures : variables clés ──
+
+        for var in KEY_VARIABLES:
+            if var not in df.columns:
+                continue
+
+            fig, ax = plt.subplots(figsize=(10, 6))
+            vc = df[var].value_counts()
+            vc = vc[vc > 0].head(10)
+            palette = plt.cm.Set3(range(len(vc)))
+
+            bars = ax.bar(
+                range(len(vc)), vc.values,
+                color=palette, alpha=0.85, edgecolor="black", linewidth=0.5,
+            )
+            ax.set_xticks(range(len(vc)))
+            ax.set_xticklabels(vc.index, rotation=45, ha="right")
+            ax.set_title(
+                f"Distribution des modalités : {var}",
+                fontsize=14, fontweight="bold",
+            )
+            ax.set_xlabel("Modalité", fontsize=12)
+            ax.set_ylabel("Fréquence", fontsize=12)
+            ax.grid(axis="y", alpha=0.3)
+
+            for bar in bars:
+                h = bar.get_height()
+                ax.text(
+                    bar.get_x() + bar.get_width() / 2, h,
+                    f"{int(h):,}", ha="center", va="bottom", fontsize=9,
+                )
+            fig.tight_layout()
+            save_figure(fig, f"desc_top_modalities_{var}.png")
 
     # ── Résumé ──
 
@@ -125,11 +131,18 @@ def describe_data() -> None:
     print()
     print("  Outputs :")
     print("    Tables  — univariate_summary.csv, target_distribution.csv")
-    print("    Figures — desc_target_bar.png" + "".join(
-        f", desc_top_modalities_{v}.png" for v in KEY_VARIABLES if v in df.columns
-    ))
+    if figures_enabled():
+        print("    Figures — desc_target_bar.png" + "".join(
+            f", desc_top_modalities_{v}.png" for v in KEY_VARIABLES if v in df.columns
+        ))
     print()
 
 
 if __name__ == "__main__":
-    describe_data()
+    parser = argparse.ArgumentParser(description="Statistiques descriptives.")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    with profiled("02_describe", args):
+        describe_data()
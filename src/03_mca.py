@@ -5,20 +5,39 @@ Effectue l'ACM sur les 22 variables catégorielles, exporte les coordonnées
 factorielles (``mca_coords.csv``), les valeurs propres, les contributions
 des modalités, et les visualisations.
 
-Librairie ACM : ``prince`` (https://github.com/MaxHalford/prince)
+Deux moteurs ACM au choix (``MCA_ENGINE`` ou ``--engine``) :
+  - ``native`` : ``mca_engine.SparseMCA`` (tableau disjonctif creux,
+    diagonalisation de la matrice de Burt), linéaire en nombre d'individus ;
+  - ``prince`` : ``prince.MCA`` (https://github.com/MaxHalford/prince),
+    moteur par défaut : les coordonnées et tables versionnées en sont issues.
+
+Le modèle ajusté (``mca_model.npz``) est sauvegardé pour projeter de
+nouveaux spécimens : ``utils.load_mca_model().transform(X)``.
+
+Mode hors mémoire (``MCA_CHUNK_SIZE`` ou ``--chunk-size``) : le dataset
+est parcouru par blocs de lignes pour cumuler la matrice de Burt (J x J),
+diagonalisée en mémoire ; une seconde passe écrit les coordonnées bloc
+par bloc dans ``mca_coords.npy``. La mémoire est bornée par la taille de
+bloc et non par le nombre d'individus ; les résultats sont identiques à
+ceux du moteur ``native`` en mémoire.
 """
 
 from __future__ import annotations
 
+import argparse
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from pathlib import Path
-import prince
 
+from mca_engine import (
+    MODEL_VERSION, MCAModel, SparseMCA, accumulate_burt, column_masses, svd_flip_signs, update_extremes,
+)
+from profiling import add_profile_arguments, profiled
 from utils import (
-    get_project_root, load_processed_data,
+    load_processed_data, load_modalities, iter_code_chunks,
+    save_mca_coordinates, open_mca_coordinates, export_mca_coordinates_csv, save_mca_model,
     save_figure, save_table, print_section, print_step,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
 
 
@@ -27,47 +46,201 @@ from utils import (
 N_COMPONENTS = 10
 INERTIA_THRESHOLD = 0.90
 TOP_CONTRIB = 15
+RANDOM_STATE = 42
+MCA_ENGINE = "prince"
+ENGINES = ("native", "prince")
+MCA_CHUNK_SIZE = None          # int : mode hors mémoire, en lignes par bloc
+FIGURE_SAMPLE = 20_000         # individus tracés en mode hors mémoire
+
+
+# ── Moteurs ────────────────────────────────────────────────
+
+def fit_mca(X: pd.DataFrame, engine: str = MCA_ENGINE):
+    """Ajuste l'ACM avec le moteur choisi.
+
+    Parameters
+    ----------
+    X : pd.DataFrame
+        Variables catégorielles, sans valeur manquante.
+    engine : str
+        ``"native"`` ou ``"prince"``.
+
+    Returns
+    -------
+    tuple
+        ``(eigenvalues, row_coords, col_coords, contributions)`` — mêmes
+        formats quel que soit le moteur.
+    """
+    if engine == "native":
+        mca = SparseMCA(n_components=N_COMPONENTS, random_state=RANDOM_STATE).fit(X)
+        return (
+            mca.eigenvalues_, mca.row_coordinates(X),
+            mca.column_coordinates(), mca.column_contributions_,
+        )
+    if engine == "prince":
+        import prince
+
+        mca = prince.MCA(
+            n_components=N_COMPONENTS, n_iter=3, copy=True, check_input=True,
+            random_state=RANDOM_STATE,
+        )
+        mca = mca.fit(X)
+        return (
+            mca.eigenvalues_, mca.transform(X),
+            mca.column_coordinates(X), mca.column_contributions_,
+        )
+    raise ValueError(f"Moteur ACM inconnu : {engine!r} (attendu : {', '.join(ENGINES)})")
+
+
+def fit_mca_chunked(chunk_size: int):
+    """Ajuste l'ACM hors mémoire et écrit les coordonnées bloc par bloc.
+
+    Première passe : matrice de Burt et marges (valeurs manquantes imputées
+    par le mode, comme en mémoire). Seconde passe : coordonnées des
+    individus écrites dans ``mca_coords.npy`` ; le signe des axes (convention
+    ``svd_flip``) est appliqué à la fin, puis le CSV est exporté.
+
+    Parameters
+    ----------
+    chunk_size : int
+        Nombre de lignes par bloc.
+
+    Returns
+    -------
+    tuple
+        ``(eigenvalues, n_rows, col_coords, contributions, sample, model)``
+        où ``sample`` est un couple ``(coords, is_edible)`` d'au plus
+        ``FIGURE_SAMPLE`` individus tirés au hasard, pour les figures, et
+        ``model`` le :class:`MCAModel` ajusté.
+    """
+    modalities = load_modalities()
+    names = list(modalities)
+    columns = [col for col in names if col != "class"]
+    var_pos = [names.index(col) for col in columns]
+    class_pos = names.index("class")
+    edible = modalities["class"].index("e")
+    n_levels = [len(modalities[col]) for col in columns]
+    labels = [f"{col}__{mod}" for col in columns for mod in modalities[col]]
+
+    burt, n_rows = accumulate_burt(
+        (block[:, var_pos] for block in iter_code_chunks(chunk_size)), n_levels,
+    )
+    mca = SparseMCA(n_components=N_COMPONENTS).fit_burt(burt, n_rows, n_levels, labels)
+
+    rng = np.random.default_rng(RANDOM_STATE)
+    sample_idx = np.sort(rng.choice(n_rows, size=min(FIGURE_SAMPLE, n_rows), replace=False))
+    sample_edible = np.empty(len(sample_idx), dtype=int)
+
+    coords = open_mca_coordinates(n_rows, N_COMPONENTS)
+    extremes = np.zeros(N_COMPONENTS)
+    start = 0
+    for block in iter_code_chunks(chunk_size):
+        stop = start + len(block)
+        F = mca.project_codes(block[:, var_pos])
+        coords[start:stop] = F
+        coords.flush()
+        extremes = update_extremes(extremes, F)
+        in_block = (sample_idx >= start) & (sample_idx < stop)
+        sample_edible[in_block] = block[sample_idx[in_block] - start, class_pos] == edible
+        start = stop
+
+    signs = svd_flip_signs(extremes)
+    mca.align_signs(signs)
+    for start in range(0, n_rows, chunk_size):
+        coords[start:start + chunk_size] *= signs
+        coords.flush()
+    sample = (np.asarray(coords[sample_idx]), sample_edible)
+    del coords
+    export_mca_coordinates_csv(chunk_size)
+
+    fill_values = {
+        col: modalities[col][code] for col, code in zip(columns, mca.fill_codes_)
+    }
+    col_coords = mca.column_coordinates()
+    model = MCAModel(col_coords, mca.singular_values_, mca.column_masses_, fill_values)
+    return (
+        mca.eigenvalues_, n_rows,
+        col_coords, mca.column_contributions_, sample, model,
+    )
 
 
 # ── Pipeline ───────────────────────────────────────────────
 
-def perform_mca() -> None:
+def perform_mca(engine: str = MCA_ENGINE, chunk_size: int | None = MCA_CHUNK_SIZE) -> None:
     """Effectue l'ACM sur le dataset.
 
-    Produit ``data/processed/mca_coords.csv`` contenant les coordonnées
-    de chaque individu sur les axes factoriels.
+    Produit ``data/processed/mca_coords.csv`` (et ``mca_coords.npy``)
+    contenant les coordonnées de chaque individu sur les axes factoriels.
+
+    Parameters
+    ----------
+    engine : str
+        Moteur ACM : ``"prince"`` (défaut) ou ``"native"``.
+    chunk_size : int, optional
+        Active le mode hors mémoire (lignes par bloc) ; moteur ``native``
+        uniquement.
+
+    Raises
+    ------
+    ValueError
+        Si le mode hors mémoire est demandé avec un autre moteur que ``native``.
     """
 
     print_section("03 — Analyse en Composantes Multiples (ACM)")
 
-    processed_dir = get_project_root() / "data" / "processed"
-    processed_dir.mkdir(parents=True, exist_ok=True)
+    if chunk_size:
+        if engine != "native":
+            raise ValueError(f"Mode hors mémoire indisponible avec le moteur {engine!r}")
+
+        # ── ACM hors mémoire (Burt) ──
+
+        eigenvalues, n_rows, col_coords, contributions, (sample, is_edible), model = (
+            fit_mca_chunked(chunk_size)
+        )
+        print_step(
+            f"ACM effectuée ({N_COMPONENTS} composantes, matrice de Burt, "
+            f"blocs de {chunk_size:,} lignes) : {n_rows:,} individus"
+        )
+        print_step(f"Interface exportée : mca_coords.csv + mca_coords.npy ({n_rows}, {N_COMPONENTS})")
+    else:
+
+        # ── Préparation ──
+
+        df = load_processed_data()
+        X = df.drop("class", axis=1)
+        fill_values = X.mode().iloc[0]
+        X = X.fillna(fill_values)
+        # Les modalités absentes du dataset formeraient des colonnes vides
+        X = X.apply(lambda col: col.cat.remove_unused_categories())
+
+        print_step(f"Données préparées : {X.shape[0]:,} individus x {X.shape[1]} variables")
 
-    # ── Préparation ──
+        # ── ACM ──
 
-    df = load_processed_data()
-    y = df["class"]
-    X = df.drop("class", axis=1)
-    X = X.fillna(X.mode().iloc[0])
+        eigenvalues, row_coords, col_coords, contributions = fit_mca(X, engine)
+        print_step(f"ACM effectuée ({N_COMPONENTS} composantes, moteur {engine})")
 
-    print_step(f"Données préparées : {X.shape[0]:,} individus x {X.shape[1]} variables")
+        # ── Fichier interface : mca_coords.csv ──
 
-    # ── ACM ──
+        row_coords.columns = [f"Dim{i+1}" for i in range(N_COMPONENTS)]
+        save_mca_coordinates(row_coords)
+        print_step(f"Interface exportée : mca_coords.csv + mca_coords.npy ({row_coords.shape})")
 
-    mca = prince.MCA(n_components=N_COMPONENTS, n_iter=3, copy=True, check_input=True)
-    mca = mca.fit(X)
-    print_step(f"ACM effectuée ({N_COMPONENTS} composantes)")
+        n_rows = len(row_coords)
+        sample = row_coords.to_numpy()
+        is_edible = (df["class"] == "e").to_numpy(dtype=int)
+        model = MCAModel(
+            col_coords, np.sqrt(eigenvalues),
+            column_masses(X).reindex(col_coords.index).to_numpy(), fill_values.to_dict(),
+        )
 
-    # ── Fichier interface : mca_coords.csv ──
+    # ── Modèle persisté : mca_model.npz ──
 
-    row_coords = mca.transform(X)
-    row_coords.columns = [f"Dim{i+1}" for i in range(N_COMPONENTS)]
-    row_coords.to_csv(processed_dir / "mca_coords.csv", index=False)
-    print_step(f"Interface exportée : mca_coords.csv ({row_coords.shape})")
+    save_mca_model(model)
+    print_step(f"Modèle exporté : mca_model.npz (projection de nouveaux spécimens, v{MODEL_VERSION})")
 
     # ── Valeurs propres et inertie ──
 
-    eigenvalues = mca.eigenvalues_
     explained = eigenvalues / eigenvalues.sum()
     cumulative = np.cumsum(explained)
     n_actual = len(explained)
@@ -91,9 +264,6 @@ def perform_mca() -> None:
 
     # ── Contributions des modalités ──
 
-    col_coords = mca.column_coordinates(X)
-    contributions = mca.column_contributions_
-
     for axis_idx, axis_name in [(0, "axis1"), (1, "axis2")]:
         contrib_df = pd.DataFrame({
             "modality": col_coords.index,
@@ -102,79 +272,81 @@ def perform_mca() -> None:
         }).sort_values(f"contrib_dim{axis_idx+1}_%", ascending=False).head(TOP_CONTRIB)
         save_table(contrib_df, f"mca_modalities_contrib_{axis_name}.csv")
 
-    # ── Figure : scree plot ──
-
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-    axes[0].plot(
-        range(1, n_actual + 1), explained * 100,
-        "o-", linewidth=2, markersize=8, color="#2196F3",
-    )
-    axes[0].axhline(
-        y=100 / n_actual, color="r", linestyle="--", alpha=0.5, label="Moyenne"
-    )
-    axes[0].set_xlabel("Composante", fontsize=12)
-    axes[0].set_ylabel("Inertie expliquée (%)", fontsize=12)
-    axes[0].set_title("Scree plot — Inertie par composante", fontsize=13, fontweight="bold")
-    axes[0].grid(True, alpha=0.3)
-    axes[0].legend()
-
-    axes[1].plot(
-        range(1, n_actual + 1), cumulative * 100,
-        "o-", linewidth=2, markersize=8, color="#4CAF50",
-    )
-    axes[1].axhline(y=90, color="r", linestyle="--", alpha=0.5, label="Seuil 90%")
-    axes[1].set_xlabel("Nombre de composantes", fontsize=12)
-    axes[1].set_ylabel("Inertie cumulée (%)", fontsize=12)
-    axes[1].set_title("Inertie cumulée", fontsize=13, fontweight="bold")
-    axes[1].grid(True, alpha=0.3)
-    axes[1].legend()
-
-    fig.tight_layout()
-    save_figure(fig, "acm_scree.png")
-
-    # ── Figure : plan factoriel des modalités ──
-
-    fig, ax = plt.subplots(figsize=(12, 10))
-    for idx, modality in enumerate(col_coords.index):
-        x, y_val = col_coords.iloc[idx, 0], col_coords.iloc[idx, 1]
-        ax.scatter(x, y_val, alpha=0.7, s=100)
-        ax.annotate(modality, (x, y_val), fontsize=8, alpha=0.8)
-
-    ax.axhline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
-    ax.axvline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
-    ax.set_xlabel(f"Dim 1 ({explained[0]*100:.2f}%)", fontsize=12)
-    ax.set_ylabel(f"Dim 2 ({explained[1]*100:.2f}%)", fontsize=12)
-    ax.set_title(
-        "ACM — Plan factoriel des modalités (Dim 1-2)",
-        fontsize=14, fontweight="bold",
-    )
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-    save_figure(fig, "acm_modalities_12.png")
-
-    # ── Figure : individus colorés par classe ──
-
-    fig, ax = plt.subplots(figsize=(10, 8))
-    colors = np.array([1 if c == "e" else 0 for c in df["class"]])
-    scatter = ax.scatter(
-        row_coords.iloc[:, 0].values, row_coords.iloc[:, 1].values,
-        c=colors, cmap="RdYlGn", alpha=0.6, s=20,
-    )
-    ax.axhline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
-    ax.axvline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
-    ax.set_xlabel(f"Dim 1 ({explained[0]*100:.2f}%)", fontsize=12)
-    ax.set_ylabel(f"Dim 2 ({explained[1]*100:.2f}%)", fontsize=12)
-    ax.set_title(
-        "ACM — Individus colorés par classe (Dim 1-2)",
-        fontsize=14, fontweight="bold",
-    )
-    cbar = fig.colorbar(scatter, ax=ax, label="Classe")
-    cbar.set_ticks([0, 1])
-    cbar.set_ticklabels(["Vénéneux (p)", "Comestible (e)"])
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-    save_figure(fig, "acm_individuals_12_color_target.png")
+    if figures_enabled():
+        import matplotlib.pyplot as plt
+
+        # ── Figure : scree plot ──
+
+        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+        axes[0].plot(
+            range(1, n_actual + 1), explained * 100,
+            "o-", linewidth=2, markersize=8, color="#2196F3",
+        )
+        axes[0].axhline(
+            y=100 / n_actual, color="r", linestyle="--", alpha=0.5, label="Moyenne"
+        )
+        axes[0].set_xlabel("Composante", fontsize=12)
+        axes[0].set_ylabel("Inertie expliquée (%)", fontsize=12)
+        axes[0].set_title("Scree plot — Inertie par composante", fontsize=13, fontweight="bold")
+        axes[0].grid(True, alpha=0.3)
+        axes[0].legend()
+
+        axes[1].plot(
+            range(1, n_actual + 1), cumulative * 100,
+            "o-", linewidth=2, markersize=8, color="#4CAF50",
+        )
+        axes[1].axhline(y=90, color="r", linestyle="--", alpha=0.5, label="Seuil 90%")
+        axes[1].set_xlabel("Nombre de composantes", fontsize=12)
+        axes[1].set_ylabel("Inertie cumulée (%)", fontsize=12)
+        axes[1].set_title("Inertie cumulée", fontsize=13, fontweight="bold")
+        axes[1].grid(True, alpha=0.3)
+        axes[1].legend()
+
+        fig.tight_layout()
+        save_figure(fig, "acm_scree.png")
+
+        # ── Figure : plan factoriel des modalités ──
+
+        fig, ax = plt.subplots(figsize=(12, 10))
+        for idx, modality in enumerate(col_coords.index):
+            x, y_val = col_coords.iloc[idx, 0], col_coords.iloc[idx, 1]
+            ax.scatter(x, y_val, alpha=0.7, s=100)
+            ax.annotate(modality, (x, y_val), fontsize=8, alpha=0.8)
+
+        ax.axhline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
+        ax.axvline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
+        ax.set_xlabel(f"Dim 1 ({explained[0]*100:.2f}%)", fontsize=12)
+        ax.set_ylabel(f"Dim 2 ({explained[1]*100:.2f}%)", fontsize=12)
+        ax.set_title(
+            "ACM — Plan factoriel des modalités (Dim 1-2)",
+            fontsize=14, fontweight="bold",
+        )
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        save_figure(fig, "acm_modalities_12.png")
+
+        # ── Figure : individus colorés par classe ──
+
+        fig, ax = plt.subplots(figsize=(10, 8))
+        scatter = ax.scatter(
+            sample[:, 0], sample[:, 1],
+            c=is_edible, cmap="RdYlGn", alpha=0.6, s=20,
+        )
+        ax.axhline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
+        ax.axvline(0, color="black", linewidth=0.5, linestyle="--", alpha=0.3)
+        ax.set_xlabel(f"Dim 1 ({explained[0]*100:.2f}%)", fontsize=12)
+        ax.set_ylabel(f"Dim 2 ({explained[1]*100:.2f}%)", fontsize=12)
+        ax.set_title(
+            "ACM — Individus colorés par classe (Dim 1-2)",
+            fontsize=14, fontweight="bold",
+        )
+        cbar = fig.colorbar(scatter, ax=ax, label="Classe")
+        cbar.set_ticks([0, 1])
+        cbar.set_ticklabels(["Vénéneux (p)", "Comestible (e)"])
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        save_figure(fig, "acm_individuals_12_color_target.png")
 
     # ── Résumé ──
 
@@ -182,11 +354,25 @@ def perform_mca() -> None:
     print_step("ACM terminée.")
     print()
     print("  Coordonnées factorielles :")
-    print(f"    mca_coords.csv  ({row_coords.shape[0]:,} individus x {row_coords.shape[1]} axes)")
+    print(f"    mca_coords.csv  ({n_rows:,} individus x {N_COMPONENTS} axes)")
     print(f"    k recommandé    = {k_recommended} axes")
     print(f"    Inertie (k={k_recommended})  = {cumulative[k_recommended-1]*100:.1f}%")
     print()
 
 
 if __name__ == "__main__":
-    perform_mca()
+    parser = argparse.ArgumentParser(description="ACM sur le dataset mushroom.")
+    parser.add_argument("--engine", choices=ENGINES, default=MCA_ENGINE,
+                        help=f"Moteur ACM (défaut : {MCA_ENGINE})")
+    parser.add_argument("--chunk-size", type=int, default=MCA_CHUNK_SIZE,
+                        help="Mode hors mémoire : lignes par bloc (moteur native)")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size doit être strictement positif")
+    if args.chunk_size and args.engine != "native":
+        parser.error("--chunk-size n'est disponible qu'avec --engine native")
+    with profiled("03_mca", args):
+        perform_mca(args.engine, args.chunk_size)
@@ -1,23 +1,34 @@
 """
 04 — Clustering sur coordonnées ACM.
 
-Effectue une Classification Ascendante Hiérarchique (Ward) pour guider
-le choix du nombre de clusters, puis consolide avec K-Means.
-Profile les clusters par modalités sur/sous-représentées.
+Effectue une Classification Ascendante Hiérarchique (Ward) sur la
+population complète (``clustering.ward_hierarchy`` : CAH exacte sur les
+points distincts, ou sur micro-clusters K-Means au-delà d'un seuil) pour
+guider le choix du nombre de clusters, puis consolide avec K-Means.
+Moteur K-Means au choix (``KMEANS_BACKEND`` ou ``--backend``, voir
+``clustering.fit_kmeans``) ; un moteur approché est comparé au moteur
+exact (écart d'inertie et d'étiquettes) tant que celui-ci reste abordable.
+Profile les clusters par modalités sur/sous-représentées : effectifs
+cluster x modalité en une passe (``clustering.profile_table``) et
+valeurs-test de chaque modalité.
 """
 
 from __future__ import annotations
 
+import argparse
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
-from sklearn.cluster import KMeans
-from scipy.cluster.hierarchy import dendrogram, linkage
 
+from clustering import (
+    AUTO_EXACT_MAX_ROWS, KMEANS_BACKENDS, compare_partitions, fit_kmeans, profile_table, ward_hierarchy,
+)
+from profiling import add_profile_arguments, profiled
 from utils import (
-    get_project_root, load_processed_data, load_mca_coordinates,
+    get_project_root, load_mca_coordinates, load_code_matrix, load_modalities,
     save_figure, save_table, print_section, print_step,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
 
 
@@ -25,126 +36,179 @@ from utils import (
 
 K_AXES = 5
 N_CLUSTERS = 3
-DENDRO_SAMPLE = 500
-DENDRO_CUT_HEIGHT = 15
+CAH_MAX_CLUSTERS = 10
+N_MICRO_CLUSTERS = None        # None : CAH exacte si possible, sinon défaut
+DENDRO_LEAVES = 30
 OVER_REP_THRESHOLD = 1.5
 UNDER_REP_THRESHOLD = 0.5
 RANDOM_STATE = 42
+KMEANS_BACKEND = "auto"
 
 
 # ── Pipeline ───────────────────────────────────────────────
 
-def perform_clustering() -> None:
-    """Effectue le clustering sur les coordonnées ACM."""
+def perform_clustering(backend: str = KMEANS_BACKEND) -> None:
+    """Effectue le clustering sur les coordonnées ACM.
+
+    Parameters
+    ----------
+    backend : str
+        Moteur K-Means (voir ``clustering.KMEANS_BACKENDS``).
+    """
 
     print_section("04 — Clustering sur coordonnées ACM")
 
     # ── Chargement ──
 
-    coords = load_mca_coordinates()
-    df = load_processed_data()
+    coords = load_mca_coordinates(mmap=True)
+    codes = load_code_matrix()
+    modalities = load_modalities()
     X_mca = coords.iloc[:, :K_AXES].values
 
     print_step(f"Coordonnées ACM chargées : {X_mca.shape} (k={K_AXES} axes)")
 
-    # ── CAH (Ward) sur échantillon ──
+    # ── CAH (Ward) sur population complète ──
 
     print_step("Classification Ascendante Hiérarchique (Ward)")
-    rng = np.random.default_rng(RANDOM_STATE)
-    sample_size = min(DENDRO_SAMPLE, len(X_mca))
-    sample_idx = rng.choice(len(X_mca), sample_size, replace=False)
-    linkage_matrix = linkage(X_mca[sample_idx], method="ward")
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    dendrogram(linkage_matrix, no_labels=True, color_threshold=None, ax=ax)
-    ax.axhline(
-        y=DENDRO_CUT_HEIGHT, color="r", linestyle="--", alpha=0.7,
-        label=f"Coupe suggérée (h={DENDRO_CUT_HEIGHT})",
+    hierarchy = ward_hierarchy(
+        X_mca, n_clusters=N_CLUSTERS, max_clusters=CAH_MAX_CLUSTERS,
+        n_micro=N_MICRO_CLUSTERS, random_state=RANDOM_STATE,
     )
-    ax.set_title("Dendrogramme — CAH (Ward)", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Individus", fontsize=12)
-    ax.set_ylabel("Distance", fontsize=12)
-    ax.legend()
-    fig.tight_layout()
-    save_figure(fig, "cluster_dendrogram.png")
+    leaves = "points distincts" if hierarchy.exact else "micro-clusters"
+    print(f"    {hierarchy.n_leaves:,} {leaves} (CAH {'exacte' if hierarchy.exact else 'approchée'})")
+    print(f"    Coupe suggérée : {hierarchy.n_suggested} clusters (h={hierarchy.cut_height:.2f})")
+
+    cuts_df = hierarchy.cut_table(CAH_MAX_CLUSTERS).round(
+        {"merge_height": 4, "inertia_gain": 4, "gain_ratio": 4},
+    )
+    save_table(cuts_df, "cluster_cah_cuts.csv")
+
+    if figures_enabled():
+        import matplotlib.pyplot as plt
+        from scipy.cluster.hierarchy import dendrogram
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        dendrogram(
+            hierarchy.linkage, truncate_mode="lastp", p=DENDRO_LEAVES,
+            no_labels=True, color_threshold=None, ax=ax,
+        )
+        ax.axhline(
+            y=hierarchy.cut_height, color="r", linestyle="--", alpha=0.7,
+            label=f"Coupe suggérée ({hierarchy.n_suggested} clusters, h={hierarchy.cut_height:.1f})",
+        )
+        ax.set_title("Dendrogramme — CAH (Ward)", fontsize=14, fontweight="bold")
+        ax.set_xlabel(f"Groupes ({DENDRO_LEAVES} derniers nœuds)", fontsize=12)
+        ax.set_ylabel("Distance", fontsize=12)
+        ax.legend()
+        fig.tight_layout()
+        save_figure(fig, "cluster_dendrogram.png")
 
     # ── K-Means ──
 
     print_step(f"K-Means clustering (k={N_CLUSTERS})")
-    kmeans = KMeans(n_clusters=N_CLUSTERS, random_state=RANDOM_STATE, n_init=10)
-    labels = kmeans.fit_predict(X_mca)
+    coords_array = coords.to_numpy()
+    kmeans = fit_kmeans(
+        coords_array, N_CLUSTERS, k_axes=K_AXES, backend=backend, random_state=RANDOM_STATE,
+    )
+    labels = kmeans.labels
+    print(f"    Moteur : {kmeans.backend}  |  inertie = {kmeans.inertia:,.2f}")
+    if kmeans.backend != "exact" and len(coords_array) <= AUTO_EXACT_MAX_ROWS:
+        exact = fit_kmeans(
+            coords_array, N_CLUSTERS, k_axes=K_AXES, backend="exact", random_state=RANDOM_STATE,
+        )
+        gap = compare_partitions(exact, kmeans)
+        print(
+            f"    Écart au moteur exact : inertie {gap['inertia_gap_%']:+.2f}%  |  "
+            f"ARI = {gap['ari']:.4f}  |  étiquettes identiques : {gap['label_agreement_%']:.2f}%"
+        )
+    from sklearn.metrics import adjusted_rand_score
+
+    ari = adjusted_rand_score(labels, hierarchy.labels)
+    print(f"    Accord avec la partition CAH consolidée : ARI = {ari:.4f}")
 
     # ── Table : tailles des clusters ──
 
+    sizes = np.bincount(labels, minlength=N_CLUSTERS)
     cluster_sizes = pd.DataFrame({
         "cluster": range(N_CLUSTERS),
-        "size": [int((labels == i).sum()) for i in range(N_CLUSTERS)],
-        "percentage": [
-            round((labels == i).sum() / len(labels) * 100, 2)
-            for i in range(N_CLUSTERS)
-        ],
+        "size": sizes,
+        "percentage": np.round(sizes / len(labels) * 100, 2),
     })
     save_table(cluster_sizes, "cluster_sizes.csv")
 
     for _, row in cluster_sizes.iterrows():
         print(f"    Cluster {int(row['cluster'])}: {int(row['size']):,} ({row['percentage']:.1f}%)")
 
-    # ── Figure : clusters sur plan factoriel ──
-
-    fig, ax = plt.subplots(figsize=(10, 8))
-    scatter = ax.scatter(
-        coords.iloc[:, 0], coords.iloc[:, 1],
-        c=labels, cmap="viridis", alpha=0.6, s=30,
-    )
-    ax.set_xlabel("Dim 1", fontsize=12)
-    ax.set_ylabel("Dim 2", fontsize=12)
-    ax.set_title(
-        f"K-Means — {N_CLUSTERS} clusters (plan factoriel ACM 1-2)",
-        fontsize=14, fontweight="bold",
-    )
-    fig.colorbar(scatter, ax=ax, label="Cluster")
-    ax.grid(True, alpha=0.3)
-    fig.tight_layout()
-    save_figure(fig, "cluster_on_acm12.png")
+    if figures_enabled():
+        import matplotlib.pyplot as plt
+
+        # ── Figure : clusters sur plan factoriel ──
+
+        fig, ax = plt.subplots(figsize=(10, 8))
+        scatter = ax.scatter(
+            coords.iloc[:, 0], coords.iloc[:, 1],
+            c=labels, cmap="viridis", alpha=0.6, s=30,
+        )
+        ax.set_xlabel("Dim 1", fontsize=12)
+        ax.set_ylabel("Dim 2", fontsize=12)
+        ax.set_title(
+            f"K-Means — {N_CLUSTERS} clusters (plan factoriel ACM 1-2)",
+            fontsize=14, fontweight="bold",
+        )
+        fig.colorbar(scatter, ax=ax, label="Cluster")
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        save_figure(fig, "cluster_on_acm12.png")
 
     # ── Table : clusters x variable cible ──
 
-    df_clusters = df.copy()
-    df_clusters["cluster"] = labels
-
-    crosstab = pd.crosstab(df_clusters["cluster"], df_clusters["class"], margins=True)
+    class_pos = list(modalities).index("class")
+    classes = modalities["class"]
+    counts = np.bincount(
+        labels * len(classes) + codes[:, class_pos], minlength=N_CLUSTERS * len(classes),
+    ).reshape(N_CLUSTERS, len(classes))
+    crosstab = pd.DataFrame(counts, index=pd.Index(range(N_CLUSTERS), name="cluster"),
+                            columns=pd.Index(classes, name="class"))
+    crosstab["All"] = crosstab.sum(axis=1)
+    crosstab.loc["All"] = crosstab.sum(axis=0)
     save_table(crosstab, "cluster_vs_target.csv", index=True)
 
-    # ── Table : profils de clusters ──
+    # ── Tables : statistiques et profils de clusters ──
 
     print_step("Profiling des clusters (modalités caractéristiques)")
-    profiles = []
-
-    for cid in range(N_CLUSTERS):
-        mask = labels == cid
-        for col in df.columns:
-            if col == "class":
-                continue
-            cluster_dist = df[mask][col].value_counts(normalize=True)
-            global_dist = df[col].value_counts(normalize=True)
-
-            for modality in cluster_dist.index:
-                if modality not in global_dist.index:
-                    continue
-                ratio = cluster_dist[modality] / global_dist[modality]
-                if ratio > OVER_REP_THRESHOLD or ratio < UNDER_REP_THRESHOLD:
-                    profiles.append({
-                        "cluster": cid,
-                        "variable": col,
-                        "modality": modality,
-                        "cluster_freq_%": round(cluster_dist[modality] * 100, 2),
-                        "global_freq_%": round(global_dist[modality] * 100, 2),
-                        "over_representation": round(ratio, 2),
-                    })
-
-    profile_df = pd.DataFrame(profiles).sort_values(
-        ["cluster", "over_representation"], ascending=[True, False]
+    variables = [col for col in modalities if col != "class"]
+    var_pos = [list(modalities).index(col) for col in variables]
+    stats_df = profile_table(
+        codes[:, var_pos], labels, N_CLUSTERS, {col: modalities[col] for col in variables},
     )
+    save_table(stats_df, "cluster_modality_stats.csv")
+
+    # Première apparition de chaque modalité dans chaque cluster : départage
+    # les ex aequo comme le parcours value_counts de la version itérative
+    # (ordre des variables, fréquence décroissante, puis ordre d'apparition).
+    first_seen = {}
+    for col, q in zip(variables, var_pos):
+        n_mod = len(modalities[col])
+        keys, first = np.unique(labels * n_mod + codes[:, q], return_index=True)
+        for key, idx in zip(keys, first):
+            first_seen[(key // n_mod, col, modalities[col][key % n_mod])] = idx
+
+    ratio = stats_df["over_representation"]
+    profile_df = stats_df[
+        (stats_df["cluster_count"] > 0)
+        & ((ratio > OVER_REP_THRESHOLD) | (ratio < UNDER_REP_THRESHOLD))
+    ].drop(columns=["cluster_count", "p_value"]).round({
+        "cluster_freq_%": 2, "global_freq_%": 2, "over_representation": 2, "test_value": 2,
+    })
+    profile_df["first_seen"] = [
+        first_seen[key]
+        for key in zip(profile_df["cluster"], profile_df["variable"], profile_df["modality"])
+    ]
+    profile_df = profile_df.sort_values(
+        ["cluster", "over_representation", "variable", "cluster_freq_%", "first_seen"],
+        ascending=[True, False, True, False, True], kind="stable",
+        key=lambda s: s.map(variables.index) if s.name == "variable" else s,
+    ).drop(columns="first_seen")
     save_table(profile_df, "cluster_profiles.csv")
     print(f"    {len(profile_df)} modalités significatives identifiées")
 
@@ -160,10 +224,20 @@ def perform_clustering() -> None:
     print_step("Clustering terminé.")
     print()
     print("  Outputs :")
-    print("    Tables  — cluster_sizes.csv, cluster_vs_target.csv, cluster_profiles.csv")
-    print("    Figures — cluster_dendrogram.png, cluster_on_acm12.png")
+    print("    Tables  — cluster_sizes.csv, cluster_vs_target.csv, cluster_profiles.csv,")
+    print("              cluster_modality_stats.csv, cluster_cah_cuts.csv")
+    if figures_enabled():
+        print("    Figures — cluster_dendrogram.png, cluster_on_acm12.png")
     print()
 
 
 if __name__ == "__main__":
-    perform_clustering()
+    parser = argparse.ArgumentParser(description="Clustering sur coordonnées ACM.")
+    parser.add_argument("--backend", choices=KMEANS_BACKENDS, default=KMEANS_BACKEND,
+                        help=f"Moteur K-Means (défaut : {KMEANS_BACKEND})")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    with profiled("04_cluster", args):
+        perform_clustering(args.backend)
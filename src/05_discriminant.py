@@ -3,30 +3,30 @@
 
 Effectue une LDA sur les coordonnées ACM pour la classification binaire
 comestible/vénéneux. Évalue le modèle par matrice de confusion et
-validation croisée 5-fold.
+validation croisée 5-fold, sur les plis partagés (``cv_folds.npz``) : un
+ajustement par pli fournit scores et prédictions hors pli
+(``validation.cross_validate``).
 """
 
 from __future__ import annotations
 
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
-from sklearn.model_selection import cross_val_score, cross_val_predict
-from sklearn.metrics import confusion_matrix, classification_report
 
+from profiling import add_profile_arguments, profiled
 from utils import (
-    get_project_root, load_processed_data, load_mca_coordinates,
-    save_figure, save_table, print_section, print_step,
+    get_project_root, load_processed_data, load_mca_coordinates, load_cv_folds,
+    save_classifier, save_figure, save_table, print_section, print_step,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
+from validation import cross_validate
 
 
 # ── Configuration ──────────────────────────────────────────
 
 K_AXES = 5
-CV_FOLDS = 5
 TARGET_NAMES = ["Poisonous", "Edible"]
 
 
@@ -34,6 +34,8 @@ TARGET_NAMES = ["Poisonous", "Edible"]
 
 def perform_discriminant_analysis() -> None:
     """Effectue l'analyse discriminante linéaire."""
+    from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+    from sklearn.metrics import confusion_matrix, classification_report
 
     print_section("05 — Analyse discriminante (LDA)")
 
@@ -43,7 +45,9 @@ def perform_discriminant_analysis() -> None:
     df = load_processed_data()
 
     X = coords.iloc[:, :K_AXES].values
-    y = (df["class"] == "e").astype(int)  # 1 = edible, 0 = poisonous
+    y = (df["class"] == "e").astype(int).to_numpy()  # 1 = edible, 0 = poisonous
+    folds = load_cv_folds(len(y))
+    n_folds = int(folds.max()) + 1
 
     print_step(f"Données préparées : {X.shape} (k={K_AXES} axes)")
     print(f"    Poisonous: {(y == 0).sum():,}  |  Edible: {(y == 1).sum():,}")
@@ -52,8 +56,11 @@ def perform_discriminant_analysis() -> None:
 
     print_step("Analyse Discriminante Linéaire (LDA)")
     lda = LinearDiscriminantAnalysis()
-    lda.fit(X, y)
+    cv = cross_validate(lda, X, y, folds)
+    cv_scores = cv.scores
     y_pred = lda.predict(X)
+    save_classifier(lda, K_AXES)
+    print_step("Modèle exporté : models/lda.joblib (service de prédiction)")
 
     # Coefficients
     coef_df = pd.DataFrame({
@@ -75,21 +82,25 @@ def perform_discriminant_analysis() -> None:
     )
     save_table(cm_df, "da_confusion.csv", index=True)
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(
-        cm, annot=True, fmt="d", cmap="Blues",
-        xticklabels=["Vénéneux (0)", "Comestible (1)"],
-        yticklabels=["Vénéneux (0)", "Comestible (1)"],
-        cbar_kws={"label": "Fréquence"}, ax=ax,
-    )
-    ax.set_title(
-        "Matrice de confusion — Analyse discriminante",
-        fontsize=14, fontweight="bold",
-    )
-    ax.set_ylabel("Vraie classe", fontsize=12)
-    ax.set_xlabel("Classe prédite", fontsize=12)
-    fig.tight_layout()
-    save_figure(fig, "da_confusion.png")
+    if figures_enabled():
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        fig, ax = plt.subplots(figsize=(8, 6))
+        sns.heatmap(
+            cm, annot=True, fmt="d", cmap="Blues",
+            xticklabels=["Vénéneux (0)", "Comestible (1)"],
+            yticklabels=["Vénéneux (0)", "Comestible (1)"],
+            cbar_kws={"label": "Fréquence"}, ax=ax,
+        )
+        ax.set_title(
+            "Matrice de confusion — Analyse discriminante",
+            fontsize=14, fontweight="bold",
+        )
+        ax.set_ylabel("Vraie classe", fontsize=12)
+        ax.set_xlabel("Classe prédite", fontsize=12)
+        fig.tight_layout()
+        save_figure(fig, "da_confusion.png")
 
     # ── Métriques ──
 
@@ -106,10 +117,10 @@ def perform_discriminant_analysis() -> None:
 
     # ── Validation croisée ──
 
-    print_step(f"Validation croisée ({CV_FOLDS}-fold)")
-    cv_scores = cross_val_score(lda, X, y, cv=CV_FOLDS, scoring="accuracy")
+    print_step(f"Validation croisée ({n_folds}-fold)")
     print(f"    Scores : {', '.join(f'{s:.4f}' for s in cv_scores)}")
     print(f"    Moyenne : {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+    print(f"    Ajustement moyen par pli : {cv.fit_time.mean() * 1000:.1f} ms")
 
     metrics_rows.extend([
         {"metric": "CV_Mean_Accuracy", "value": cv_scores.mean()},
@@ -118,56 +129,59 @@ def perform_discriminant_analysis() -> None:
     metrics_df = pd.DataFrame(metrics_rows)
     save_table(metrics_df, "da_metrics.csv")
 
-    # ── Figure : scores CV ──
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bars = ax.bar(
-        range(1, CV_FOLDS + 1), cv_scores,
-        color="steelblue", alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    ax.axhline(
-        cv_scores.mean(), color="red", linestyle="--", linewidth=2,
-        label=f"Moyenne = {cv_scores.mean():.4f}",
-    )
-    ax.set_xlabel("Fold", fontsize=12)
-    ax.set_ylabel("Accuracy", fontsize=12)
-    ax.set_title(
-        "Validation croisée — Scores par fold",
-        fontsize=14, fontweight="bold",
-    )
-    ax.set_ylim([min(cv_scores) - 0.02, 1.0])
-    ax.legend()
-    ax.grid(axis="y", alpha=0.3)
-
-    for i, bar in enumerate(bars):
-        h = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2, h,
-            f"{cv_scores[i]:.4f}", ha="center", va="bottom", fontsize=10,
-        )
-    fig.tight_layout()
-    save_figure(fig, "da_cv_scores.png")
-
-    # ── Figure : confusion CV ──
+    if figures_enabled():
+        import matplotlib.pyplot as plt
+        import seaborn as sns
 
-    y_pred_cv = cross_val_predict(lda, X, y, cv=CV_FOLDS)
-    cm_cv = confusion_matrix(y, y_pred_cv)
+        # ── Figure : scores CV ──
 
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.heatmap(
-        cm_cv, annot=True, fmt="d", cmap="Greens",
-        xticklabels=["Vénéneux (0)", "Comestible (1)"],
-        yticklabels=["Vénéneux (0)", "Comestible (1)"],
-        cbar_kws={"label": "Fréquence"}, ax=ax,
-    )
-    ax.set_title(
-        f"Matrice de confusion — Validation croisée ({CV_FOLDS}-fold)",
-        fontsize=14, fontweight="bold",
-    )
-    ax.set_ylabel("Vraie classe", fontsize=12)
-    ax.set_xlabel("Classe prédite", fontsize=12)
-    fig.tight_layout()
-    save_figure(fig, "da_confusion_cv.png")
+        fig, ax = plt.subplots(figsize=(10, 6))
+        bars = ax.bar(
+            range(1, n_folds + 1), cv_scores,
+            color="steelblue", alpha=0.85, edgecolor="black", linewidth=0.5,
+        )
+        ax.axhline(
+            cv_scores.mean(), color="red", linestyle="--", linewidth=2,
+            label=f"Moyenne = {cv_scores.mean():.4f}",
+        )
+        ax.set_xlabel("Fold", fontsize=12)
+        ax.set_ylabel("Accuracy", fontsize=12)
+        ax.set_title(
+            "Validation croisée — Scores par fold",
+            fontsize=14, fontweight="bold",
+        )
+        ax.set_ylim([min(cv_scores) - 0.02, 1.0])
+        ax.legend()
+        ax.grid(axis="y", alpha=0.3)
+
+        for i, bar in enumerate(bars):
+            h = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width() / 2, h,
+                f"{cv_scores[i]:.4f}", ha="center", va="bottom", fontsize=10,
+            )
+        fig.tight_layout()
+        save_figure(fig, "da_cv_scores.png")
+
+        # ── Figure : confusion CV ──
+
+        cm_cv = confusion_matrix(y, cv.y_pred)
+
+        fig, ax = plt.subplots(figsize=(8, 6))
+        sns.heatmap(
+            cm_cv, annot=True, fmt="d", cmap="Greens",
+            xticklabels=["Vénéneux (0)", "Comestible (1)"],
+            yticklabels=["Vénéneux (0)", "Comestible (1)"],
+            cbar_kws={"label": "Fréquence"}, ax=ax,
+        )
+        ax.set_title(
+            f"Matrice de confusion — Validation croisée ({n_folds}-fold)",
+            fontsize=14, fontweight="bold",
+        )
+        ax.set_ylabel("Vraie classe", fontsize=12)
+        ax.set_xlabel("Classe prédite", fontsize=12)
+        fig.tight_layout()
+        save_figure(fig, "da_confusion_cv.png")
 
     # ── Résumé ──
 
@@ -176,9 +190,16 @@ def perform_discriminant_analysis() -> None:
     print()
     print("  Outputs :")
     print("    Tables  — da_metrics.csv, da_confusion.csv")
-    print("    Figures — da_confusion.png, da_cv_scores.png, da_confusion_cv.png")
+    if figures_enabled():
+        print("    Figures — da_confusion.png, da_cv_scores.png, da_confusion_cv.png")
     print()
 
 
 if __name__ == "__main__":
-    perform_discriminant_analysis()
+    parser = argparse.ArgumentParser(description="Analyse discriminante linéaire (LDA).")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    with profiled("05_discriminant", args):
+        perform_discriminant_analysis()
@@ -2,42 +2,289 @@
 06 — Analyse de sensibilite au choix de k (nombre d'axes ACM).
 
 Etudie l'impact du nombre de composantes ACM retenues sur :
-  - La performance de classification (LDA, CV 5-fold)
+  - La performance de classification (LDA, CV 5-fold et CV répétée)
   - La qualite du clustering (silhouette score, K-Means k=3)
   - L'inertie cumulee
 
 Repond a la question critique : "Pourquoi k=5 et pas k=8 ?"
+
+Moteur K-Means au choix (``KMEANS_BACKEND`` ou ``--backend``, voir
+``clustering.fit_kmeans``). Silhouette exacte, échantillonnée (avec
+intervalle de confiance) ou simplifiée selon la taille du jeu
+(``SILHOUETTE_MODE`` ou ``--silhouette``, voir ``clustering.silhouette``) ;
+le mode retenu est consigné dans ``sensitivity_k.csv``.
+
+Balayage parallèle : la grille k x nombre de clusters x graine
+(``K_VALUES``, ``CLUSTER_VALUES``, ``SEEDS`` ou ``--k``, ``--clusters``,
+``--seeds``) est découpée en cellules K-Means + silhouette indépendantes,
+une par (k, clusters, graine), exécutées sur un pool de processus
+(``--jobs``). Chaque cellule terminée est ajoutée
+à ``data/processed/sensitivity_sweep.jsonl`` : un balayage interrompu
+reprend là où il s'est arrêté (``--fresh`` pour repartir de zéro). Le
+magasin est vidé si le contenu des coordonnées ACM, le code des cellules
+ou la configuration changent.
+
+La LDA est évaluée en forme close pour tous les k à la fois
+(``validation.lda_sweep``) : sur les plis persistés (stratifiés, non
+mélangés), puis sur ``LDA_REPEATS`` partitions stratifiées mélangées
+(``--repeats``). ``lda_repeated_cv_std`` est, comme ``lda_cv_std``, un
+écart-type entre plis (moyenné sur les répétitions) : les deux colonnes
+sont comparables, l'écart mesurant l'effet de l'ordre du fichier sur les
+plis non mélangés.
+
+``sensitivity_k.csv`` porte sur la cellule de référence (premier nombre de
+clusters, première graine) ; ``sensitivity_grid.csv`` sur toute la grille.
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score
-from sklearn.model_selection import cross_val_score
 
+from clustering import KMEANS_BACKENDS, SILHOUETTE_MODES, fit_kmeans, silhouette
+from profiling import add_profile_arguments, profiled
 from utils import (
-    load_processed_data, load_mca_coordinates,
-    save_figure, save_table, print_section, print_step,
+    get_project_root, load_processed_data, load_mca_coordinates, load_cv_folds,
+    save_figure, save_table, print_section, print_step, cpu_budget,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
+from validation import lda_sweep, make_repeated_folds
 
 
 # ── Configuration ──────────────────────────────────────────
 
 K_VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10]
 N_CLUSTERS = 3
-CV_FOLDS = 5
 RANDOM_STATE = 42
+KMEANS_BACKEND = "auto"
+SILHOUETTE_MODE = "auto"
+CLUSTER_VALUES = [N_CLUSTERS]
+SEEDS = [RANDOM_STATE]
+LDA_REPEATS = 100
+SWEEP_STORE = "data/processed/sensitivity_sweep.jsonl"
+
+
+# ── Magasin de résultats ───────────────────────────────────
+
+class SweepStore:
+    """Résultats des cellules du balayage, en JSON Lines (ajout seul).
+
+    La première ligne porte l'empreinte des entrées (coordonnées ACM et
+    configuration) ; un magasin d'empreinte différente est ignoré et
+    réécrit. Une dernière ligne tronquée (interruption) est ignorée.
+    """
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def key(record: dict) -> tuple:
+        return record["kind"], record["k"], record.get("n_clusters"), record.get("seed")
+
+    def load(self) -> dict[tuple, dict]:
+        """Cellules déjà calculées (vide si le magasin est absent ou périmé)."""
+        if not self.path.exists():
+            return {}
+        records = {}
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        try:
+            if not lines or json.loads(lines[0]).get("fingerprint") != self.fingerprint:
+                return {}
+        except json.JSONDecodeError:
+            return {}
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[self.key(record)] = record
+        return records
+
+    def reset(self, records: dict[tuple, dict]) -> None:
+        """Réécrit le magasin avec l'empreinte courante et ``records``."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+            for record in records.values():
+                f.write(json.dumps(record) + "\n")
+        tmp.replace(self.path)
+
+    def append(self, record: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def sweep_fingerprint(backend: str, silhouette_mode: str) -> str:
+    """Empreinte du contenu des coordonnées ACM, du code des cellules et de la configuration."""
+    import clustering
+
+    processed = get_project_root() / "data" / "processed"
+    files = []
+    for name in ("mca_coords.npy", "mca_coords.csv"):
+        path = processed / name
+        if path.exists():
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+            files.append([name, h.hexdigest()])
+    code = [
+        hashlib.sha256(Path(module).read_bytes()).hexdigest()
+        for module in (__file__, clustering.__file__)
+    ]
+    config = [backend, silhouette_mode]
+    return hashlib.sha256(json.dumps([files, code, config]).encode()).hexdigest()
+
+
+# ── Cellules ───────────────────────────────────────────────
+
+_WORKER: dict = {}
+
+
+def _init_worker(threads: int | None = None) -> None:
+    """Charge les données une fois par processus (coordonnées projetées en mémoire)."""
+    if threads:
+        from threadpoolctl import threadpool_limits
+        _WORKER["limits"] = threadpool_limits(threads)
+    _WORKER["threads"] = threads
+    _WORKER["X"] = load_mca_coordinates(mmap=True).to_numpy()
+
+
+def run_cell(task: tuple, backend: str, silhouette_mode: str) -> dict:
+    """Calcule une cellule du balayage.
+
+    Parameters
+    ----------
+    task : tuple
+        ``("cluster", k, n_clusters, seed)``.
+    backend : str
+        Moteur K-Means.
+    silhouette_mode : str
+        Mode de silhouette.
+
+    Returns
+    -------
+    dict
+        Enregistrement de la cellule (clé, métriques, durée).
+    """
+    X_all = _WORKER["X"]
+    start = time.perf_counter()
+    _, k, n_clusters, seed = task
+    kmeans = fit_kmeans(
+        X_all, n_clusters, k_axes=k, backend=backend, random_state=seed, n_jobs=_WORKER["threads"],
+    )
+    sil = silhouette(X_all, kmeans.labels, k_axes=k, mode=silhouette_mode, random_state=seed)
+    record = {
+        "kind": "cluster", "k": k, "n_clusters": n_clusters, "seed": seed,
+        "silhouette_score": sil.score,
+        "silhouette_mode": sil.mode,
+        "silhouette_ci_low": sil.ci_low,
+        "silhouette_ci_high": sil.ci_high,
+        "kmeans_inertia": kmeans.inertia,
+    }
+    record["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_sweep(
+    tasks: list[tuple], store: SweepStore, done: dict[tuple, dict],
+    backend: str, silhouette_mode: str, jobs: int,
+) -> dict[tuple, dict]:
+    """Exécute les cellules manquantes, en parallèle si ``jobs > 1``.
+
+    Chaque résultat est ajouté au magasin dès réception ; en cas
+    d'interruption, les cellules terminées sont conservées.
+    """
+    todo = [t for t in tasks if SweepStore.key(_task_record(t)) not in done]
+    print_step(f"Balayage : {len(tasks)} cellules, {len(tasks) - len(todo)} déjà calculées, "
+               f"{len(todo)} à calculer ({jobs} processus)")
+    cell = partial(run_cell, backend=backend, silhouette_mode=silhouette_mode)
+
+    n_done = len(tasks) - len(todo)
+
+    def record(result: dict) -> None:
+        nonlocal n_done
+        store.append(result)
+        done[SweepStore.key(result)] = result
+        n_done += 1
+        print(f"    [{n_done:>{len(str(len(tasks)))}}/{len(tasks)}] "
+              f"{_describe(result)} ({result['elapsed_s']:.2f} s)", flush=True)
+
+    if jobs <= 1:
+        _init_worker()
+        for task in todo:
+            record(cell(task))
+        return done
+
+    # Cellules les plus coûteuses (k élevé) en premier : meilleur équilibrage
+    todo.sort(key=lambda t: -t[1])
+    threads = max(1, cpu_budget() // jobs)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(threads,)) as pool:
+        futures = [pool.submit(cell, task) for task in todo]
+        try:
+            for future in as_completed(futures):
+                record(future.result())
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return done
+
+
+def _task_record(task: tuple) -> dict:
+    return {"kind": "cluster", "k": task[1], "n_clusters": task[2], "seed": task[3]}
+
+
+def _describe(record: dict) -> str:
+    return (f"k={record['k']:2d} K-Means {record['n_clusters']} clusters (graine {record['seed']})  "
+            f"Silhouette={record['silhouette_score']:.3f} ({record['silhouette_mode']})")
 
 
 # ── Pipeline ───────────────────────────────────────────────
 
-def sensitivity_analysis() -> pd.DataFrame:
+def sensitivity_analysis(
+    backend: str = KMEANS_BACKEND,
+    silhouette_mode: str = SILHOUETTE_MODE,
+    k_values: list[int] = K_VALUES,
+    cluster_values: list[int] = CLUSTER_VALUES,
+    seeds: list[int] = SEEDS,
+    jobs: int = 1,
+    fresh: bool = False,
+    lda_repeats: int = LDA_REPEATS,
+) -> pd.DataFrame:
     """Analyse de sensibilite : impact de k sur LDA et clustering.
 
+    Parameters
+    ----------
+    backend : str
+        Moteur K-Means (voir ``clustering.KMEANS_BACKENDS``).
+    silhouette_mode : str
+        Mode de silhouette (voir ``clustering.SILHOUETTE_MODES``).
+    k_values : list of int
+        Nombres d'axes ACM.
+    cluster_values : list of int
+        Nombres de clusters K-Means ; le premier est la référence.
+    seeds : list of int
+        Graines K-Means ; la première est la référence.
+    jobs : int
+        Processus simultanés.
+    fresh : bool
+        Ignorer les résultats déjà enregistrés.
+    lda_repeats : int
+        Répétitions de la validation croisée LDA sur des partitions
+        mélangées (0 : plis persistés seuls).
+
     Returns
     -------
     pd.DataFrame
@@ -46,55 +293,67 @@ def sensitivity_analysis() -> pd.DataFrame:
 
     print_section("06 — Analyse de sensibilite (impact de k)")
 
-    coords = load_mca_coordinates()
-    df = load_processed_data()
-    y = (df["class"] == "e").astype(int)
-
     # Inertie cumulee (depuis les eigenvalues)
-    from pathlib import Path
     eigen_path = Path(__file__).resolve().parent.parent / "reports" / "tables" / "mca_eigenvalues.csv"
     eigen_df = pd.read_csv(eigen_path)
     cumulative_inertia = eigen_df["Cumulative_Inertia_%"].values
 
-    results = []
-
-    for k in K_VALUES:
-        X = coords.iloc[:, :k].values
-        print_step(f"k={k:2d} axes ({cumulative_inertia[k-1]:.1f}% inertie)")
-
-        # LDA — CV 5-fold
-        lda = LinearDiscriminantAnalysis()
-        cv_scores = cross_val_score(lda, X, y, cv=CV_FOLDS, scoring="accuracy")
-        cv_mean = cv_scores.mean()
-        cv_std = cv_scores.std()
-
-        # LDA — Train accuracy
-        lda.fit(X, y)
-        train_acc = lda.score(X, y)
-
-        # Clustering — Silhouette
-        kmeans = KMeans(n_clusters=N_CLUSTERS, random_state=RANDOM_STATE, n_init=10)
-        labels = kmeans.fit_predict(X)
-        sil = silhouette_score(X, labels)
-
-        # Clustering — Inertie K-Means
-        km_inertia = kmeans.inertia_
-
-        print(
-            f"         LDA train={train_acc:.3f}  "
-            f"CV={cv_mean:.3f}+/-{cv_std:.3f}  "
-            f"Silhouette={sil:.3f}"
-        )
+    # ── LDA : tous les k en forme close ──
+
+    X_all = load_mca_coordinates(mmap=True).to_numpy()
+    y = (load_processed_data()["class"] == "e").astype(int).to_numpy()
+    folds = load_cv_folds(len(y))
+    n_folds = int(folds.max()) + 1
+    start = time.perf_counter()
+    lda = lda_sweep(X_all, y, folds, k_values)
+    print_step(f"LDA CV {n_folds}-fold, {len(k_values)} valeurs de k : {time.perf_counter() - start:.3f} s")
+    if lda_repeats:
+        start = time.perf_counter()
+        repeated = lda_sweep(X_all, y, make_repeated_folds(y, n_folds, lda_repeats, RANDOM_STATE), k_values)
+        print_step(f"LDA CV répétée ({lda_repeats} x {n_folds} plis) : {time.perf_counter() - start:.3f} s")
+    lda_cv_mean, lda_cv_std = lda.cv_mean(), lda.cv_std()
+
+    # ── Balayage K-Means ──
+
+    store = SweepStore(
+        get_project_root() / SWEEP_STORE, sweep_fingerprint(backend, silhouette_mode),
+    )
+    done = {} if fresh else store.load()
+    store.reset(done)
+    tasks = [
+        ("cluster", k, n_clusters, seed)
+        for k in k_values for n_clusters in cluster_values for seed in seeds
+    ]
+    start = time.perf_counter()
+    done = run_sweep(tasks, store, done, backend, silhouette_mode, jobs)
+    print_step(f"Balayage terminé en {time.perf_counter() - start:.2f} s")
+
+    # ── Tables ──
+
+    grid_df = pd.DataFrame([
+        done[SweepStore.key(_task_record(t))] for t in tasks
+    ]).drop(columns=["kind"]).round({
+        "silhouette_score": 4, "silhouette_ci_low": 4, "silhouette_ci_high": 4, "kmeans_inertia": 2,
+    })
+    save_table(grid_df, "sensitivity_grid.csv")
 
+    results = []
+    for j, k in enumerate(k_values):
+        cluster = done[("cluster", k, cluster_values[0], seeds[0])]
         results.append({
             "k": k,
             "cumulative_inertia_%": round(cumulative_inertia[k-1], 1),
-            "lda_train_accuracy": round(train_acc, 4),
-            "lda_cv_mean": round(cv_mean, 4),
-            "lda_cv_std": round(cv_std, 4),
-            "silhouette_score": round(sil, 4),
-            "kmeans_inertia": round(km_inertia, 2),
-            "overfitting_gap": round(train_acc - cv_mean, 4),
+            "lda_train_accuracy": round(lda.train_accuracy[j], 4),
+            "lda_cv_mean": round(lda_cv_mean[j], 4),
+            "lda_cv_std": round(lda_cv_std[j], 4),
+            "lda_repeated_cv_mean": round(repeated.cv_mean()[j], 4) if lda_repeats else np.nan,
+            "lda_repeated_cv_std": round(repeated.cv_std()[j], 4) if lda_repeats else np.nan,
+            "silhouette_score": round(cluster["silhouette_score"], 4),
+            "silhouette_mode": cluster["silhouette_mode"],
+            "silhouette_ci_low": round(cluster["silhouette_ci_low"], 4),
+            "silhouette_ci_high": round(cluster["silhouette_ci_high"], 4),
+            "kmeans_inertia": round(cluster["kmeans_inertia"], 2),
+            "overfitting_gap": round(lda.train_accuracy[j] - lda_cv_mean[j], 4),
         })
 
     results_df = pd.DataFrame(results)
@@ -108,95 +367,102 @@ def sensitivity_analysis() -> pd.DataFrame:
     print()
     print_step(f"Meilleur k (CV) = {best_k} axes ({best_cv:.4f} accuracy)")
 
-    # ── Figure 1 : LDA accuracy vs k ──
+    if figures_enabled():
+        import matplotlib.pyplot as plt
 
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+        # ── Figure 1 : LDA accuracy vs k ──
 
-    # Panel 1 : Accuracy
-    axes[0].plot(
-        results_df["k"], results_df["lda_train_accuracy"],
-        "o-", label="Train", color="#2196F3", linewidth=2, markersize=8,
-    )
-    axes[0].plot(
-        results_df["k"], results_df["lda_cv_mean"],
-        "s-", label="CV 5-fold", color="#F44336", linewidth=2, markersize=8,
-    )
-    axes[0].fill_between(
-        results_df["k"],
-        results_df["lda_cv_mean"] - results_df["lda_cv_std"],
-        results_df["lda_cv_mean"] + results_df["lda_cv_std"],
-        alpha=0.15, color="#F44336",
-    )
-    axes[0].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
-    axes[0].set_ylabel("Accuracy", fontsize=12)
-    axes[0].set_title("LDA — Accuracy vs k", fontsize=13, fontweight="bold")
-    axes[0].legend()
-    axes[0].grid(True, alpha=0.3)
-    axes[0].set_xticks(K_VALUES)
-
-    # Panel 2 : Silhouette
-    colors_sil = ["#4CAF50" if s > 0.3 else "#FF9800" if s > 0.2 else "#F44336"
-                   for s in results_df["silhouette_score"]]
-    axes[1].bar(
-        results_df["k"], results_df["silhouette_score"],
-        color=colors_sil, alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    axes[1].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
-    axes[1].set_ylabel("Silhouette Score", fontsize=12)
-    axes[1].set_title("Clustering — Silhouette vs k", fontsize=13, fontweight="bold")
-    axes[1].grid(axis="y", alpha=0.3)
-    axes[1].set_xticks(K_VALUES)
-
-    # Panel 3 : Overfitting gap
-    axes[2].bar(
-        results_df["k"], results_df["overfitting_gap"],
-        color="#9C27B0", alpha=0.7, edgecolor="black", linewidth=0.5,
-    )
-    axes[2].axhline(y=0.1, color="r", linestyle="--", alpha=0.5, label="Seuil 10%")
-    axes[2].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
-    axes[2].set_ylabel("Gap (Train - CV)", fontsize=12)
-    axes[2].set_title("Sur-apprentissage — Gap vs k", fontsize=13, fontweight="bold")
-    axes[2].legend()
-    axes[2].grid(axis="y", alpha=0.3)
-    axes[2].set_xticks(K_VALUES)
-
-    fig.tight_layout()
-    save_figure(fig, "sensitivity_k_analysis.png")
-
-    # ── Figure 2 : Inertie cumulee vs performance ──
-
-    fig, ax1 = plt.subplots(figsize=(10, 6))
-    color1 = "#2196F3"
-    color2 = "#F44336"
-
-    ax1.set_xlabel("k (nombre d'axes ACM)", fontsize=12)
-    ax1.set_ylabel("Inertie cumulee (%)", fontsize=12, color=color1)
-    ax1.plot(
-        results_df["k"], results_df["cumulative_inertia_%"],
-        "o-", color=color1, linewidth=2, markersize=8, label="Inertie cumulee",
-    )
-    ax1.tick_params(axis="y", labelcolor=color1)
-    ax1.axhline(y=90, color=color1, linestyle="--", alpha=0.3)
-    ax1.set_xticks(K_VALUES)
-
-    ax2 = ax1.twinx()
-    ax2.set_ylabel("LDA CV Accuracy", fontsize=12, color=color2)
-    ax2.plot(
-        results_df["k"], results_df["lda_cv_mean"],
-        "s-", color=color2, linewidth=2, markersize=8, label="CV Accuracy",
-    )
-    ax2.tick_params(axis="y", labelcolor=color2)
+        fig, axes = plt.subplots(1, 3, figsize=(18, 5))
 
-    fig.suptitle(
-        "Inertie ACM vs Performance LDA",
-        fontsize=14, fontweight="bold",
-    )
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc="center right")
-    ax1.grid(True, alpha=0.3)
-    fig.tight_layout()
-    save_figure(fig, "sensitivity_inertia_vs_accuracy.png")
+        # Panel 1 : Accuracy
+        axes[0].plot(
+            results_df["k"], results_df["lda_train_accuracy"],
+            "o-", label="Train", color="#2196F3", linewidth=2, markersize=8,
+        )
+        axes[0].plot(
+            results_df["k"], results_df["lda_cv_mean"],
+            "s-", label="CV 5-fold", color="#F44336", linewidth=2, markersize=8,
+        )
+        axes[0].fill_between(
+            results_df["k"],
+            results_df["lda_cv_mean"] - results_df["lda_cv_std"],
+            results_df["lda_cv_mean"] + results_df["lda_cv_std"],
+            alpha=0.15, color="#F44336",
+        )
+        axes[0].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
+        axes[0].set_ylabel("Accuracy", fontsize=12)
+        axes[0].set_title("LDA — Accuracy vs k", fontsize=13, fontweight="bold")
+        axes[0].legend()
+        axes[0].grid(True, alpha=0.3)
+        axes[0].set_xticks(k_values)
+
+        # Panel 2 : Silhouette
+        colors_sil = ["#4CAF50" if s > 0.3 else "#FF9800" if s > 0.2 else "#F44336"
+                       for s in results_df["silhouette_score"]]
+        axes[1].bar(
+            results_df["k"], results_df["silhouette_score"],
+            yerr=[
+                results_df["silhouette_score"] - results_df["silhouette_ci_low"],
+                results_df["silhouette_ci_high"] - results_df["silhouette_score"],
+            ],
+            color=colors_sil, alpha=0.85, edgecolor="black", linewidth=0.5, capsize=4,
+        )
+        axes[1].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
+        axes[1].set_ylabel("Silhouette Score", fontsize=12)
+        axes[1].set_title("Clustering — Silhouette vs k", fontsize=13, fontweight="bold")
+        axes[1].grid(axis="y", alpha=0.3)
+        axes[1].set_xticks(k_values)
+
+        # Panel 3 : Overfitting gap
+        axes[2].bar(
+            results_df["k"], results_df["overfitting_gap"],
+            color="#9C27B0", alpha=0.7, edgecolor="black", linewidth=0.5,
+        )
+        axes[2].axhline(y=0.1, color="r", linestyle="--", alpha=0.5, label="Seuil 10%")
+        axes[2].set_xlabel("k (nombre d'axes ACM)", fontsize=12)
+        axes[2].set_ylabel("Gap (Train - CV)", fontsize=12)
+        axes[2].set_title("Sur-apprentissage — Gap vs k", fontsize=13, fontweight="bold")
+        axes[2].legend()
+        axes[2].grid(axis="y", alpha=0.3)
+        axes[2].set_xticks(k_values)
+
+        fig.tight_layout()
+        save_figure(fig, "sensitivity_k_analysis.png")
+
+        # ── Figure 2 : Inertie cumulee vs performance ──
+
+        fig, ax1 = plt.subplots(figsize=(10, 6))
+        color1 = "#2196F3"
+        color2 = "#F44336"
+
+        ax1.set_xlabel("k (nombre d'axes ACM)", fontsize=12)
+        ax1.set_ylabel("Inertie cumulee (%)", fontsize=12, color=color1)
+        ax1.plot(
+            results_df["k"], results_df["cumulative_inertia_%"],
+            "o-", color=color1, linewidth=2, markersize=8, label="Inertie cumulee",
+        )
+        ax1.tick_params(axis="y", labelcolor=color1)
+        ax1.axhline(y=90, color=color1, linestyle="--", alpha=0.3)
+        ax1.set_xticks(k_values)
+
+        ax2 = ax1.twinx()
+        ax2.set_ylabel("LDA CV Accuracy", fontsize=12, color=color2)
+        ax2.plot(
+            results_df["k"], results_df["lda_cv_mean"],
+            "s-", color=color2, linewidth=2, markersize=8, label="CV Accuracy",
+        )
+        ax2.tick_params(axis="y", labelcolor=color2)
+
+        fig.suptitle(
+            "Inertie ACM vs Performance LDA",
+            fontsize=14, fontweight="bold",
+        )
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, loc="center right")
+        ax1.grid(True, alpha=0.3)
+        fig.tight_layout()
+        save_figure(fig, "sensitivity_inertia_vs_accuracy.png")
 
     # ── Resume ──
 
@@ -204,12 +470,54 @@ def sensitivity_analysis() -> pd.DataFrame:
     print_step("Analyse de sensibilite terminee.")
     print()
     print("  Outputs :")
-    print("    Tables  — sensitivity_k.csv")
-    print("    Figures — sensitivity_k_analysis.png, sensitivity_inertia_vs_accuracy.png")
+    print("    Tables  — sensitivity_k.csv, sensitivity_grid.csv")
+    if figures_enabled():
+        print("    Figures — sensitivity_k_analysis.png, sensitivity_inertia_vs_accuracy.png")
     print()
 
     return results_df
 
 
 if __name__ == "__main__":
-    sensitivity_analysis()
+    parser = argparse.ArgumentParser(description="Analyse de sensibilite au choix de k.")
+    parser.add_argument("--backend", choices=KMEANS_BACKENDS, default=KMEANS_BACKEND,
+                        help=f"Moteur K-Means (defaut : {KMEANS_BACKEND})")
+    parser.add_argument("--silhouette", choices=SILHOUETTE_MODES, default=SILHOUETTE_MODE,
+                        help=f"Mode de silhouette (defaut : {SILHOUETTE_MODE})")
+    parser.add_argument("--k", type=int, nargs="+", default=K_VALUES, metavar="K",
+                        help="Nombres d'axes ACM (defaut : %(default)s)")
+    parser.add_argument("--clusters", type=int, nargs="+", default=CLUSTER_VALUES, metavar="N",
+                        help="Nombres de clusters ; le premier est la reference (defaut : %(default)s)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=SEEDS, metavar="SEED",
+                        help="Graines K-Means ; la premiere est la reference (defaut : %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=cpu_budget(),
+                        help="Processus simultanes (defaut : budget CPU, PIPELINE_CPUS s'il est fixe, sinon nombre de CPU)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignorer les cellules deja calculees")
+    parser.add_argument("--repeats", type=int, default=LDA_REPEATS,
+                        help=f"Repetitions de la CV LDA sur partitions melangees (defaut : {LDA_REPEATS})")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    n_axes = len(pd.read_csv(get_project_root() / "reports" / "tables" / "mca_eigenvalues.csv"))
+    if any(k < 1 or k > n_axes for k in args.k):
+        parser.error(f"--k : valeurs entre 1 et {n_axes}")
+    if any(n < 2 for n in args.clusters):
+        parser.error("--clusters : au moins 2 clusters")
+    if args.jobs < 1:
+        parser.error("--jobs doit etre strictement positif")
+    if args.repeats < 0:
+        parser.error("--repeats doit etre positif ou nul")
+    try:
+        with profiled("06_sensitivity", args):
+            sensitivity_analysis(
+                args.backend, args.silhouette, sorted(set(args.k)),
+                # Ordre conservé : la première valeur désigne la cellule de référence
+                list(dict.fromkeys(args.clusters)), list(dict.fromkeys(args.seeds)),
+                args.jobs, args.fresh, args.repeats,
+            )
+    except KeyboardInterrupt:
+        print()
+        print_step(f"Interrompu — cellules terminees conservees dans {SWEEP_STORE}")
+        raise SystemExit(130)
@@ -2,38 +2,57 @@
 07 — Comparaison de modeles de classification.
 
 Compare 4 classifieurs sur les coordonnees ACM (k=5) avec validation
-croisee 5-fold : LDA, Logistic Regression, Random Forest, SVM.
+croisee 5-fold : LDA, Logistic Regression, Random Forest, SVM. Tous les
+modeles sont evalues sur les memes plis (``cv_folds.npz``), un ajustement
+par pli (``validation.fit_fold``).
+
+Les plis et l'ajustement final de chaque modele sont des taches
+independantes, executees sur un pool de processus dans un budget CPU
+global (``CPU_BUDGET`` ou ``--cpus`` ; par defaut ``PIPELINE_CPUS``,
+la part transmise par ``pipeline.py``, sinon le nombre de CPU) : le
+budget est partage entre processus et threads (BLAS, ``n_jobs`` des
+forets). ``model_comparison.csv`` consigne, a cote de l'accuracy, le cout
+du modele servi : duree d'ajustement, latence de prediction (``predict_proba``
+par 1 000 lignes, comme ``serve.py``), pic de memoire pendant l'ajustement
+et taille du fichier ``.joblib``.
 
 Repond a la question : "Est-ce que 88.7% c'est bien ? Peut-on faire mieux ?"
 """
 
 from __future__ import annotations
 
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
-from sklearn.model_selection import cross_val_score, cross_val_predict
+from sklearn.base import clone
 from sklearn.metrics import (
     confusion_matrix, classification_report,
     precision_score, recall_score, f1_score,
 )
 import warnings
 
+from profiling import add_profile_arguments, profiled
 from utils import (
-    load_processed_data, load_mca_coordinates,
-    save_figure, save_table, print_section, print_step,
+    load_processed_data, load_mca_coordinates, load_cv_folds, peak_memory, cpu_budget,
+    save_classifier, save_figure, save_table, print_section, print_step,
+    add_figure_arguments, figures_enabled, set_figure_mode,
 )
+from validation import combine_folds, fit_fold
 
 
 # ── Configuration ──────────────────────────────────────────
 
 K_AXES = 5
-CV_FOLDS = 5
 RANDOM_STATE = 42
+CPU_BUDGET = None              # None : PIPELINE_CPUS s'il est fixé, sinon nombre de CPU
+PREDICT_REPEATS = 5            # mesure de latence : meilleur de N passages
 
 MODELS = {
     "LDA": LinearDiscriminantAnalysis(),
@@ -49,11 +68,146 @@ MODELS = {
 }
 
 
+# ── Tâches ─────────────────────────────────────────────────
+
+_WORKER: dict = {}
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds: np.ndarray, threads: int) -> None:
+    """Données partagées et limite de threads du processus."""
+    from threadpoolctl import threadpool_limits
+
+    _WORKER.update(X=X, y=y, folds=folds, threads=threads)
+    _WORKER["limits"] = threadpool_limits(threads)
+
+
+def _serving_model(model):
+    """Modèle persisté pour le service de prédiction : probabilités requises."""
+    if not hasattr(model, "predict_proba") and "probability" in model.get_params():
+        return clone(model).set_params(probability=True)
+    return None
+
+
+def run_task(task: tuple, model) -> dict:
+    """Exécute une tâche de la comparaison.
+
+    Parameters
+    ----------
+    task : tuple
+        ``(name, "fold", fold)`` : ajustement hors pli et prédiction du pli ;
+        ``(name, "refit")`` : ajustement sur tout le jeu (accuracy
+        d'entraînement) ; ``(name, "serve")`` : ajustement et coût du modèle
+        persisté (durée, pic de mémoire, latence de prédiction).
+    model : estimateur scikit-learn
+        Modèle (non ajusté) de la tâche.
+
+    Returns
+    -------
+    dict
+        Résultat de la tâche ; ``"model"`` porte le modèle ajusté.
+    """
+    X, y, folds = _WORKER["X"], _WORKER["y"], _WORKER["folds"]
+    n_jobs = model.get_params().get("n_jobs", False)
+    if n_jobs is not False:
+        model = clone(model).set_params(n_jobs=_WORKER["threads"])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if task[1] == "fold":
+            return {"fold": fit_fold(model, X, y, folds, task[2])}
+        if task[1] == "refit":
+            model = clone(model).fit(X, y)
+            return {"train_accuracy": float(model.score(X, y))}
+
+        model = clone(model)
+        with peak_memory() as memory:
+            start = time.perf_counter()
+            model.fit(X, y)
+            fit_time = time.perf_counter() - start
+        predict = model.predict_proba if hasattr(model, "predict_proba") else model.predict
+        latency = np.inf
+        for _ in range(PREDICT_REPEATS):
+            start = time.perf_counter()
+            predict(X)
+            latency = min(latency, time.perf_counter() - start)
+    if n_jobs is not False:
+        model.set_params(n_jobs=n_jobs)          # modèle persisté : parallélisme d'origine
+    return {
+        "model": model,
+        "fit_time_s": fit_time,
+        "predict_ms_per_1k": latency * 1000 / len(X) * 1000,
+        "peak_memory_mb": memory["peak_mb"],
+    }
+
+
+def model_tasks(models: dict, n_folds: int) -> list[tuple]:
+    """Tâches de chaque modèle, ajustements sur tout le jeu en premier (les plus longs).
+
+    Le modèle servi est ajusté par la tâche ``"serve"`` ; une tâche
+    ``"refit"`` distincte n'existe que s'il diffère du modèle évalué
+    (SVM avec probabilités).
+    """
+    full = []
+    for name, model in models.items():
+        if _serving_model(model) is not None:
+            full.append((name, "refit"))
+        full.append((name, "serve"))
+    return full + [(name, "fold", fold) for fold in range(n_folds) for name in models]
+
+
+def run_tasks(models: dict, X: np.ndarray, y: np.ndarray, folds: np.ndarray, budget: int) -> dict[tuple, dict]:
+    """Exécute toutes les tâches dans le budget CPU ``budget``.
+
+    Returns
+    -------
+    dict
+        Résultat de chaque tâche, indexé par la tâche.
+    """
+    tasks = model_tasks(models, int(folds.max()) + 1)
+    jobs = min(budget, len(tasks))
+    threads = max(1, budget // jobs)
+    print_step(f"{len(tasks)} taches, budget {budget} CPU : {jobs} processus x {threads} thread(s)")
+
+    def model_for(task: tuple):
+        model = models[task[0]]
+        serving = _serving_model(model) if task[1] == "serve" else None
+        return model if serving is None else serving
+
+    results = {}
+    start = time.perf_counter()
+    if jobs <= 1:
+        # Tâches "serve" une à une dans un processus à part : leur mesure
+        # remet à zéro les pics de mémoire du processus (cf. utils.peak_memory),
+        # que --profile relève dans le processus principal
+        _init_worker(X, y, folds, threads)
+        with ProcessPoolExecutor(
+            max_workers=1, initializer=_init_worker, initargs=(X, y, folds, threads),
+        ) as pool:
+            for task in tasks:
+                if task[1] == "serve":
+                    results[task] = pool.submit(run_task, task, model_for(task)).result()
+                else:
+                    results[task] = run_task(task, model_for(task))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(X, y, folds, threads),
+        ) as pool:
+            futures = {pool.submit(run_task, task, model_for(task)): task for task in tasks}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    print_step(f"Taches terminees en {time.perf_counter() - start:.2f} s")
+    return results
+
+
 # ── Pipeline ───────────────────────────────────────────────
 
-def model_comparison() -> pd.DataFrame:
+def model_comparison(budget: int | None = CPU_BUDGET) -> pd.DataFrame:
     """Compare plusieurs classifieurs sur les coordonnees ACM.
 
+    Parameters
+    ----------
+    budget : int, optional
+        CPU utilisables au total (defaut : :func:`utils.cpu_budget`).
+
     Returns
     -------
     pd.DataFrame
@@ -66,31 +220,36 @@ def model_comparison() -> pd.DataFrame:
     df = load_processed_data()
 
     X = coords.iloc[:, :K_AXES].values
-    y = (df["class"] == "e").astype(int)
+    y = (df["class"] == "e").astype(int).to_numpy()
+    folds = load_cv_folds(len(y))
+    n_folds = int(folds.max()) + 1
 
     print_step(f"Donnees : {X.shape} (k={K_AXES} axes ACM)")
     print(f"    Poisonous: {(y == 0).sum():,}  |  Edible: {(y == 1).sum():,}")
 
+    results = run_tasks(MODELS, X, y, folds, budget or cpu_budget())
+
     all_results = []
     cv_scores_dict = {}
 
-    for name, model in MODELS.items():
+    for name in MODELS:
         print()
         print_step(f"{name}")
 
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-
-            # CV 5-fold
-            scores = cross_val_score(model, X, y, cv=CV_FOLDS, scoring="accuracy")
-            cv_scores_dict[name] = scores
-
-            # CV predictions pour metriques detaillees
-            y_pred_cv = cross_val_predict(model, X, y, cv=CV_FOLDS)
-
-            # Train
-            model.fit(X, y)
-            train_acc = model.score(X, y)
+        # CV (scores + predictions hors pli) et ajustement final
+        cv = combine_folds(y, folds, [results[(name, "fold", fold)]["fold"] for fold in range(n_folds)])
+        serve = results[(name, "serve")]
+        refit = results.get((name, "refit"), {})
+        scores = cv.scores
+        cv_scores_dict[name] = scores
+        y_pred_cv = cv.y_pred
+        train_acc = refit.get("train_accuracy")
+        if train_acc is None:
+            train_acc = float(serve["model"].score(X, y))
+
+        # Modele persiste pour le service de prediction
+        model_path = save_classifier(serve["model"], K_AXES, name)
+        model_size_kb = model_path.stat().st_size / 1024
 
         # Metriques
         cv_mean = scores.mean()
@@ -104,7 +263,14 @@ def model_comparison() -> pd.DataFrame:
         print(
             f"    Train={train_acc:.3f}  "
             f"CV={cv_mean:.3f}+/-{cv_std:.3f}  "
-            f"F1(macro)={f1_macro:.3f}"
+            f"F1(macro)={f1_macro:.3f}  "
+            f"Ajustement/pli={cv.fit_time.mean():.2f} s"
+        )
+        print(
+            f"    Ajustement={serve['fit_time_s']:.2f} s  "
+            f"Prediction={serve['predict_ms_per_1k']:.2f} ms/1k  "
+            f"Memoire pic={serve['peak_memory_mb']:.1f} Mo  "
+            f"Taille={model_size_kb:.0f} Ko"
         )
 
         all_results.append({
@@ -118,6 +284,10 @@ def model_comparison() -> pd.DataFrame:
             "recall_edible": round(rec_e, 4),
             "f1_macro": round(f1_macro, 4),
             "overfitting_gap": round(train_acc - cv_mean, 4),
+            "fit_time_s": round(serve["fit_time_s"], 3),
+            "predict_ms_per_1k": round(serve["predict_ms_per_1k"], 3),
+            "peak_memory_mb": round(serve["peak_memory_mb"], 1),
+            "model_size_kb": round(model_size_kb, 1),
         })
 
     results_df = pd.DataFrame(all_results).sort_values("cv_accuracy_mean", ascending=False)
@@ -130,75 +300,78 @@ def model_comparison() -> pd.DataFrame:
         f"({best['cv_accuracy_mean']:.4f} accuracy)"
     )
 
-    # ── Figure 1 : Comparaison globale ──
+    if figures_enabled():
+        import matplotlib.pyplot as plt
 
-    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+        # ── Figure 1 : Comparaison globale ──
 
-    # Panel 1 : Accuracy (train vs CV)
-    model_names = results_df["model"].tolist()
-    x_pos = np.arange(len(model_names))
-    width = 0.35
+        fig, axes = plt.subplots(1, 2, figsize=(16, 6))
 
-    bars1 = axes[0].bar(
-        x_pos - width / 2, results_df["train_accuracy"],
-        width, label="Train", color="#2196F3", alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    bars2 = axes[0].bar(
-        x_pos + width / 2, results_df["cv_accuracy_mean"],
-        width, label="CV 5-fold", color="#F44336", alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    axes[0].errorbar(
-        x_pos + width / 2, results_df["cv_accuracy_mean"],
-        yerr=results_df["cv_accuracy_std"],
-        fmt="none", ecolor="black", capsize=4,
-    )
-    axes[0].set_xticks(x_pos)
-    axes[0].set_xticklabels(model_names, rotation=15, ha="right")
-    axes[0].set_ylabel("Accuracy", fontsize=12)
-    axes[0].set_title("Accuracy — Train vs CV", fontsize=13, fontweight="bold")
-    axes[0].legend()
-    axes[0].grid(axis="y", alpha=0.3)
-    axes[0].set_ylim([0.6, 1.05])
-
-    # Panel 2 : F1 macro + Recall poisonous
-    axes[1].bar(
-        x_pos - width / 2, results_df["f1_macro"],
-        width, label="F1 (macro)", color="#4CAF50", alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    axes[1].bar(
-        x_pos + width / 2, results_df["recall_poisonous"],
-        width, label="Recall venéneux", color="#FF9800", alpha=0.85, edgecolor="black", linewidth=0.5,
-    )
-    axes[1].set_xticks(x_pos)
-    axes[1].set_xticklabels(model_names, rotation=15, ha="right")
-    axes[1].set_ylabel("Score", fontsize=12)
-    axes[1].set_title("F1 macro + Recall venéneux", fontsize=13, fontweight="bold")
-    axes[1].legend()
-    axes[1].grid(axis="y", alpha=0.3)
-    axes[1].set_ylim([0.5, 1.05])
-
-    fig.tight_layout()
-    save_figure(fig, "model_comparison.png")
-
-    # ── Figure 2 : Box plots CV scores ──
-
-    fig, ax = plt.subplots(figsize=(10, 6))
-    box_data = [cv_scores_dict[name] for name in model_names]
-    bp = ax.boxplot(
-        box_data, tick_labels=model_names, patch_artist=True,
-        boxprops=dict(facecolor="#E3F2FD", edgecolor="black"),
-        medianprops=dict(color="#F44336", linewidth=2),
-    )
-    colors_box = ["#2196F3", "#4CAF50", "#FF9800", "#9C27B0"]
-    for patch, color in zip(bp["boxes"], colors_box[:len(bp["boxes"])]):
-        patch.set_facecolor(color)
-        patch.set_alpha(0.3)
+        # Panel 1 : Accuracy (train vs CV)
+        model_names = results_df["model"].tolist()
+        x_pos = np.arange(len(model_names))
+        width = 0.35
+
+        bars1 = axes[0].bar(
+            x_pos - width / 2, results_df["train_accuracy"],
+            width, label="Train", color="#2196F3", alpha=0.85, edgecolor="black", linewidth=0.5,
+        )
+        bars2 = axes[0].bar(
+            x_pos + width / 2, results_df["cv_accuracy_mean"],
+            width, label=f"CV {n_folds}-fold", color="#F44336", alpha=0.85, edgecolor="black", linewidth=0.5,
+        )
+        axes[0].errorbar(
+            x_pos + width / 2, results_df["cv_accuracy_mean"],
+            yerr=results_df["cv_accuracy_std"],
+            fmt="none", ecolor="black", capsize=4,
+        )
+        axes[0].set_xticks(x_pos)
+        axes[0].set_xticklabels(model_names, rotation=15, ha="right")
+        axes[0].set_ylabel("Accuracy", fontsize=12)
+        axes[0].set_title("Accuracy — Train vs CV", fontsize=13, fontweight="bold")
+        axes[0].legend()
+        axes[0].grid(axis="y", alpha=0.3)
+        axes[0].set_ylim([0.6, 1.05])
+
+        # Panel 2 : F1 macro + Recall poisonous
+        axes[1].bar(
+            x_pos - width / 2, results_df["f1_macro"],
+            width, label="F1 (macro)", color="#4CAF50", alpha=0.85, edgecolor="black", linewidth=0.5,
+        )
+        axes[1].bar(
+            x_pos + width / 2, results_df["recall_poisonous"],
+            width, label="Recall venéneux", color="#FF9800", alpha=0.85, edgecolor="black", linewidth=0.5,
+        )
+        axes[1].set_xticks(x_pos)
+        axes[1].set_xticklabels(model_names, rotation=15, ha="right")
+        axes[1].set_ylabel("Score", fontsize=12)
+        axes[1].set_title("F1 macro + Recall venéneux", fontsize=13, fontweight="bold")
+        axes[1].legend()
+        axes[1].grid(axis="y", alpha=0.3)
+        axes[1].set_ylim([0.5, 1.05])
+
+        fig.tight_layout()
+        save_figure(fig, "model_comparison.png")
+
+        # ── Figure 2 : Box plots CV scores ──
+
+        fig, ax = plt.subplots(figsize=(10, 6))
+        box_data = [cv_scores_dict[name] for name in model_names]
+        bp = ax.boxplot(
+            box_data, tick_labels=model_names, patch_artist=True,
+            boxprops=dict(facecolor="#E3F2FD", edgecolor="black"),
+            medianprops=dict(color="#F44336", linewidth=2),
+        )
+        colors_box = ["#2196F3", "#4CAF50", "#FF9800", "#9C27B0"]
+        for patch, color in zip(bp["boxes"], colors_box[:len(bp["boxes"])]):
+            patch.set_facecolor(color)
+            patch.set_alpha(0.3)
 
-    ax.set_ylabel("Accuracy", fontsize=12)
-    ax.set_title("Distribution des scores CV (5-fold)", fontsize=13, fontweight="bold")
-    ax.grid(axis="y", alpha=0.3)
-    fig.tight_layout()
-    save_figure(fig, "model_comparison_boxplot.png")
+        ax.set_ylabel("Accuracy", fontsize=12)
+        ax.set_title(f"Distribution des scores CV ({n_folds}-fold)", fontsize=13, fontweight="bold")
+        ax.grid(axis="y", alpha=0.3)
+        fig.tight_layout()
+        save_figure(fig, "model_comparison_boxplot.png")
 
     # ── Resume ──
 
@@ -207,11 +380,22 @@ def model_comparison() -> pd.DataFrame:
     print()
     print("  Outputs :")
     print("    Tables  — model_comparison.csv")
-    print("    Figures — model_comparison.png, model_comparison_boxplot.png")
+    if figures_enabled():
+        print("    Figures — model_comparison.png, model_comparison_boxplot.png")
     print()
 
     return results_df
 
 
 if __name__ == "__main__":
-    model_comparison()
+    parser = argparse.ArgumentParser(description="Comparaison de modeles de classification.")
+    parser.add_argument("--cpus", type=int, default=CPU_BUDGET,
+                        help="Budget CPU total (defaut : PIPELINE_CPUS s'il est fixe, sinon nombre de CPU)")
+    add_figure_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    set_figure_mode(args.figures)
+    if args.cpus is not None and args.cpus < 1:
+        parser.error("--cpus doit etre strictement positif")
+    with profiled("07_model_comparison", args):
+        model_comparison(args.cpus)
@@ -0,0 +1,215 @@
+"""
+08 — Pré-calculs du dashboard.
+
+Évalue hors ligne toutes les combinaisons des curseurs de la page
+Clustering de ``app.py`` : K-Means et silhouette pour chaque nombre d'axes
+ACM de ``K_VALUES`` et chaque nombre de clusters de ``CLUSTER_VALUES``
+(9 x 7 = 63 combinaisons), avec les mêmes réglages que le calcul à la
+volée du dashboard (``RANDOM_STATE``, moteurs ``auto``). Pour la page
+Classification, la LDA est évaluée sur les plis persistés pour chaque
+nombre d'axes de ``K_VALUES`` (scores par pli, matrice de confusion et
+rapport de classification hors pli), en une passe (``validation.lda_sweep``).
+Pour la page Espace ACM, le nuage de chacun des 45 couples d'axes est
+agrégé en histogrammes 2-D par classe et par modalité de chaque variable,
+à plusieurs niveaux de zoom (``TILE_LEVELS``).
+Les résultats sont écrits dans ``data/processed/dashboard/``, avec
+l'empreinte des données d'entrée (voir ``precomputed.py``).
+
+Les combinaisons sont indépendantes : elles sont réparties sur un pool de
+processus (``--jobs``, par défaut le budget CPU transmis par
+``pipeline.py``, voir ``utils.cpu_budget``), les plus coûteuses en premier.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from clustering import KMEANS_BACKENDS, SILHOUETTE_MODES
+from precomputed import (
+    DASHBOARD_DIR, ClassificationGrid, ClusteringCell, ClusteringGrid, DensityTiles,
+    class_codes, compute_cell, compute_classification, inputs_digest,
+)
+from profiling import add_profile_arguments, profiled
+from utils import (
+    cpu_budget, get_project_root, load_cv_folds, load_mca_coordinates, load_processed_data,
+    print_section, print_step,
+)
+
+
+# ── Configuration ──────────────────────────────────────────
+
+K_VALUES = [2, 3, 4, 5, 6, 7, 8, 9, 10]         # curseurs « Nombre d'axes ACM »
+CLUSTER_VALUES = [2, 3, 4, 5, 6, 7, 8]          # curseur « Nombre de clusters »
+RANDOM_STATE = 42
+KMEANS_BACKEND = "auto"
+SILHOUETTE_MODE = "auto"
+TILE_LEVELS = (128, 256, 512)                   # cases par axe, du plus grossier au plus fin
+
+
+# ── Combinaisons ───────────────────────────────────────────
+
+_WORKER: dict = {}
+
+
+def _init_worker(classes: np.ndarray, threads: int | None = None) -> None:
+    """Charge les coordonnées une fois par processus (projetées en mémoire)."""
+    if threads:
+        from threadpoolctl import threadpool_limits
+        _WORKER["limits"] = threadpool_limits(threads)
+    _WORKER["threads"] = threads
+    _WORKER["X"] = load_mca_coordinates(mmap=True).to_numpy()
+    _WORKER["classes"] = classes
+
+
+def run_cell(k_axes: int, n_clusters: int, backend: str, silhouette_mode: str) -> tuple[ClusteringCell, float]:
+    """Calcule une combinaison ; retourne le résultat et sa durée (s)."""
+    start = time.perf_counter()
+    cell = compute_cell(
+        _WORKER["X"], _WORKER["classes"], k_axes, n_clusters,
+        backend=backend, silhouette_mode=silhouette_mode, random_state=RANDOM_STATE,
+        n_jobs=_WORKER["threads"],
+    )
+    return cell, time.perf_counter() - start
+
+
+def precompute_clustering(
+    classes: np.ndarray,
+    k_values: list[int] = K_VALUES,
+    cluster_values: list[int] = CLUSTER_VALUES,
+    backend: str = KMEANS_BACKEND,
+    silhouette_mode: str = SILHOUETTE_MODE,
+    jobs: int = 1,
+    inputs: str = "",
+) -> ClusteringGrid:
+    """Calcule toutes les combinaisons (axes, clusters) de la page Clustering.
+
+    Parameters
+    ----------
+    classes : np.ndarray
+        Code de classe de chaque individu (``precomputed.class_codes``).
+    k_values, cluster_values : list of int
+        Nombres d'axes ACM et de clusters.
+    backend : str
+        Moteur K-Means.
+    silhouette_mode : str
+        Mode de silhouette.
+    jobs : int
+        Processus simultanés.
+    inputs : str
+        Empreinte des données d'entrée, enregistrée avec la grille.
+
+    Returns
+    -------
+    ClusteringGrid
+    """
+    # Combinaisons les plus coûteuses (axes et clusters nombreux) en premier
+    tasks = sorted(((k, c) for k in k_values for c in cluster_values), key=lambda t: -t[0] * t[1])
+    cells = []
+    width = len(str(len(tasks)))
+
+    def record(cell: ClusteringCell, elapsed: float) -> None:
+        cells.append(cell)
+        print(f"    [{len(cells):>{width}}/{len(tasks)}] k={cell.k_axes:2d}, {cell.n_clusters} clusters  "
+              f"Silhouette={cell.silhouette:.3f} ({cell.silhouette_mode}, {elapsed:.2f} s)", flush=True)
+
+    if jobs <= 1:
+        _init_worker(classes)
+        for k, c in tasks:
+            record(*run_cell(k, c, backend, silhouette_mode))
+    else:
+        threads = max(1, cpu_budget() // jobs)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(classes, threads)) as pool:
+            futures = [pool.submit(run_cell, k, c, backend, silhouette_mode) for k, c in tasks]
+            try:
+                for future in as_completed(futures):
+                    record(*future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    return ClusteringGrid.from_cells(cells, len(classes), inputs)
+
+
+# ── Pipeline ───────────────────────────────────────────────
+
+def precompute_dashboard(
+    backend: str = KMEANS_BACKEND,
+    silhouette_mode: str = SILHOUETTE_MODE,
+    jobs: int = 1,
+) -> None:
+    """Pré-calcule les résultats affichés par le dashboard."""
+
+    print_section("08 — Pré-calculs du dashboard")
+
+    root = get_project_root()
+    # Empreinte avant lecture : une donnée réécrite pendant le calcul rend la grille périmée
+    inputs = inputs_digest(root)
+    df = load_processed_data()
+    target = df["class"]
+    classes = class_codes(target)
+    out_dir = root / DASHBOARD_DIR
+
+    # ── Grille de clustering ──
+
+    n_cells = len(K_VALUES) * len(CLUSTER_VALUES)
+    print_step(f"Clustering : {n_cells} combinaisons ({len(K_VALUES)} axes x {len(CLUSTER_VALUES)} clusters, "
+               f"{jobs} processus)")
+    start = time.perf_counter()
+    grid = precompute_clustering(classes, K_VALUES, CLUSTER_VALUES, backend, silhouette_mode, jobs, inputs)
+    path = grid.save(out_dir)
+    size = sum((out_dir / name).stat().st_size for name in ClusteringGrid.FILES)
+    print_step(f"Grille de clustering : {time.perf_counter() - start:.2f} s, {size / 1024:,.0f} Ko -> "
+               f"{path.relative_to(root)}")
+
+    # ── Grille de classification ──
+
+    start = time.perf_counter()
+    y = (target == "e").astype(int).to_numpy()
+    folds = load_cv_folds(len(y))
+    cells = compute_classification(load_mca_coordinates(mmap=True).to_numpy(), y, folds, K_VALUES)
+    path = ClassificationGrid(cells, len(y), inputs).save(out_dir)
+    for cell in cells:
+        print(f"    k={cell.k_axes:2d}  Accuracy CV={cell.fold_scores.mean():.4f} "
+              f"(± {cell.fold_scores.std():.4f})  train={cell.train_accuracy:.4f}")
+    print_step(f"Grille de classification : {time.perf_counter() - start:.2f} s -> {path.relative_to(root)}")
+
+    # ── Tuiles de densité ──
+
+    start = time.perf_counter()
+    tiles = DensityTiles.build(load_mca_coordinates(mmap=True).to_numpy(), df, levels=TILE_LEVELS, inputs=inputs)
+    path = tiles.save(out_dir)
+    kept = np.bincount(list(tiles.n_levels.values()), minlength=len(TILE_LEVELS) + 1)[1:]
+    print(f"    {len(tiles.n_levels)} couples d'axes, {len(tiles.variables)} variables ; niveaux conservés : "
+          + ", ".join(f"{n} couple(s) jusqu'à {b} cases" for b, n in zip(TILE_LEVELS, kept) if n))
+    print_step(f"Tuiles de densité : {time.perf_counter() - start:.2f} s, {path.stat().st_size / 1024:,.0f} Ko -> "
+               f"{path.relative_to(root)}")
+
+    # ── Résumé ──
+
+    print()
+    print_step("Pré-calculs terminés.")
+    print()
+    print("  Outputs :")
+    print(f"    Dashboard — {DASHBOARD_DIR.as_posix()}/clustering_grid.npz, clustering_labels.npy, "
+          "classification_grid.npz, density_tiles.npz")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-calculs du dashboard.")
+    parser.add_argument("--backend", choices=KMEANS_BACKENDS, default=KMEANS_BACKEND,
+                        help=f"Moteur K-Means (défaut : {KMEANS_BACKEND})")
+    parser.add_argument("--silhouette", choices=SILHOUETTE_MODES, default=SILHOUETTE_MODE,
+                        help=f"Mode de silhouette (défaut : {SILHOUETTE_MODE})")
+    parser.add_argument("-j", "--jobs", type=int, default=cpu_budget(),
+                        help="Processus simultanés (défaut : budget CPU, PIPELINE_CPUS s'il est fixé, sinon nombre de CPU)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs doit être strictement positif")
+    with profiled("08_dashboard", args):
+        precompute_dashboard(args.backend, args.silhouette, args.jobs)
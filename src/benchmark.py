@@ -0,0 +1,498 @@
+"""
+Banc d'essai des étapes du pipeline — The Mushroom Project.
+
+Mesure chaque point d'entrée d'étape (``prepare_data``, ``describe_data``,
+``perform_mca``, ``perform_clustering``, ``perform_discriminant_analysis``,
+``sensitivity_analysis``, ``model_comparison``) sur 1, 10 et 100 fois les
+8 124 lignes du jeu UCI (``SCALES`` ou ``--scales``). Au-delà de 1x, les
+lignes sont des spécimens synthétiques (``synthetic.py`` ; ``DATA_SOURCE``
+ou ``--source replicate`` pour répéter le fichier UCI à l'identique).
+Chaque échelle est exécutée dans un espace de travail temporaire (copie de
+``src/`` et fichier brut mis à l'échelle) : les sorties du projet ne sont
+pas touchées. Chaque étape tourne dans son propre processus, avec sa
+configuration par défaut, et consigne :
+
+  - ``wall_s``      : durée du point d'entrée (hors démarrage de l'interpréteur) ;
+  - ``cpu_s``       : temps CPU (utilisateur + système) du processus et de
+    ses sous-processus (pools des étapes 06 et 07) ;
+  - ``peak_rss_mb`` : pic de mémoire résidente (processus ou sous-processus).
+
+Chaque exécution est ajoutée à ``reports/benchmarks/history.jsonl`` (une
+exécution JSON par ligne, avec commit et machine). Une exécution peut être
+promue en référence (``baseline``) ; ``compare`` signale les étapes dont
+une mesure dépasse la référence de plus de ``REGRESSION_THRESHOLD`` (et
+sort avec le code 1, pour l'intégration continue).
+
+``startup`` mesure le démarrage du dashboard (``app.py``) sur les sorties
+du projet : dans un processus neuf où Streamlit est déjà importé (comme un
+serveur qui reçoit sa première session), durée de la première page, puis
+de la première visite de chaque autre page. Médiane de
+``STARTUP_REPEATS`` processus ; au-delà de ``STARTUP_BUDGET_S`` pour la
+première page, la commande sort avec le code 1.
+
+Usage :
+    python src/benchmark.py run                         # 1x, 10x, 100x, toutes les étapes
+    python src/benchmark.py run --scales 1 10 --stages 03_mca 04_cluster
+    python src/benchmark.py baseline                    # dernière exécution -> référence
+    python src/benchmark.py compare --threshold 0.1     # dernière exécution vs référence
+    python src/benchmark.py startup                     # démarrage du dashboard vs budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils import get_project_root, print_section, print_step
+
+
+# ── Configuration ──────────────────────────────────────────
+
+BASE_ROWS = 8_124
+SCALES = (1, 10, 100)
+DATA_SOURCES = ("synthetic", "replicate")
+DATA_SOURCE = "synthetic"
+SYNTHETIC_SEED = 0
+STAGES = {
+    "01_prepare": "prepare_data",
+    "02_describe": "describe_data",
+    "03_mca": "perform_mca",
+    "04_cluster": "perform_clustering",
+    "05_discriminant": "perform_discriminant_analysis",
+    "06_sensitivity": "sensitivity_analysis",
+    "07_model_comparison": "model_comparison",
+}
+METRICS = ("wall_s", "cpu_s", "peak_rss_mb")
+STAGE_TIMEOUT = 3600.0         # s par étape ; au-delà, l'étape et les suivantes sont abandonnées
+REGRESSION_THRESHOLD = 0.20    # hausse relative tolérée
+MIN_DELTA = {"wall_s": 0.1, "cpu_s": 0.1, "peak_rss_mb": 5.0}  # hausses absolues ignorées (bruit)
+
+BENCH_DIR = "reports/benchmarks"
+HISTORY_FILE = f"{BENCH_DIR}/history.jsonl"
+BASELINE_FILE = f"{BENCH_DIR}/baseline.json"
+RAW_FILE = "data/raw/agaricus-lepiota.data"
+
+DASHBOARD_APP = "app.py"
+DASHBOARD_PAGES = ("Vue d'ensemble", "Espace ACM", "Clustering", "Classification", "Sensibilité")
+STARTUP_BUDGET_S = 0.75        # première page d'un processus neuf (s)
+STARTUP_REPEATS = 5
+STARTUP_TIMEOUT = 120.0        # s par processus
+
+# Exécuté dans le processus de l'étape : point d'entrée puis mesures en JSON
+_RUNNER = """
+import importlib.util, json, resource, sys, time
+script, entry, output = sys.argv[1:4]
+sys.path.insert(0, str(__import__("pathlib").Path(script).parent))
+spec = importlib.util.spec_from_file_location("stage", script)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+start, cpu = time.perf_counter(), resource.getrusage(resource.RUSAGE_SELF)
+getattr(module, entry)()
+wall = time.perf_counter() - start
+usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+json.dump({
+    "wall_s": wall,
+    "cpu_s": sum(u.ru_utime + u.ru_stime for u in usage) - cpu.ru_utime - cpu.ru_stime,
+    "peak_rss_mb": max(u.ru_maxrss for u in usage) / 1024,
+}, open(output, "w"))
+"""
+
+# Démarrage du dashboard : Streamlit chargé hors mesure (import et premier script vide, comme
+# un serveur démarré), puis première page de l'application et première visite des autres
+_STARTUP_RUNNER = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app, output, pages = sys.argv[1], sys.argv[2], sys.argv[3:]
+AppTest.from_string("import streamlit as st").run()
+at = AppTest.from_file(app, default_timeout=60)
+start = time.perf_counter()
+at.run()
+result = {pages[0]: time.perf_counter() - start}
+errors = [e.message for e in at.exception]
+for page in pages[1:]:
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    result[page] = time.perf_counter() - start
+    errors += [f"{page} : {e.message}" for e in at.exception]
+json.dump({"pages": result, "errors": errors}, open(output, "w"))
+"""
+
+
+# ── Espace de travail ──────────────────────────────────────
+
+def make_workspace(root: Path, scale: int, source: str = DATA_SOURCE) -> Path:
+    """Prépare un espace de travail : copie de ``src/`` et fichier brut de ``scale`` x 8 124 lignes.
+
+    À 1x, le fichier UCI ; au-delà, des spécimens synthétiques
+    (``source="synthetic"``) ou le fichier UCI répété (``"replicate"``).
+
+    Returns
+    -------
+    Path
+        Racine de l'espace de travail (``root / f"x{scale}"``).
+
+    Raises
+    ------
+    FileNotFoundError
+        Si le fichier brut est absent (``python src/00_download.py``).
+    """
+    raw = get_project_root() / RAW_FILE
+    if not raw.exists():
+        raise FileNotFoundError(f"{raw} introuvable. Exécuter d'abord : python src/00_download.py")
+
+    workspace = root / f"x{scale}"
+    shutil.copytree(get_project_root() / "src", workspace / "src",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    target = workspace / RAW_FILE
+    target.parent.mkdir(parents=True)
+    if scale > 1 and source == "synthetic":
+        from synthetic import fit_specimen_model, write_raw
+
+        with open(target, "wb") as f:
+            write_raw(fit_specimen_model(), BASE_ROWS * scale, f, seed=SYNTHETIC_SEED)
+        return workspace
+    block = raw.read_bytes()
+    if not block.endswith(b"\n"):
+        block += b"\n"
+    with open(target, "wb") as f:
+        for _ in range(scale):
+            f.write(block)
+    return workspace
+
+
+def run_stage(workspace: Path, stage: str, timeout: float = STAGE_TIMEOUT) -> dict:
+    """Exécute le point d'entrée d'une étape dans un processus dédié et le mesure.
+
+    Returns
+    -------
+    dict
+        ``status`` (``ok``, ``failed`` ou ``timeout``) et, si ``ok``, les
+        mesures de ``METRICS``. La sortie de l'étape est écrite dans
+        ``<workspace>/logs/<étape>.log``.
+    """
+    logs = workspace / "logs"
+    logs.mkdir(exist_ok=True)
+    output = logs / f"{stage}.json"
+    env = dict(os.environ, MPLBACKEND="Agg")
+    with open(logs / f"{stage}.log", "wb") as log:
+        proc = subprocess.Popen(
+            [sys.executable, "-c", _RUNNER, str(workspace / "src" / f"{stage}.py"), STAGES[stage], str(output)],
+            cwd=workspace, env=env, stdout=log, stderr=subprocess.STDOUT, start_new_session=True,
+        )
+        try:
+            returncode = proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            return {"status": "timeout"}
+    if returncode != 0 or not output.exists():
+        return {"status": "failed", "returncode": returncode}
+    return {"status": "ok", **json.loads(output.read_text())}
+
+
+# ── Historique ─────────────────────────────────────────────
+
+def _git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=get_project_root(),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=get_project_root(),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def load_history() -> list[dict]:
+    """Exécutions enregistrées, de la plus ancienne à la plus récente."""
+    path = get_project_root() / HISTORY_FILE
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_run(run_id: Optional[str] = None) -> dict:
+    """Exécution ``run_id`` de l'historique (la dernière par défaut).
+
+    Raises
+    ------
+    LookupError
+        Si l'historique est vide ou ne contient pas ``run_id``.
+    """
+    history = load_history()
+    if not history:
+        raise LookupError(f"Historique vide ({HISTORY_FILE}). Exécuter d'abord : python src/benchmark.py run")
+    if run_id is None:
+        return history[-1]
+    for run in history:
+        if run["run"] == run_id:
+            return run
+    raise LookupError(f"Exécution inconnue : {run_id}")
+
+
+def results_table(run: dict) -> pd.DataFrame:
+    """Mesures d'une exécution (une ligne par étape et échelle)."""
+    return pd.DataFrame(run["results"], columns=["stage", "scale", "rows", "status", *METRICS])
+
+
+# ── Commandes ──────────────────────────────────────────────
+
+def run_benchmark(
+    scales: tuple[int, ...] = SCALES,
+    stages: Optional[list[str]] = None,
+    timeout: float = STAGE_TIMEOUT,
+    label: Optional[str] = None,
+    workdir: Optional[Path] = None,
+    source: str = DATA_SOURCE,
+) -> dict:
+    """Mesure les étapes ``stages`` à chaque échelle et ajoute l'exécution à l'historique.
+
+    Les étapes s'exécutent dans l'ordre du pipeline ; une étape en échec
+    ou hors délai fait abandonner les suivantes pour cette échelle (leurs
+    entrées manquent). Les étapes non demandées mais nécessaires aux
+    suivantes sont exécutées sans être consignées.
+
+    Parameters
+    ----------
+    scales : tuple of int
+        Facteurs de répétition du jeu UCI.
+    stages : list of str, optional
+        Étapes à consigner (défaut : toutes).
+    timeout : float
+        Durée maximale d'une étape (s).
+    label : str, optional
+        Libellé libre de l'exécution.
+    workdir : Path, optional
+        Répertoire des espaces de travail, conservé (défaut : temporaire,
+        supprimé à la fin).
+    source : str
+        Lignes au-delà de 1x : ``"synthetic"`` ou ``"replicate"``.
+
+    Returns
+    -------
+    dict
+        Exécution enregistrée.
+    """
+    names = list(STAGES)
+    stages = stages or names
+    last = max(names.index(stage) for stage in stages)
+
+    print_section(f"Banc d'essai — {len(stages)} étape(s) x {len(scales)} échelle(s)")
+    run = {
+        "run": time.strftime("%Y%m%d-%H%M%S"),
+        "label": label,
+        "source": source,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "results": [],
+    }
+    root = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="mushroom-bench-"))
+    try:
+        for scale in scales:
+            print()
+            print_step(f"Échelle x{scale} ({BASE_ROWS * scale:,} lignes)")
+            workspace = make_workspace(root, scale, source)
+            aborted = None
+            for stage in names[:last + 1]:
+                recorded = stage in stages
+                if aborted:
+                    result = {"status": "skipped"}
+                else:
+                    result = run_stage(workspace, stage, timeout)
+                    if result["status"] != "ok":
+                        aborted = stage
+                if not recorded:
+                    continue
+                run["results"].append({"stage": stage, "scale": scale, "rows": BASE_ROWS * scale, **result})
+                if result["status"] == "ok":
+                    print(f"    {stage:<22} {result['wall_s']:>9.2f} s  CPU {result['cpu_s']:>9.2f} s  "
+                          f"RSS {result['peak_rss_mb']:>8.0f} Mo", flush=True)
+                else:
+                    print(f"    {stage:<22} {result['status']}", flush=True)
+            if aborted:
+                print_step(f"{aborted} : voir {workspace / 'logs' / (aborted + '.log')}")
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    path = get_project_root() / HISTORY_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    print()
+    print_step(f"Exécution {run['run']} ajoutée à {HISTORY_FILE}")
+    return run
+
+
+def measure_startup(repeats: int = STARTUP_REPEATS, budget: float = STARTUP_BUDGET_S) -> dict:
+    """Mesure le démarrage du dashboard, dans ``repeats`` processus neufs.
+
+    Parameters
+    ----------
+    repeats : int
+        Processus mesurés (médiane des durées).
+    budget : float
+        Durée maximale de la première page (s).
+
+    Returns
+    -------
+    dict
+        ``pages`` (durée médiane par page, la première page en tête),
+        ``errors`` (exceptions levées par les pages) et ``within_budget``.
+    """
+    print_section(f"Démarrage du dashboard — {repeats} processus")
+    root = get_project_root()
+    env = dict(os.environ, MPLBACKEND="Agg")
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="mushroom-startup-") as tmp:
+        for i in range(repeats):
+            output = Path(tmp) / f"{i}.json"
+            subprocess.run(
+                [sys.executable, "-c", _STARTUP_RUNNER, str(root / DASHBOARD_APP), str(output), *DASHBOARD_PAGES],
+                cwd=root, env=env, capture_output=True, timeout=STARTUP_TIMEOUT, check=True,
+            )
+            runs.append(json.loads(output.read_text(encoding="utf-8")))
+    pages = {page: float(np.median([run["pages"][page] for run in runs])) for page in DASHBOARD_PAGES}
+    errors = sorted({error for run in runs for error in run["errors"]})
+
+    first = DASHBOARD_PAGES[0]
+    print(f"    {'Première page (' + first + ')':<36} {pages[first]:>7.3f} s  (budget {budget:.2f} s)")
+    for page in DASHBOARD_PAGES[1:]:
+        print(f"    {'Première visite : ' + page:<36} {pages[page]:>7.3f} s")
+    for error in errors:
+        print(f"  [erreur] {error}")
+    within = pages[first] <= budget and not errors
+    print()
+    print_step("Dans le budget." if within else "Hors budget ou en erreur.")
+    return {"pages": pages, "errors": errors, "within_budget": within}
+
+
+def save_baseline(run_id: Optional[str] = None) -> dict:
+    """Promeut une exécution de l'historique (la dernière par défaut) en référence."""
+    run = find_run(run_id)
+    path = get_project_root() / BASELINE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(run, indent=2), encoding="utf-8")
+    print_step(f"Référence : exécution {run['run']} ({run.get('commit') or 'commit inconnu'}) -> {BASELINE_FILE}")
+    return run
+
+
+def compare_runs(current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD) -> pd.DataFrame:
+    """Compare deux exécutions, étape par étape et échelle par échelle.
+
+    Une mesure régresse si elle dépasse la référence de plus de
+    ``threshold`` (relatif) et de plus de ``MIN_DELTA`` (absolu) ; une
+    étape qui réussissait et ne réussit plus régresse aussi.
+
+    Returns
+    -------
+    pd.DataFrame
+        Une ligne par (étape, échelle, mesure) communes : référence,
+        valeur courante, rapport et ``regression``.
+    """
+    base = results_table(baseline).set_index(["stage", "scale"])
+    cur = results_table(current).set_index(["stage", "scale"])
+    rows = []
+    for key in cur.index.intersection(base.index):
+        b, c = base.loc[key], cur.loc[key]
+        if b["status"] == "ok" and c["status"] != "ok":
+            rows.append({"stage": key[0], "scale": key[1], "metric": "status",
+                         "baseline": b["status"], "current": c["status"], "ratio": None, "regression": True})
+            continue
+        if b["status"] != "ok" or c["status"] != "ok":
+            continue
+        for metric in METRICS:
+            ratio = c[metric] / b[metric] if b[metric] > 0 else float("inf")
+            regression = ratio > 1 + threshold and c[metric] - b[metric] > MIN_DELTA[metric]
+            rows.append({"stage": key[0], "scale": key[1], "metric": metric, "baseline": round(b[metric], 3),
+                         "current": round(c[metric], 3), "ratio": round(ratio, 3), "regression": regression})
+    return pd.DataFrame(rows, columns=["stage", "scale", "metric", "baseline", "current", "ratio", "regression"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc d'essai des étapes du pipeline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Mesurer les étapes et enrichir l'historique")
+    p_run.add_argument("--scales", type=int, nargs="+", default=list(SCALES), metavar="N",
+                       help="Facteurs de taille du jeu (défaut : %(default)s)")
+    p_run.add_argument("--stages", nargs="+", choices=list(STAGES), default=None, metavar="STAGE",
+                       help="Étapes à mesurer (défaut : toutes)")
+    p_run.add_argument("--timeout", type=float, default=STAGE_TIMEOUT, help="Durée maximale d'une étape (s)")
+    p_run.add_argument("--source", choices=DATA_SOURCES, default=DATA_SOURCE,
+                       help=f"Lignes au-delà de 1x (défaut : {DATA_SOURCE})")
+    p_run.add_argument("--label", default=None, help="Libellé de l'exécution")
+    p_run.add_argument("--workdir", type=Path, default=None,
+                       help="Répertoire des espaces de travail, conservé (défaut : temporaire)")
+
+    p_base = sub.add_parser("baseline", help="Promouvoir une exécution en référence")
+    p_base.add_argument("run", nargs="?", default=None, help="Identifiant (défaut : dernière exécution)")
+
+    p_cmp = sub.add_parser("compare", help="Comparer une exécution à la référence")
+    p_cmp.add_argument("run", nargs="?", default=None, help="Identifiant (défaut : dernière exécution)")
+    p_cmp.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                       help="Hausse relative tolérée (défaut : %(default)s)")
+
+    p_start = sub.add_parser("startup", help="Mesurer le démarrage du dashboard (budget de la première page)")
+    p_start.add_argument("--repeats", type=int, default=STARTUP_REPEATS,
+                         help="Processus mesurés (défaut : %(default)s)")
+    p_start.add_argument("--budget", type=float, default=STARTUP_BUDGET_S,
+                         help="Durée maximale de la première page, en s (défaut : %(default)s)")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "run":
+            if any(scale < 1 for scale in args.scales):
+                parser.error("--scales : facteurs strictement positifs")
+            run_benchmark(tuple(args.scales), args.stages, args.timeout, args.label, args.workdir, args.source)
+        elif args.command == "baseline":
+            save_baseline(args.run)
+        elif args.command == "startup":
+            if args.repeats < 1:
+                parser.error("--repeats doit être strictement positif")
+            if not measure_startup(args.repeats, args.budget)["within_budget"]:
+                raise SystemExit(1)
+        else:
+            baseline_path = get_project_root() / BASELINE_FILE
+            if not baseline_path.exists():
+                raise LookupError(f"Aucune référence ({BASELINE_FILE}). Exécuter : python src/benchmark.py baseline")
+            baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+            current = find_run(args.run)
+            print_section(f"Comparaison — {current['run']} vs référence {baseline['run']}")
+            table = compare_runs(current, baseline, args.threshold)
+            if table.empty:
+                print_step("Aucune mesure commune à comparer.")
+            else:
+                print(table.to_string(index=False))
+            regressions = table[table["regression"]]
+            print()
+            if regressions.empty:
+                print_step(f"Aucune régression au-delà de {args.threshold:.0%}.")
+            else:
+                print_step(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%} :")
+                for row in regressions.itertuples():
+                    print(f"    {row.stage} x{row.scale} {row.metric} : {row.baseline} -> {row.current}")
+                raise SystemExit(1)
+    except (LookupError, FileNotFoundError) as exc:
+        print(f"  [erreur] {exc}", file=sys.stderr)
+        raise SystemExit(2)
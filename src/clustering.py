@@ -0,0 +1,917 @@
+"""
+Outils de clustering partagés — The Mushroom Project.
+
+Profilage d'une partition sur les modalités : la matrice des effectifs
+cluster x modalité est calculée en un seul ``np.bincount`` sur la clé
+``cluster * J + modalité`` (J modalités au total), quel que soit le nombre
+de clusters ; les statistiques (fréquences, sur-représentation,
+valeurs-test) en sont déduites par opérations matricielles.
+
+CAH de Ward sur la population complète : chaîne des plus proches voisins
+pondérée sur les points distincts (CAH exacte : matrice des critères mise
+à jour par Lance-Williams tant qu'elle tient dans ``WARD_DENSE_MAX_BYTES``,
+sinon recalcul sans matrice, mémoire O(n d)) ou, au-delà de
+``EXACT_MAX_LEAVES`` points, sur des micro-clusters K-Means ; coupe
+suggérée par le critère des gains d'inertie, puis consolidation K-Means.
+
+K-Means configurable (:func:`fit_kmeans`) : moteur exact (``KMeans``),
+mini-batch en mémoire, ou flux (``partial_fit`` bloc par bloc, p. ex. sur
+``mca_coords.npy`` projeté en mémoire) ; les initialisations sont lancées
+en parallèle et :func:`compare_partitions` mesure l'écart au moteur exact.
+
+Silhouette (:func:`silhouette`) : exacte (O(n²)), échantillonnée par
+strates (clusters) avec intervalle de confiance, ou simplifiée sur les
+centroïdes (O(n K), par blocs) ; le mode est choisi selon la taille.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from utils import cpu_budget
+
+
+# ── Configuration ──────────────────────────────────────────
+
+CHUNK_ROWS = 1 << 18           # lignes par bloc (mémoire de la clé bornée)
+EXACT_MAX_LEAVES = 10_000      # au-delà : CAH sur micro-clusters
+WARD_DENSE_MAX_BYTES = 512 << 20  # matrice m x m de la CAH rapide (~8 000 feuilles)
+WARD_BLOCK_ROWS = 256
+N_MICRO_CLUSTERS = 1_000
+KMEANS_BACKENDS = ("auto", "exact", "minibatch", "streaming")
+AUTO_EXACT_MAX_ROWS = 200_000  # moteur "auto" : exact jusqu'à ce seuil, puis flux
+MINIBATCH_SIZE = 4096
+STREAMING_EPOCHS = 3
+STREAMING_MIN_STEPS = 300      # mises à jour mini-batch au minimum (petits jeux)
+LLOYD_PASSES = 2               # passes de Lloyd par blocs après les moteurs approchés
+SILHOUETTE_MODES = ("auto", "exact", "sampled", "simplified")
+SILHOUETTE_EXACT_MAX_ROWS = 20_000
+SILHOUETTE_SAMPLED_MAX_ROWS = 5_000_000
+SILHOUETTE_SAMPLE = 10_000     # individus évalués (mode échantillonné)
+SILHOUETTE_REFERENCE = 2_000   # individus de référence par cluster
+SILHOUETTE_GROUPS = 10         # groupes aléatoires (intervalle de confiance)
+
+
+# ── Profilage ──────────────────────────────────────────────
+
+def modality_counts(
+    codes: np.ndarray, labels: np.ndarray, n_clusters: int, n_levels: np.ndarray,
+) -> np.ndarray:
+    """Effectifs cluster x modalité, valeurs manquantes exclues.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Codes entiers (n x Q), -1 pour une valeur manquante.
+    labels : np.ndarray
+        Cluster de chaque individu (n,), dans ``[0, n_clusters)``.
+    n_clusters : int
+        Nombre de clusters.
+    n_levels : np.ndarray
+        Nombre de modalités de chaque variable (Q,).
+
+    Returns
+    -------
+    np.ndarray
+        Effectifs ``int64`` (n_clusters x J), modalités dans l'ordre des
+        variables puis des codes.
+    """
+    n_levels = np.asarray(n_levels)
+    offsets = np.concatenate(([0], np.cumsum(n_levels)[:-1]))
+    n_cols = int(n_levels.sum())
+    counts = np.zeros(n_clusters * n_cols, dtype=np.int64)
+    for start in range(0, len(codes), CHUNK_ROWS):
+        block = codes[start:start + CHUNK_ROWS]
+        keys = block.astype(np.int64) + offsets
+        keys += labels[start:start + CHUNK_ROWS, None].astype(np.int64) * n_cols
+        counts += np.bincount(keys[block >= 0], minlength=n_clusters * n_cols)
+    return counts.reshape(n_clusters, n_cols)
+
+
+def modality_statistics(
+    counts: np.ndarray, n_levels: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Fréquences, sur-représentation et valeurs-test de chaque modalité.
+
+    Pour une variable, un cluster de n_k individus (valeurs non manquantes)
+    parmi N, et une modalité d'effectif global n_j, l'effectif attendu sous
+    tirage aléatoire sans remise est n_k n_j / N, de variance
+    hypergéométrique n_k (N - n_k) / (N - 1) x (n_j / N)(1 - n_j / N). La
+    valeur-test (Lebart) est l'écart centré réduit, de p-value bilatérale
+    calculée par approximation normale.
+
+    Parameters
+    ----------
+    counts : np.ndarray
+        Sortie de :func:`modality_counts` (K x J).
+    n_levels : np.ndarray
+        Nombre de modalités de chaque variable (Q,).
+
+    Returns
+    -------
+    dict
+        Matrices K x J : ``cluster_freq``, ``global_freq`` (répétée par
+        cluster), ``over_representation``, ``test_value``, ``p_value``
+        (NaN lorsque le cluster n'a aucune valeur pour la variable).
+    """
+    variable = np.repeat(np.arange(len(n_levels)), n_levels)
+    global_counts = counts.sum(axis=0).astype(np.float64)
+    # Effectifs non manquants par variable : cluster (K x Q) et global (Q,)
+    cluster_totals = np.add.reduceat(counts, np.r_[0, np.cumsum(n_levels)[:-1]], axis=1)
+    n_k = cluster_totals[:, variable].astype(np.float64)
+    n_total = cluster_totals.sum(axis=0)[variable][None, :].astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cluster_freq = counts / n_k
+        global_freq = global_counts[None, :] / n_total
+        over = cluster_freq / global_freq
+        expected = n_k * global_freq
+        variance = n_k * (n_total - n_k) / (n_total - 1) * global_freq * (1 - global_freq)
+        test_value = np.where(variance > 0, (counts - expected) / np.sqrt(variance), 0.0)
+    test_value[n_k == 0] = np.nan
+    return {
+        "cluster_freq": cluster_freq,
+        "global_freq": np.broadcast_to(global_freq, counts.shape),
+        "over_representation": over,
+        "test_value": test_value,
+        "p_value": 2 * ndtr(-np.abs(test_value)),
+    }
+
+
+def profile_table(
+    codes: np.ndarray, labels: np.ndarray, n_clusters: int, modalities: dict[str, list[str]],
+) -> pd.DataFrame:
+    """Table longue cluster x modalité (modalités observées uniquement).
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Codes entiers (n x Q) des variables de ``modalities``.
+    labels : np.ndarray
+        Cluster de chaque individu.
+    n_clusters : int
+        Nombre de clusters.
+    modalities : dict
+        Modalités de chaque variable, dans l'ordre des colonnes de ``codes``.
+
+    Returns
+    -------
+    pd.DataFrame
+        Colonnes ``cluster``, ``variable``, ``modality``, ``cluster_count``,
+        ``cluster_freq_%``, ``global_freq_%``, ``over_representation``,
+        ``test_value``, ``p_value`` ; une ligne par cluster et modalité,
+        dans l'ordre cluster, variable, code.
+    """
+    n_levels = np.array([len(mods) for mods in modalities.values()])
+    counts = modality_counts(codes, labels, n_clusters, n_levels)
+    stats = modality_statistics(counts, n_levels)
+
+    variables = np.repeat(list(modalities), n_levels)
+    mods = np.concatenate([np.asarray(m, dtype=object) for m in modalities.values()])
+    observed = np.flatnonzero(counts.sum(axis=0) > 0)
+    cluster_ids = np.repeat(np.arange(n_clusters), len(observed))
+    cols = np.tile(observed, n_clusters)
+    return pd.DataFrame({
+        "cluster": cluster_ids,
+        "variable": variables[cols],
+        "modality": mods[cols],
+        "cluster_count": counts[cluster_ids, cols],
+        "cluster_freq_%": stats["cluster_freq"][cluster_ids, cols] * 100,
+        "global_freq_%": stats["global_freq"][cluster_ids, cols] * 100,
+        "over_representation": stats["over_representation"][cluster_ids, cols],
+        "test_value": stats["test_value"][cluster_ids, cols],
+        "p_value": stats["p_value"][cluster_ids, cols],
+    })
+
+
+# ── CAH (Ward) sur population complète ─────────────────────
+
+@dataclass
+class WardHierarchy:
+    """Résultat de :func:`ward_hierarchy`.
+
+    Attributes
+    ----------
+    linkage : np.ndarray
+        Matrice de liaison au format ``scipy.cluster.hierarchy`` ; les
+        feuilles sont les groupes élémentaires (points distincts ou
+        micro-clusters), la 4e colonne compte les feuilles.
+    leaf_labels : np.ndarray
+        Feuille de chaque individu (n,).
+    n_suggested : int
+        Nombre de clusters suggéré.
+    cut_height : float
+        Hauteur de coupe correspondante (milieu de l'intervalle).
+    labels : np.ndarray
+        Partition consolidée par K-Means (n,).
+    centers : np.ndarray
+        Centres de la partition consolidée.
+    exact : bool
+        Vrai si les feuilles sont les points distincts (CAH exacte).
+    """
+
+    linkage: np.ndarray
+    leaf_labels: np.ndarray
+    n_suggested: int
+    cut_height: float
+    labels: np.ndarray
+    centers: np.ndarray
+    exact: bool
+
+    @property
+    def n_leaves(self) -> int:
+        return len(self.linkage) + 1
+
+    def cut_table(self, max_clusters: int) -> pd.DataFrame:
+        """Hauteurs et gains d'inertie des coupes en 2..``max_clusters`` clusters."""
+        return _cut_table(self.linkage, max_clusters, self.n_suggested)
+
+
+def ward_linkage(centers: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """CAH de Ward pondérée par chaîne des plus proches voisins.
+
+    Le critère de Ward entre deux groupes a et b de poids w et de centres
+    c vaut w_a w_b / (w_a + w_b) ||c_a - c_b||² ; il est réductible, donc
+    la chaîne des plus proches voisins (NN-chain) produit exactement la
+    hiérarchie de Ward en O(m²) opérations.
+
+    Tant que la matrice m x m des critères tient dans
+    ``WARD_DENSE_MAX_BYTES``, elle est calculée une fois puis mise à jour
+    par Lance-Williams, les groupes actifs compactés en tête : O(k) par pas
+    de la chaîne pour k groupes restants (~2 s pour 8 000 points, comme
+    ``scipy.cluster.hierarchy.ward``). Au-delà, chaque pas recalcule les
+    critères depuis les centres, sans matrice : mémoire O(m d), mais
+    O(m d) par pas (~10 s pour 8 000 points).
+
+    Parameters
+    ----------
+    centers : np.ndarray
+        Centres des groupes élémentaires (m x d).
+    weights : np.ndarray
+        Poids (effectifs) des groupes (m,).
+
+    Returns
+    -------
+    np.ndarray
+        Liaison ``(m - 1) x 4`` au format scipy. Hauteurs sqrt(2 x critère),
+        égales à celles de ``scipy.cluster.hierarchy.ward`` pour des poids
+        unitaires ; 4e colonne : nombre de feuilles (convention scipy).
+    """
+    centers = np.array(centers, dtype=np.float64)
+    weights = np.array(weights, dtype=np.float64)
+    m = len(centers)
+    if m < 2:
+        raise ValueError("Au moins deux groupes sont nécessaires")
+    if m * m * 8 <= WARD_DENSE_MAX_BYTES:
+        merges = _ward_merges_dense(centers, weights)
+    else:
+        merges = _ward_merges_chain(centers, weights)
+    return _merges_to_linkage(merges, m)
+
+
+def _ward_merges_dense(centers: np.ndarray, weights: np.ndarray) -> list[tuple[int, int, float]]:
+    from scipy.spatial.distance import cdist
+
+    m = len(centers)
+    crit = cdist(centers, centers, "sqeuclidean")
+    for start in range(0, m, WARD_BLOCK_ROWS):
+        w = weights[start:start + WARD_BLOCK_ROWS, None]
+        crit[start:start + WARD_BLOCK_ROWS] *= w * weights / (w + weights)
+    np.fill_diagonal(crit, np.inf)
+    # Groupes actifs compactés dans les k premières cases : le groupe fusionné
+    # b cède sa case au dernier actif, les lignes lues raccourcissent
+    group = np.arange(m)
+    k = m
+    merges = []
+    chain: list[int] = []
+    while k > 1:
+        if not chain:
+            chain.append(0)
+        a = chain[-1]
+        cost = crit[a, :k]
+        b = int(np.argmin(cost))
+        # Égalités : préférer le prédécesseur dans la chaîne (pas de cycle)
+        if len(chain) > 1 and cost[chain[-2]] <= cost[b]:
+            b = chain[-2]
+        if len(chain) > 1 and b == chain[-2]:
+            del chain[-2:]
+            w = weights[:k]
+            w_a, w_b, height = weights[a], weights[b], np.sqrt(2 * cost[b])
+            # Lance-Williams
+            row = ((w + w_a) * cost + (w + w_b) * crit[b, :k] - w * cost[b]) / (w + w_a + w_b)
+            row[a] = np.inf
+            crit[a, :k] = row
+            crit[:k, a] = row
+            merges.append((int(group[a]), int(group[b]), height))
+            weights[a] = w_a + w_b
+            k -= 1
+            if b != k:
+                crit[b, :k + 1] = crit[k, :k + 1]
+                crit[:k + 1, b] = crit[:k + 1, k]
+                crit[b, b] = np.inf
+                weights[b], group[b] = weights[k], group[k]
+                chain = [b if c == k else c for c in chain]
+        else:
+            chain.append(b)
+    return merges
+
+
+def _ward_merges_chain(centers: np.ndarray, weights: np.ndarray) -> list[tuple[int, int, float]]:
+    m = len(centers)
+    active = np.ones(m, dtype=bool)
+    merges = []
+    chain: list[int] = []
+
+    while len(merges) < m - 1:
+        if not chain:
+            chain.append(int(np.argmax(active)))
+        a = chain[-1]
+        cost = weights * weights[a] / (weights + weights[a]) * ((centers - centers[a]) ** 2).sum(axis=1)
+        cost[~active] = np.inf
+        cost[a] = np.inf
+        b = int(np.argmin(cost))
+        # Égalités : préférer le prédécesseur dans la chaîne (pas de cycle)
+        if len(chain) > 1 and cost[chain[-2]] <= cost[b]:
+            b = chain[-2]
+        if len(chain) > 1 and b == chain[-2]:
+            del chain[-2:]
+            total = weights[a] + weights[b]
+            merges.append((a, b, np.sqrt(2 * cost[b])))
+            centers[a] = (weights[a] * centers[a] + weights[b] * centers[b]) / total
+            weights[a] = total
+            active[b] = False
+        else:
+            chain.append(b)
+    return merges
+
+
+def _merges_to_linkage(merges: list[tuple[int, int, float]], m: int) -> np.ndarray:
+    # Tri par hauteur, puis numérotation scipy (union-find sur les feuilles)
+    merges.sort(key=lambda merge: merge[2])
+    parent = np.arange(m)
+    label = np.arange(m)
+    size = np.ones(m)
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    linkage = np.empty((m - 1, 4))
+    for i, (a, b, height) in enumerate(merges):
+        ra, rb = find(a), find(b)
+        linkage[i] = (min(label[ra], label[rb]), max(label[ra], label[rb]), height, size[ra] + size[rb])
+        parent[rb] = ra
+        label[ra] = m + i
+        size[ra] += size[rb]
+    return linkage
+
+
+def _cut_table(linkage: np.ndarray, max_clusters: int, suggested: int | None = None) -> pd.DataFrame:
+    heights = linkage[::-1, 2]
+    ks = np.arange(2, min(max_clusters, len(heights)) + 1)
+    # Gain d'inertie (critère de Ward) de la fusion k -> k - 1 clusters
+    gains = heights ** 2 / 2
+    next_gain = np.append(gains, np.nan)[ks - 1]
+    return pd.DataFrame({
+        "n_clusters": ks,
+        "merge_height": heights[ks - 2],
+        "inertia_gain": gains[ks - 2],
+        "gain_ratio": next_gain / gains[ks - 2],
+        "suggested": ks == suggested,
+    })
+
+
+def suggest_cut(linkage: np.ndarray, max_clusters: int = 10, min_clusters: int = 2) -> tuple[int, float]:
+    """Nombre de clusters suggéré et hauteur de coupe.
+
+    Critère des gains d'inertie (comme ``HCPC`` de FactoMineR) : on retient
+    k minimisant Δ(k+1) / Δ(k), où Δ(k) est la perte d'inertie inter-classes
+    due à la fusion de k en k - 1 clusters — la subdivision suivante
+    apporterait relativement peu.
+
+    Returns
+    -------
+    tuple
+        ``(k, hauteur)`` ; la hauteur est le milieu de l'intervalle de
+        coupe donnant k clusters.
+    """
+    table = _cut_table(linkage, max_clusters + 1)
+    table = table[(table["n_clusters"] >= min_clusters) & (table["n_clusters"] <= max_clusters)]
+    k = int(table.loc[table["gain_ratio"].idxmin(), "n_clusters"])
+    heights = linkage[::-1, 2]
+    return k, float((heights[k - 2] + heights[k - 1]) / 2)
+
+
+def cut_linkage(linkage: np.ndarray, n_clusters: int) -> np.ndarray:
+    """Groupe de chaque feuille après les ``m - n_clusters`` premières fusions.
+
+    Donne exactement ``n_clusters`` groupes non vides, même en cas de
+    hauteurs égales (``fcluster`` « maxclust » peut en rendre moins), en
+    O(m) — ``scipy.cluster.hierarchy.cut_tree`` calcule toutes les coupes
+    (O(m²)). Groupes numérotés dans l'ordre de leur première feuille.
+    """
+    m = len(linkage) + 1
+    n_merges = m - n_clusters
+    node = np.arange(2 * m - 1)
+    children = linkage[:n_merges, :2].astype(np.int64)
+    # Du haut vers le bas : chaque nœud fusionné transmet sa racine à ses fils
+    for i in range(n_merges - 1, -1, -1):
+        node[children[i]] = node[m + i]
+    _, first, groups = np.unique(node[:m], return_index=True, return_inverse=True)
+    return np.argsort(np.argsort(first))[groups.ravel()]
+
+
+def ward_hierarchy(
+    X: np.ndarray,
+    n_clusters: int | None = None,
+    max_clusters: int = 10,
+    n_micro: int | None = None,
+    random_state: int | None = None,
+) -> WardHierarchy:
+    """CAH de Ward sur la population complète, coupe et consolidation.
+
+    Les points identiques sont d'abord regroupés (poids = effectif). Si
+    les points distincts sont au plus ``EXACT_MAX_LEAVES`` (ou si
+    ``n_micro`` vaut 0), la CAH est exacte ; sinon elle porte sur
+    ``n_micro`` micro-clusters ``MiniBatchKMeans``. L'arbre est coupé en
+    ``n_clusters`` groupes (par défaut : coupe suggérée), dont les centres
+    initialisent un K-Means de consolidation.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées (n x d).
+    n_clusters : int, optional
+        Nombre de clusters de la partition finale (défaut : suggestion).
+    max_clusters : int
+        Borne supérieure de la suggestion.
+    n_micro : int, optional
+        Nombre de micro-clusters (défaut : ``N_MICRO_CLUSTERS`` si
+        nécessaire ; 0 force la CAH exacte).
+    random_state : int, optional
+        Graine des K-Means.
+
+    Returns
+    -------
+    WardHierarchy
+
+    Raises
+    ------
+    ValueError
+        Si ``n_clusters`` dépasse le nombre de feuilles de l'arbre.
+    """
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    X = np.asarray(X, dtype=np.float64)
+    leaves, leaf_labels, weights = np.unique(X, axis=0, return_inverse=True, return_counts=True)
+    leaf_labels = leaf_labels.ravel()
+    exact = n_micro == 0 or (n_micro is None and len(leaves) <= EXACT_MAX_LEAVES)
+    if not exact:
+        micro = MiniBatchKMeans(
+            n_clusters=n_micro or N_MICRO_CLUSTERS, batch_size=MINIBATCH_SIZE, n_init=1,
+            random_state=random_state,
+        ).fit(X)
+        leaf_labels = micro.labels_
+        weights = np.bincount(leaf_labels, minlength=micro.n_clusters)
+        leaves = micro.cluster_centers_[weights > 0]
+        # Micro-clusters vides écartés : renumérotation des feuilles
+        leaf_labels = np.cumsum(weights > 0)[leaf_labels] - 1
+        weights = weights[weights > 0]
+
+    linkage = ward_linkage(leaves, weights)
+    n_suggested, cut_height = suggest_cut(linkage, max_clusters)
+    k = n_clusters or n_suggested
+    if k > len(leaves):
+        raise ValueError(
+            f"{k} clusters demandés pour {len(leaves)} feuilles "
+            f"({'points distincts' if exact else 'micro-clusters non vides'})"
+        )
+
+    groups = cut_linkage(linkage, k)
+    init = np.vstack([
+        np.average(leaves[groups == g], axis=0, weights=weights[groups == g]) for g in range(k)
+    ])
+    kmeans = KMeans(n_clusters=k, init=init, n_init=1, random_state=random_state).fit(X)
+    return WardHierarchy(
+        linkage=linkage,
+        leaf_labels=leaf_labels,
+        n_suggested=n_suggested,
+        cut_height=cut_height,
+        labels=kmeans.labels_,
+        centers=kmeans.cluster_centers_,
+        exact=exact,
+    )
+
+
+# ── K-Means configurable ───────────────────────────────────
+
+@dataclass
+class KMeansResult:
+    """Résultat de :func:`fit_kmeans`.
+
+    Attributes
+    ----------
+    labels : np.ndarray
+        Cluster de chaque individu (n,).
+    centers : np.ndarray
+        Centres (n_clusters x k_axes).
+    inertia : float
+        Somme des distances carrées aux centres, sur tous les individus.
+    backend : str
+        Moteur effectivement utilisé.
+    """
+
+    labels: np.ndarray
+    centers: np.ndarray
+    inertia: float
+    backend: str
+
+
+def _blocks(X: np.ndarray, k_axes: int, chunk_size: int):
+    for start in range(0, len(X), chunk_size):
+        yield start, np.asarray(X[start:start + chunk_size, :k_axes], dtype=np.float64)
+
+
+def assign_clusters(
+    X: np.ndarray, centers: np.ndarray, chunk_size: int = CHUNK_ROWS,
+) -> tuple[np.ndarray, float]:
+    """Affecte chaque individu au centre le plus proche, bloc par bloc.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées (n x d, éventuellement projetées en mémoire) ; seules
+        les ``centers.shape[1]`` premières colonnes sont lues.
+    centers : np.ndarray
+        Centres (K x k).
+    chunk_size : int
+        Lignes par bloc.
+
+    Returns
+    -------
+    tuple
+        ``(labels, inertie)``.
+    """
+    labels = np.empty(len(X), dtype=np.int32)
+    inertia = 0.0
+    sq_centers = (centers ** 2).sum(axis=1)
+    for start, block in _blocks(X, centers.shape[1], chunk_size):
+        block_labels = (sq_centers - 2 * block @ centers.T).argmin(axis=1)
+        labels[start:start + len(block)] = block_labels
+        inertia += float(((block - centers[block_labels]) ** 2).sum())
+    return labels, inertia
+
+
+def lloyd_pass(X: np.ndarray, centers: np.ndarray, chunk_size: int = CHUNK_ROWS) -> np.ndarray:
+    """Une itération de Lloyd par blocs : centres recalculés sur tous les individus.
+
+    Un centre sans individu est conservé.
+    """
+    n_clusters, k_axes = centers.shape
+    sums = np.zeros_like(centers)
+    counts = np.zeros(n_clusters)
+    sq_centers = (centers ** 2).sum(axis=1)
+    for _, block in _blocks(X, k_axes, chunk_size):
+        block_labels = (sq_centers - 2 * block @ centers.T).argmin(axis=1)
+        for axis in range(k_axes):
+            sums[:, axis] += np.bincount(block_labels, weights=block[:, axis], minlength=n_clusters)
+        counts += np.bincount(block_labels, minlength=n_clusters)
+    updated = centers.copy()
+    filled = counts > 0
+    updated[filled] = sums[filled] / counts[filled, None]
+    return updated
+
+
+def _minibatch_restart(X, n_clusters, seed, batch_size):
+    from sklearn.cluster import MiniBatchKMeans
+
+    model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=1, random_state=seed)
+    return model.fit(X).cluster_centers_
+
+
+def _streaming_restart(X, n_clusters, k_axes, seed, chunk_size, batch_size, epochs):
+    from sklearn.cluster import MiniBatchKMeans, kmeans_plusplus
+
+    rng = np.random.default_rng(seed)
+    # Initialisation k-means++ sur un échantillon de lignes de tout le fichier
+    rows = np.sort(rng.choice(len(X), min(len(X), 3 * batch_size), replace=False))
+    sample = np.asarray(X[rows, :k_axes], dtype=np.float64)
+    init, _ = kmeans_plusplus(sample, n_clusters, random_state=seed)
+    model = MiniBatchKMeans(n_clusters=n_clusters, init=init, n_init=1, random_state=seed)
+
+    starts = np.arange(0, len(X), chunk_size)
+    epochs = max(epochs, -(-STREAMING_MIN_STEPS * batch_size // len(X)))
+    for _ in range(epochs):
+        for start in rng.permutation(starts):
+            block = np.asarray(X[start:start + chunk_size, :k_axes], dtype=np.float64)
+            block = block[rng.permutation(len(block))]
+            for batch_start in range(0, len(block), batch_size):
+                model.partial_fit(block[batch_start:batch_start + batch_size])
+    return model.cluster_centers_
+
+
+def fit_kmeans(
+    X: np.ndarray,
+    n_clusters: int,
+    k_axes: int | None = None,
+    backend: str = "auto",
+    n_init: int = 10,
+    random_state: int | None = None,
+    chunk_size: int = CHUNK_ROWS,
+    n_jobs: int | None = None,
+) -> KMeansResult:
+    """K-Means avec moteur configurable.
+
+    Moteurs :
+      - ``exact`` : ``sklearn.cluster.KMeans`` (Lloyd) sur ``X`` en mémoire ;
+      - ``minibatch`` : ``MiniBatchKMeans`` sur ``X`` en mémoire ;
+      - ``streaming`` : ``MiniBatchKMeans.partial_fit`` sur des blocs de
+        ``chunk_size`` lignes lus dans ``X`` (``STREAMING_EPOCHS`` passes) —
+        seul un bloc est matérialisé, ``X`` pouvant être projeté en mémoire ;
+      - ``auto`` : ``exact`` jusqu'à ``AUTO_EXACT_MAX_ROWS`` lignes, sinon
+        ``streaming``.
+
+    Pour les moteurs approchés, les ``n_init`` initialisations tournent en
+    parallèle (threads) ; la meilleure est retenue sur l'inertie calculée
+    sur tous les individus (:func:`assign_clusters`), puis affinée par
+    ``LLOYD_PASSES`` itérations de Lloyd par blocs (:func:`lloyd_pass`).
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées (n x d).
+    n_clusters : int
+        Nombre de clusters.
+    k_axes : int, optional
+        Nombre de premières colonnes utilisées (défaut : toutes).
+    backend : str
+        Moteur (voir ``KMEANS_BACKENDS``).
+    n_init : int
+        Nombre d'initialisations.
+    random_state : int, optional
+        Graine.
+    chunk_size : int
+        Lignes par bloc (moteur ``streaming`` et affectation finale).
+    n_jobs : int, optional
+        Initialisations simultanées (défaut : :func:`utils.cpu_budget` ;
+        les workers d'un pool de processus passent leur part de threads).
+
+    Returns
+    -------
+    KMeansResult
+
+    Raises
+    ------
+    ValueError
+        Si le moteur est inconnu.
+    """
+    if backend not in KMEANS_BACKENDS:
+        raise ValueError(f"Moteur K-Means inconnu : {backend!r} (choix : {', '.join(KMEANS_BACKENDS)})")
+    k_axes = k_axes or X.shape[1]
+    if backend == "auto":
+        backend = "exact" if len(X) <= AUTO_EXACT_MAX_ROWS else "streaming"
+
+    if backend == "exact":
+        from sklearn.cluster import KMeans
+
+        model = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=n_init)
+        labels = model.fit_predict(np.asarray(X[:, :k_axes], dtype=np.float64))
+        return KMeansResult(labels, model.cluster_centers_, float(model.inertia_), backend)
+
+    seeds = np.random.RandomState(random_state).randint(np.iinfo(np.int32).max, size=n_init)
+    batch_size = min(MINIBATCH_SIZE, len(X))
+    if backend == "minibatch":
+        X_k = np.ascontiguousarray(X[:, :k_axes], dtype=np.float64)
+        restart = lambda seed: _minibatch_restart(X_k, n_clusters, seed, batch_size)  # noqa: E731
+    else:
+        restart = lambda seed: _streaming_restart(  # noqa: E731
+            X, n_clusters, k_axes, seed, chunk_size, batch_size, STREAMING_EPOCHS,
+        )
+        X_k = X
+
+    workers = min(n_init, n_jobs or cpu_budget())
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        candidates = list(executor.map(restart, seeds))
+    best_centers, best_inertia = None, np.inf
+    for centers in candidates:
+        _, inertia = assign_clusters(X_k, centers, chunk_size)
+        if inertia < best_inertia:
+            best_centers, best_inertia = centers, inertia
+    for _ in range(LLOYD_PASSES):
+        best_centers = lloyd_pass(X_k, best_centers, chunk_size)
+    labels, inertia = assign_clusters(X_k, best_centers, chunk_size)
+    return KMeansResult(labels, best_centers, inertia, backend)
+
+
+def compare_partitions(reference: KMeansResult, candidate: KMeansResult) -> dict[str, float]:
+    """Écart d'une partition approchée à la partition de référence.
+
+    Parameters
+    ----------
+    reference : KMeansResult
+        Partition de référence (moteur ``exact``).
+    candidate : KMeansResult
+        Partition à évaluer.
+
+    Returns
+    -------
+    dict
+        ``inertia_gap_%`` (excès relatif d'inertie), ``ari`` (indice de
+        Rand ajusté) et ``label_agreement_%`` (individus de même cluster
+        après appariement optimal des étiquettes).
+    """
+    from scipy.optimize import linear_sum_assignment
+    from sklearn.metrics import adjusted_rand_score
+
+    n_clusters = max(reference.labels.max(), candidate.labels.max()) + 1
+    contingency = np.bincount(
+        reference.labels.astype(np.int64) * n_clusters + candidate.labels,
+        minlength=n_clusters * n_clusters,
+    ).reshape(n_clusters, n_clusters)
+    rows, cols = linear_sum_assignment(contingency, maximize=True)
+    return {
+        "inertia_gap_%": (candidate.inertia / reference.inertia - 1) * 100,
+        "ari": adjusted_rand_score(reference.labels, candidate.labels),
+        "label_agreement_%": contingency[rows, cols].sum() / len(reference.labels) * 100,
+    }
+
+
+# ── Silhouette ─────────────────────────────────────────────
+
+@dataclass
+class SilhouetteResult:
+    """Résultat de :func:`silhouette`.
+
+    Attributes
+    ----------
+    score : float
+        Silhouette moyenne (estimée en mode ``sampled``).
+    mode : str
+        Mode effectivement utilisé.
+    ci_low, ci_high : float
+        Intervalle de confiance à 95 % (mode ``sampled`` ; égal au score
+        sinon).
+    n_evaluated : int
+        Nombre d'individus dont la silhouette a été calculée.
+    """
+
+    score: float
+    mode: str
+    ci_low: float
+    ci_high: float
+    n_evaluated: int
+
+
+def _sampled_silhouette(X, labels, k_axes, sample_size, reference_size, n_groups, rng):
+    from scipy.spatial.distance import cdist
+    from scipy.stats import t as student
+
+    n_clusters = int(labels.max()) + 1
+    sizes = np.bincount(labels, minlength=n_clusters)
+    weights = sizes / len(labels)
+    members = np.split(np.argsort(labels, kind="stable"), np.cumsum(sizes)[:-1])
+    # Allocation proportionnelle par groupe, au moins 1 individu par cluster non vide
+    alloc = np.minimum(sizes, np.maximum(np.round(sample_size / n_groups * weights).astype(int), 1))
+
+    estimates = np.empty(n_groups)
+    for g in range(n_groups):
+        reference = [np.sort(rng.choice(idx, min(len(idx), reference_size), replace=False)) for idx in members]
+        ref_points = [np.asarray(X[idx, :k_axes], dtype=np.float64) for idx in reference]
+        means = np.zeros(n_clusters)
+        for h, idx in enumerate(members):
+            if sizes[h] < 2:
+                continue  # silhouette nulle par convention
+            evaluated = np.sort(rng.choice(idx, alloc[h], replace=False))
+            points = np.asarray(X[evaluated, :k_axes], dtype=np.float64)
+            dist = np.column_stack([
+                cdist(points, ref).mean(axis=1) if len(ref) else np.full(len(points), np.inf)
+                for ref in ref_points
+            ])
+            # Distance moyenne intra-cluster hors l'individu lui-même
+            n_ref = len(reference[h])
+            n_own = n_ref - np.isin(evaluated, reference[h])
+            a = dist[:, h] * n_ref / np.maximum(n_own, 1)
+            dist[:, h] = np.inf
+            b = dist.min(axis=1)
+            means[h] = ((b - a) / np.maximum(a, b)).mean()
+        estimates[g] = weights @ means
+
+    # Groupes aléatoires indépendants : la dispersion des estimations couvre
+    # l'échantillonnage des individus évalués et celui des références
+    score = float(estimates.mean())
+    half_width = float(student.ppf(0.975, n_groups - 1) * estimates.std(ddof=1) / np.sqrt(n_groups))
+    return SilhouetteResult(score, "sampled", score - half_width, score + half_width, int(alloc.sum() * n_groups))
+
+
+def _simplified_silhouette(X, labels, k_axes, chunk_size):
+    n_clusters = int(labels.max()) + 1
+    sums = np.zeros((n_clusters, k_axes))
+    for start, block in _blocks(X, k_axes, chunk_size):
+        block_labels = labels[start:start + len(block)]
+        for axis in range(k_axes):
+            sums[:, axis] += np.bincount(block_labels, weights=block[:, axis], minlength=n_clusters)
+    sizes = np.bincount(labels, minlength=n_clusters)
+    centers = sums / np.maximum(sizes, 1)[:, None]
+
+    total = 0.0
+    for start, block in _blocks(X, k_axes, chunk_size):
+        block_labels = labels[start:start + len(block)]
+        dist = np.sqrt(np.maximum(
+            (block ** 2).sum(axis=1)[:, None] - 2 * block @ centers.T + (centers ** 2).sum(axis=1), 0,
+        ))
+        rows = np.arange(len(block))
+        a = dist[rows, block_labels]
+        dist[rows, block_labels] = np.inf
+        dist[:, sizes == 0] = np.inf
+        b = dist.min(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = np.where(sizes[block_labels] > 1, (b - a) / np.maximum(a, b), 0.0)
+        total += float(np.nan_to_num(s).sum())
+    score = total / len(labels)
+    return SilhouetteResult(score, "simplified", score, score, len(labels))
+
+
+def silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    k_axes: int | None = None,
+    mode: str = "auto",
+    sample_size: int = SILHOUETTE_SAMPLE,
+    reference_size: int = SILHOUETTE_REFERENCE,
+    random_state: int | None = None,
+    chunk_size: int = CHUNK_ROWS,
+) -> SilhouetteResult:
+    """Silhouette moyenne d'une partition, exacte ou approchée.
+
+    Modes :
+      - ``exact`` : ``sklearn.metrics.silhouette_score``, O(n²) ;
+      - ``sampled`` : silhouette d'environ ``sample_size`` individus tirés
+        par strates (clusters, allocation proportionnelle), distances
+        moyennes estimées sur au plus ``reference_size`` individus de
+        référence par cluster (exactes pour les clusters plus petits) ;
+        l'échantillon est réparti en ``SILHOUETTE_GROUPS`` groupes
+        indépendants (références propres à chaque groupe), dont la
+        dispersion donne l'intervalle de confiance à 95 % (Student) ;
+      - ``simplified`` : silhouette simplifiée (Hruschka et al., 2004), où
+        a et b sont les distances au centroïde du cluster et au centroïde
+        étranger le plus proche ; O(n K), par blocs ;
+      - ``auto`` : ``exact`` jusqu'à ``SILHOUETTE_EXACT_MAX_ROWS`` lignes,
+        ``sampled`` jusqu'à ``SILHOUETTE_SAMPLED_MAX_ROWS``, ``simplified``
+        au-delà.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées (n x d, éventuellement projetées en mémoire).
+    labels : np.ndarray
+        Cluster de chaque individu, dans ``[0, K)``.
+    k_axes : int, optional
+        Nombre de premières colonnes utilisées (défaut : toutes).
+    mode : str
+        Mode (voir ``SILHOUETTE_MODES``).
+    sample_size : int
+        Individus évalués (mode ``sampled``).
+    reference_size : int
+        Individus de référence par cluster (mode ``sampled``).
+    random_state : int, optional
+        Graine de l'échantillonnage.
+    chunk_size : int
+        Lignes par bloc (mode ``simplified``).
+
+    Returns
+    -------
+    SilhouetteResult
+
+    Raises
+    ------
+    ValueError
+        Si le mode est inconnu.
+    """
+    if mode not in SILHOUETTE_MODES:
+        raise ValueError(f"Mode de silhouette inconnu : {mode!r} (choix : {', '.join(SILHOUETTE_MODES)})")
+    k_axes = k_axes or X.shape[1]
+    labels = np.asarray(labels, dtype=np.int64)
+    if mode == "auto":
+        if len(labels) <= SILHOUETTE_EXACT_MAX_ROWS:
+            mode = "exact"
+        elif len(labels) <= SILHOUETTE_SAMPLED_MAX_ROWS:
+            mode = "sampled"
+        else:
+            mode = "simplified"
+
+    if mode == "exact":
+        from sklearn.metrics import silhouette_score
+
+        score = float(silhouette_score(np.asarray(X[:, :k_axes], dtype=np.float64), labels))
+        return SilhouetteResult(score, mode, score, score, len(labels))
+    if mode == "sampled":
+        rng = np.random.default_rng(random_state)
+        return _sampled_silhouette(X, labels, k_axes, sample_size, reference_size, SILHOUETTE_GROUPS, rng)
+    return _simplified_silhouette(X, labels, k_axes, chunk_size)
@@ -0,0 +1,601 @@
+"""
+Moteur ACM natif sur tableau disjonctif creux.
+
+Alternative à ``prince.MCA`` : le tableau disjonctif complet est construit
+directement en CSR à partir des codes catégoriels (une entrée non nulle
+par individu et par variable), sans passer par un one-hot dense. La
+décomposition porte sur la matrice des résidus standardisés
+
+    S = D_r^{-1/2} (Z / (nQ) - r c^T) D_c^{-1/2}
+
+L'ACM ne dépend des individus qu'à travers la matrice de Burt B = Z^T Z
+(J x J, entière) : par défaut, S^T S en est déduite et diagonalisée
+exactement. Variante ``solver="arpack"`` : S est exprimée comme opérateur
+linéaire (centrage jamais matérialisé, produit en O(nQ)) et une SVD
+tronquée en extrait les ``n_components`` premiers axes. Mémoire et temps
+sont linéaires en n.
+
+Les sorties reproduisent celles de ``prince`` : valeurs propres, coordonnées
+des lignes et des colonnes, contributions des colonnes, avec la même
+convention de signe (``sklearn.utils.extmath.svd_flip``).
+
+Mode hors mémoire : ``accumulate_burt`` cumule la matrice de Burt sur des
+blocs de lignes, ``SparseMCA.fit_burt`` la diagonalise, puis
+``SparseMCA.project_codes`` calcule les coordonnées bloc par bloc. La
+matrice cumulée étant entière, le résultat est identique au bit près à
+celui de ``SparseMCA.fit``.
+
+Modèle persisté : ``MCAModel`` fige la projection d'une ACM ajustée
+(marges et coordonnées des modalités, valeurs singulières, valeurs
+d'imputation) dans un artefact ``.npz`` versionné, et projette de nouveaux
+individus comme individus supplémentaires.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, svds
+
+
+# ── Tableau disjonctif ─────────────────────────────────────
+
+def indicator_matrix(codes: np.ndarray, n_levels: np.ndarray) -> sparse.csr_matrix:
+    """Construit le tableau disjonctif complet en CSR.
+
+    Parameters
+    ----------
+    codes : np.ndarray
+        Codes entiers (n x Q), tous >= 0.
+    n_levels : np.ndarray
+        Nombre de modalités de chaque variable (Q,).
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        Matrice 0/1 (n x J), exactement Q valeurs non nulles par ligne.
+    """
+    n_rows, n_vars = codes.shape
+    offsets = np.concatenate(([0], np.cumsum(n_levels)[:-1]))
+    indices = (codes.astype(np.int64) + offsets).ravel()
+    indptr = np.arange(0, n_rows * n_vars + 1, n_vars, dtype=np.int64)
+    data = np.ones(indices.size, dtype=np.float64)
+    return sparse.csr_matrix((data, indices, indptr), shape=(n_rows, int(n_levels.sum())))
+
+
+def accumulate_burt(chunks: Iterable[np.ndarray], n_levels: Sequence[int]) -> tuple[np.ndarray, int]:
+    """Cumule la matrice de Burt sur des blocs de codes.
+
+    Les valeurs manquantes (code -1) sont comptées dans une modalité
+    supplémentaire, placée en dernier pour chaque variable : l'imputation
+    est appliquée ensuite sur la matrice cumulée (cf. :meth:`SparseMCA.fit_burt`).
+
+    Parameters
+    ----------
+    chunks : iterable of np.ndarray
+        Blocs de codes (n_bloc x Q), -1 pour une valeur manquante.
+    n_levels : sequence of int
+        Nombre de modalités de chaque variable (hors manquant).
+
+    Returns
+    -------
+    tuple
+        ``(burt, n_rows)`` : matrice de Burt étendue (J + Q) x (J + Q)
+        en entiers, et nombre total de lignes.
+    """
+    n_ext = np.asarray(n_levels) + 1
+    burt = np.zeros((n_ext.sum(), n_ext.sum()), dtype=np.int64)
+    n_rows = 0
+    for codes in chunks:
+        ext = np.where(codes < 0, n_ext - 1, codes)
+        Z = indicator_matrix(ext, n_ext)
+        burt += (Z.T @ Z).astype(np.int64).toarray()
+        n_rows += len(codes)
+    return burt, n_rows
+
+
+def _categorical_codes(X: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Codes compacts (modalités observées uniquement), nombre de modalités
+    par variable et libellés ``variable__modalité``."""
+    codes, n_levels, labels = [], [], []
+    for col in X.columns:
+        cat = X[col].astype("category").cat.remove_unused_categories()
+        if (cat.cat.codes < 0).any():
+            raise ValueError(f"Valeurs manquantes dans {col!r} : imputer avant l'ACM")
+        codes.append(cat.cat.codes.to_numpy())
+        n_levels.append(len(cat.cat.categories))
+        labels.extend(f"{col}__{mod}" for mod in cat.cat.categories)
+    return np.column_stack(codes), np.array(n_levels), labels
+
+
+def column_masses(X: pd.DataFrame) -> pd.Series:
+    """Masses des modalités observées (fréquence / Q), indexées ``variable__modalité``."""
+    n_rows, n_vars = X.shape
+    masses = {
+        f"{col}__{mod}": count / (n_rows * n_vars)
+        for col in X.columns
+        for mod, count in X[col].value_counts(sort=False).items()
+        if count > 0
+    }
+    return pd.Series(masses)
+
+
+# ── Convention de signe ────────────────────────────────────
+
+def svd_flip_signs(extreme_values: np.ndarray) -> np.ndarray:
+    """Signes ±1 rendant positive la coordonnée de plus grande valeur absolue.
+
+    Convention de ``svd_flip`` (u-based) : ``extreme_values`` contient, pour
+    chaque axe, la coordonnée d'individu de plus grand module.
+    """
+    signs = np.sign(extreme_values)
+    signs[signs == 0] = 1.0
+    return signs
+
+
+def update_extremes(extremes: np.ndarray, coords: np.ndarray) -> np.ndarray:
+    """Met à jour, axe par axe, la coordonnée de plus grand module rencontrée.
+
+    En cas d'égalité, la première occurrence est conservée (comme ``argmax``).
+    """
+    block = coords[np.argmax(np.abs(coords), axis=0), np.arange(coords.shape[1])]
+    return np.where(np.abs(block) > np.abs(extremes), block, extremes)
+
+
+# ── Moteur ─────────────────────────────────────────────────
+
+class SparseMCA:
+    """ACM sur tableau disjonctif creux.
+
+    Deux solveurs, de résultats identiques à la précision machine :
+
+    - ``"burt"`` : diagonalisation exacte de S^T S (J x J), obtenue à partir
+      de la matrice de Burt entière Z^T Z. Le résultat ne dépend que de
+      cette matrice, donc pas du découpage des individus en blocs :
+      :meth:`fit` et :meth:`fit_burt` (mode hors mémoire) produisent les
+      mêmes valeurs propres ;
+    - ``"arpack"`` : SVD tronquée de l'opérateur des résidus standardisés,
+      pour un très grand nombre de modalités.
+
+    Parameters
+    ----------
+    n_components : int
+        Nombre d'axes factoriels.
+    random_state : int, optional
+        Graine du vecteur initial ARPACK (résultats reproductibles).
+    tol : float
+        Tolérance ARPACK (0 : précision machine).
+    solver : str
+        ``"burt"`` (défaut) ou ``"arpack"``.
+
+    Attributes
+    ----------
+    eigenvalues_ : np.ndarray
+        Valeurs propres (carrés des valeurs singulières).
+    singular_values_ : np.ndarray
+        Valeurs singulières de S.
+    column_masses_ : np.ndarray
+        Masses des modalités (J,).
+    column_labels_ : list of str
+        Libellés ``variable__modalité``.
+    V_ : np.ndarray
+        Vecteurs singuliers droits (J x k).
+    column_contributions_ : pd.DataFrame
+        Contributions des modalités aux axes (somme = 1 par axe).
+    """
+
+    def __init__(
+        self,
+        n_components: int = 10,
+        random_state: int | None = None,
+        tol: float = 0.0,
+        solver: str = "burt",
+    ):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.tol = tol
+        self.solver = solver
+
+    def fit(self, X: pd.DataFrame) -> "SparseMCA":
+        """Ajuste l'ACM sur un DataFrame de variables catégorielles sans valeur manquante."""
+        codes, n_levels, labels = _categorical_codes(X)
+        self.n_levels_ = n_levels
+        self.column_labels_ = labels
+        Z = indicator_matrix(codes, n_levels)
+        if self.solver == "arpack":
+            return self._fit_indicator(Z, codes)
+        if self.solver != "burt":
+            raise ValueError(f"Solveur inconnu : {self.solver!r} (attendu : burt, arpack)")
+        self._fit_gram((Z.T @ Z).toarray(), len(codes), codes.shape[1])
+        projection = self.V_ * (self.column_masses_ ** -0.5)[:, None]
+        F = Z @ projection
+        self.align_signs(svd_flip_signs(F[np.argmax(np.abs(F), axis=0), np.arange(F.shape[1])]))
+        return self
+
+    def _fit_indicator(self, Z: sparse.csr_matrix, codes: np.ndarray) -> "SparseMCA":
+        n_rows, n_cols = Z.shape
+        n_vars = codes.shape[1]
+        k = self.n_components
+        if k >= n_cols - n_vars + 1:
+            raise ValueError(
+                f"n_components={k} trop grand : au plus {n_cols - n_vars} axes non triviaux"
+            )
+
+        c = np.asarray(Z.sum(axis=0)).ravel() / (n_rows * n_vars)
+        d = c ** -0.5
+        scale = 1.0 / np.sqrt(n_rows)
+        Zt = Z.T.tocsr()
+
+        def matvec(v):
+            v = np.asarray(v).reshape(n_cols, -1) * d[:, None]
+            out = Z @ v / n_vars - (c @ v)[None, :]
+            return scale * out
+
+        def rmatvec(u):
+            u = np.asarray(u).reshape(n_rows, -1)
+            out = Zt @ u / n_vars - np.outer(c, u.sum(axis=0))
+            return scale * d[:, None] * out
+
+        op = LinearOperator(
+            (n_rows, n_cols), dtype=np.float64,
+            matvec=matvec, rmatvec=rmatvec, matmat=matvec, rmatmat=rmatvec,
+        )
+        rng = np.random.default_rng(self.random_state)
+        v0 = rng.standard_normal(min(n_rows, n_cols))
+        U, s, Vt = svds(op, k=k, tol=self.tol, v0=v0, solver="arpack")
+
+        order = np.argsort(s)[::-1]
+        U, s, Vt = U[:, order], s[order], Vt[order]
+        # Convention de signe de sklearn.randomized_svd (utilisée par prince)
+        Vt *= svd_flip_signs(U[np.argmax(np.abs(U), axis=0), np.arange(k)])[:, None]
+
+        self.n_rows_ = n_rows
+        self.n_vars_ = n_vars
+        self.column_masses_ = c
+        self.singular_values_ = s
+        self.V_ = Vt.T
+        return self
+
+    def fit_burt(
+        self,
+        burt: np.ndarray,
+        n_rows: int,
+        n_levels: Sequence[int],
+        labels: Sequence[str],
+    ) -> "SparseMCA":
+        """Ajuste l'ACM à partir d'une matrice de Burt étendue.
+
+        Les valeurs manquantes sont imputées par la modalité la plus
+        fréquente de chaque variable (comme ``X.fillna(X.mode())``), puis
+        les modalités absentes sont écartées. La matrice
+        D_c^{-1/2} (B / (nQ²) - c c^T) D_c^{-1/2} = S^T S est diagonalisée :
+        ses valeurs propres sont exactement celles de :meth:`fit` (solveur
+        ``"burt"``) sur les mêmes données imputées.
+
+        Le signe des axes dépend des coordonnées des individus : il est
+        fixé ensuite par :meth:`align_signs`.
+
+        Parameters
+        ----------
+        burt : np.ndarray
+            Sortie de :func:`accumulate_burt`.
+        n_rows : int
+            Nombre d'individus.
+        n_levels : sequence of int
+            Nombre de modalités de chaque variable (hors manquant).
+        labels : sequence of str
+            Libellés des modalités (hors manquant), dans l'ordre des codes.
+        """
+        n_levels = np.asarray(n_levels)
+        n_vars = len(n_levels)
+        n_ext = n_levels + 1
+        ext_offsets = np.concatenate(([0], np.cumsum(n_ext)[:-1]))
+        counts = np.diag(burt)
+
+        # Imputation : la modalité « manquant » est fusionnée avec le mode
+        fill_codes = np.array([
+            int(np.argmax(counts[off:off + n])) for off, n in zip(ext_offsets, n_levels)
+        ])
+        merge = np.zeros((n_ext.sum(), n_levels.sum()), dtype=np.int64)
+        raw_offsets = np.concatenate(([0], np.cumsum(n_levels)[:-1]))
+        for q in range(n_vars):
+            for m in range(n_levels[q]):
+                merge[ext_offsets[q] + m, raw_offsets[q] + m] = 1
+            merge[ext_offsets[q] + n_levels[q], raw_offsets[q] + fill_codes[q]] = 1
+        burt = merge.T @ burt @ merge
+
+        # Modalités observées uniquement
+        keep = np.diag(burt) > 0
+        code_index = np.full(n_levels.sum(), -1, dtype=np.int64)
+        code_index[keep] = np.arange(keep.sum())
+        self.code_index_ = [code_index[off:off + n] for off, n in zip(raw_offsets, n_levels)]
+        self.fill_codes_ = fill_codes
+        self.n_levels_ = np.array([(idx >= 0).sum() for idx in self.code_index_])
+        self.column_labels_ = [lab for lab, k in zip(labels, keep) if k]
+        return self._fit_gram(burt[np.ix_(keep, keep)].astype(np.float64), n_rows, n_vars)
+
+    def _fit_gram(self, burt: np.ndarray, n_rows: int, n_vars: int) -> "SparseMCA":
+        """Diagonalise S^T S = D_c^{-1/2} (B / (nQ²) - c c^T) D_c^{-1/2}.
+
+        Les signes des axes restent à fixer (:meth:`align_signs`).
+        """
+        k = self.n_components
+        if k > burt.shape[0] - n_vars:
+            raise ValueError(
+                f"n_components={k} trop grand : au plus {burt.shape[0] - n_vars} axes non triviaux"
+            )
+        c = np.diag(burt) / (n_rows * n_vars)
+        d = c ** -0.5
+        gram = d[:, None] * (burt / (n_rows * n_vars ** 2) - np.outer(c, c)) * d[None, :]
+        eigvals, eigvecs = np.linalg.eigh(gram)
+        order = np.argsort(eigvals)[::-1][:k]
+
+        self.n_rows_ = n_rows
+        self.n_vars_ = n_vars
+        self.column_masses_ = c
+        self.singular_values_ = np.sqrt(np.clip(eigvals[order], 0.0, None))
+        self.V_ = eigvecs[:, order]
+        return self
+
+    def project_codes(self, codes: np.ndarray) -> np.ndarray:
+        """Coordonnées d'individus donnés par leurs codes bruts (-1 = manquant).
+
+        Les codes manquants sont imputés par ``fill_codes_``. Chaque
+        individu est la moyenne des lignes de D_c^{-1/2} V correspondant à
+        ses modalités : un simple gather, sans tableau disjonctif.
+
+        Returns
+        -------
+        np.ndarray
+            Coordonnées (n x k).
+        """
+        projection = self.V_ * (self.column_masses_ ** -0.5)[:, None]
+        coords = np.zeros((len(codes), projection.shape[1]))
+        for q, index in enumerate(self.code_index_):
+            col = np.where(codes[:, q] < 0, self.fill_codes_[q], codes[:, q])
+            cols = index[col]
+            if (cols < 0).any():
+                raise ValueError(f"Variable {q} : modalité absente de l'ajustement")
+            coords += projection[cols]
+        return coords / self.n_vars_
+
+    def align_signs(self, signs: np.ndarray) -> None:
+        """Multiplie chaque axe par ``signs`` (±1), ex. pour suivre :func:`svd_flip_signs`."""
+        self.V_ = self.V_ * signs[None, :]
+
+    @property
+    def eigenvalues_(self) -> np.ndarray:
+        return self.singular_values_ ** 2
+
+    @property
+    def column_contributions_(self) -> pd.DataFrame:
+        return pd.DataFrame(self.V_ ** 2, index=self.column_labels_)
+
+    def column_coordinates(self) -> pd.DataFrame:
+        """Coordonnées principales des modalités : D_c^{-1/2} V diag(s)."""
+        G = self.V_ * (self.column_masses_ ** -0.5)[:, None] * self.singular_values_
+        return pd.DataFrame(G, index=self.column_labels_)
+
+    def row_coordinates(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Coordonnées principales des individus (formule de transition).
+
+        Chaque individu est le barycentre, divisé par la valeur singulière,
+        des coordonnées de ses Q modalités : F = (Z / Q) D_c^{-1/2} V.
+        """
+        codes, _, labels = _categorical_codes(X)
+        if labels != self.column_labels_:
+            raise ValueError("Les modalités de X diffèrent de celles de l'ajustement")
+        Z = indicator_matrix(codes, self.n_levels_)
+        projection = self.V_ * (self.column_masses_ ** -0.5)[:, None]
+        return pd.DataFrame(Z @ projection / self.n_vars_, index=X.index)
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Alias de :meth:`row_coordinates` (interface scikit-learn)."""
+        return self.row_coordinates(X)
+
+
+# ── Modèle persisté ────────────────────────────────────────
+
+MODEL_VERSION = 1
+
+
+class MCAModel:
+    """Projection figée d'une ACM, pour individus supplémentaires.
+
+    Un individu supplémentaire est placé par la formule de transition :
+    moyenne, sur ses Q modalités, des coordonnées des modalités divisées
+    par les valeurs singulières. Seuls les J x k coefficients de projection
+    sont nécessaires : la projection d'un lot se réduit à Q lectures
+    indexées, sans tableau disjonctif.
+
+    Parameters
+    ----------
+    column_coordinates : pd.DataFrame
+        Coordonnées principales des modalités (J x k), indexées par
+        ``variable__modalité``.
+    singular_values : np.ndarray
+        Valeurs singulières (k,).
+    column_masses : np.ndarray
+        Masses des modalités (J,), dans l'ordre de ``column_coordinates``.
+    fill_values : mapping
+        Modalité d'imputation des valeurs manquantes, par variable (mode
+        de l'échantillon d'ajustement). Fixe aussi l'ordre des variables.
+
+    Raises
+    ------
+    ValueError
+        Si les modalités et les valeurs d'imputation sont incohérentes.
+    """
+
+    def __init__(
+        self,
+        column_coordinates: pd.DataFrame,
+        singular_values: np.ndarray,
+        column_masses: np.ndarray,
+        fill_values: Mapping[str, str],
+    ):
+        self.variables = list(fill_values)
+        self.fill_values = {var: str(val) for var, val in fill_values.items()}
+        self.column_labels = [str(lab) for lab in column_coordinates.index]
+        self.column_coordinates = column_coordinates.to_numpy(dtype=np.float64)
+        self.singular_values = np.asarray(singular_values, dtype=np.float64)
+        self.column_masses = np.asarray(column_masses, dtype=np.float64)
+
+        pairs = [lab.split("__", 1) for lab in self.column_labels]
+        self.modalities = {var: [mod for v, mod in pairs if v == var] for var in self.variables}
+        if sum(len(mods) for mods in self.modalities.values()) != len(pairs):
+            raise ValueError("Modalités rattachées à une variable sans valeur d'imputation")
+        for var, mods in self.modalities.items():
+            if self.fill_values[var] not in mods:
+                raise ValueError(f"{var!r} : modalité d'imputation {self.fill_values[var]!r} inconnue")
+
+        # D_c^{-1/2} V = G diag(1/s) ; une ligne par modalité
+        self._projection = self.column_coordinates / self.singular_values
+        sizes = [len(self.modalities[var]) for var in self.variables]
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        # Indices globaux des modalités, pour l'encodage ligne à ligne (:meth:`encode`)
+        self._lookups = [
+            {mod: offset + i for i, mod in enumerate(self.modalities[var])}
+            for var, offset in zip(self.variables, self._offsets)
+        ]
+        self._fill_index = [
+            lookup[self.fill_values[var]] for var, lookup in zip(self.variables, self._lookups)
+        ]
+
+    @property
+    def n_components(self) -> int:
+        return len(self.singular_values)
+
+    @property
+    def eigenvalues(self) -> np.ndarray:
+        return self.singular_values ** 2
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Projette des individus supplémentaires.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Une colonne par variable du modèle (colonnes supplémentaires
+            ignorées), valeurs en codes UCI (texte ou catégoriel). Les
+            valeurs manquantes sont imputées comme à l'ajustement.
+
+        Returns
+        -------
+        pd.DataFrame
+            Coordonnées ``Dim1`` ... ``Dimk``, même index que ``X``.
+
+        Raises
+        ------
+        ValueError
+            Si une variable manque ou si une modalité est absente du modèle.
+        """
+        missing = [var for var in self.variables if var not in X.columns]
+        if missing:
+            raise ValueError(f"Variables absentes : {', '.join(missing)}")
+        coords = np.zeros((len(X), self.n_components))
+        for var, offset in zip(self.variables, self._offsets):
+            mods = self.modalities[var]
+            values = X[var]
+            codes = pd.Categorical(values, categories=mods).codes.astype(np.intp)
+            unknown = codes < 0
+            if unknown.any():
+                invalid = unknown & values.notna().to_numpy()
+                if invalid.any():
+                    bad = pd.unique(values[invalid])[:5]
+                    raise ValueError(f"{var!r} : modalité(s) inconnue(s) du modèle : {list(bad)}")
+                codes[unknown] = mods.index(self.fill_values[var])
+            coords += self._projection[offset + codes]
+        coords /= len(self.variables)
+        columns = [f"Dim{i+1}" for i in range(self.n_components)]
+        return pd.DataFrame(coords, index=X.index, columns=columns)
+
+    def encode(self, rows: Iterable[Sequence[str | None]]) -> np.ndarray:
+        """Encode des spécimens en indices de modalités, ligne à ligne.
+
+        Variante de :meth:`transform` pour les petits lots (service de
+        prédiction) : de simples recherches dans un dictionnaire, sans
+        construire de DataFrame.
+
+        Parameters
+        ----------
+        rows : iterable of sequence
+            Une séquence de Q valeurs par spécimen, dans l'ordre de
+            ``variables`` ; ``None`` pour une valeur manquante.
+
+        Returns
+        -------
+        np.ndarray
+            Indices (n x Q), à passer à :meth:`project`.
+
+        Raises
+        ------
+        ValueError
+            Si un spécimen n'a pas Q valeurs ou contient une modalité inconnue.
+        """
+        n_vars = len(self.variables)
+        encoded = []
+        for row in rows:
+            if len(row) != n_vars:
+                raise ValueError(f"{len(row)} valeurs au lieu de {n_vars}")
+            try:
+                encoded.append([
+                    fill if value is None else lookup[value]
+                    for lookup, fill, value in zip(self._lookups, self._fill_index, row)
+                ])
+            except KeyError as exc:
+                var = next(v for v, lk, val in zip(self.variables, self._lookups, row)
+                           if val is not None and val not in lk)
+                raise ValueError(f"{var!r} : modalité inconnue du modèle : {exc.args[0]!r}") from None
+        return np.array(encoded, dtype=np.intp).reshape(-1, n_vars)
+
+    def project(self, indices: np.ndarray) -> np.ndarray:
+        """Coordonnées (n x k) de spécimens encodés par :meth:`encode`."""
+        coords = np.zeros((len(indices), self.n_components))
+        for q in range(indices.shape[1]):
+            coords += self._projection[indices[:, q]]
+        return coords / indices.shape[1]
+
+    # ── Persistance ──
+
+    def save(self, path: str | Path) -> Path:
+        """Enregistre le modèle (``.npz`` non compressé, sans pickle)."""
+        path = Path(path)
+        np.savez(
+            path,
+            version=np.int64(MODEL_VERSION),
+            variables=np.array(self.variables),
+            fill_values=np.array([self.fill_values[var] for var in self.variables]),
+            column_labels=np.array(self.column_labels),
+            column_coordinates=self.column_coordinates,
+            singular_values=self.singular_values,
+            column_masses=self.column_masses,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "MCAModel":
+        """Charge un modèle enregistré par :meth:`save`.
+
+        Raises
+        ------
+        ValueError
+            Si la version de l'artefact n'est pas celle du code.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != MODEL_VERSION:
+                raise ValueError(
+                    f"Modèle ACM version {version}, attendu {MODEL_VERSION} : "
+                    "relancer python src/03_mca.py"
+                )
+            return cls(
+                pd.DataFrame(data["column_coordinates"], index=data["column_labels"].tolist()),
+                data["singular_values"],
+                data["column_masses"],
+                dict(zip(data["variables"].tolist(), data["fill_values"].tolist())),
+            )
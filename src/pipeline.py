@@ -0,0 +1,607 @@
+"""
+Orchestrateur incrémental du pipeline.
+
+Déclare, pour chaque script ``src/0X_*.py``, ses entrées (fichiers de
+données, constantes de configuration, code source) et ses sorties.
+Chaque entrée est hachée (SHA-256) ; une étape n'est ré-exécutée que si
+l'une de ses empreintes a changé depuis la dernière exécution réussie,
+ou si l'une de ses sorties est absente ou a été modifiée.
+
+Les dépendances entre étapes sont déduites des entrées/sorties : les
+étapes indépendantes (ex. 04 à 08, qui ne lisent que les sorties de
+03) s'exécutent en parallèle. La sortie de chaque étape est écrite dans
+``.pipeline/logs/<étape>.log``.
+
+Le budget CPU (``--cpus``, défaut : nombre de CPU) est partagé entre les
+étapes lancées ensemble et transmis à chacune dans ``PIPELINE_CPUS`` :
+les étapes à pool de processus (06 à 08) y dimensionnent leur pool.
+``OMP_NUM_THREADS`` (et équivalents) vaut la même part, sauf s'il est
+déjà fixé.
+
+Avec ``--figures off`` (ou ``fast``, basse résolution), le mode est
+transmis aux étapes qui produisent des figures ; en ``off``, leurs figures
+ne sont plus des sorties attendues. Une étape n'est relancée pour ses
+figures que si elles ont été produites dans un mode inférieur
+(``off`` < ``fast`` < ``full``), jamais pour les dégrader ou les retirer.
+
+L'état est conservé dans ``.pipeline/state.json``. Un cache (taille,
+mtime) évite de re-hacher les fichiers inchangés : une ré-exécution à
+vide ne lit aucun fichier de données.
+
+Usage :
+    python src/pipeline.py                    # tout le pipeline
+    python src/pipeline.py 03_mca 04_cluster  # étapes choisies
+    python src/pipeline.py --force 06_sensitivity
+    python src/pipeline.py --dry-run          # état sans exécution
+    python src/pipeline.py --jobs 4           # 4 étapes simultanées au plus
+    python src/pipeline.py --cpus 8           # budget CPU partagé entre les étapes
+    python src/pipeline.py --profile          # profil de chaque étape (reports/perf/)
+    python src/pipeline.py --figures off      # tables et coordonnées seulement
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+
+# ── Configuration ──────────────────────────────────────────
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = PROJECT_ROOT / ".pipeline" / "state.json"
+LOG_DIR = PROJECT_ROOT / ".pipeline" / "logs"
+
+DEFAULT_JOBS = os.cpu_count() or 1
+DEFAULT_CPUS = os.cpu_count() or 1
+CPU_BUDGET_VAR = "PIPELINE_CPUS"               # cf. utils.cpu_budget
+POLL_INTERVAL = 0.05
+BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+RAW = "data/raw"
+PROCESSED = "data/processed"
+TABLES = "reports/tables"
+FIGURES = "reports/figures"
+FIGURE_MODES = ("off", "fast", "full")         # du moins au plus complet (cf. utils.FIGURE_MODES)
+FIGURE_MODE = "full"
+
+# Artefacts d'interface : export CSV + binaire lu en priorité par ``utils``
+PROCESSED_DATA = (
+    f"{PROCESSED}/mushroom_processed.csv",
+    f"{PROCESSED}/mushroom_processed.arrow",
+    f"{PROCESSED}/modalities.json",
+)
+MCA_COORDS = (f"{PROCESSED}/mca_coords.csv", f"{PROCESSED}/mca_coords.npy")
+MCA_MODEL = f"{PROCESSED}/mca_model.npz"
+CV_FOLDS_FILE = f"{PROCESSED}/cv_folds.npz"
+MODELS_DIR = f"{PROCESSED}/models"
+DASHBOARD = f"{PROCESSED}/dashboard"
+
+# Code partagé par toutes les étapes
+SHARED_CODE = ("src/utils.py",)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Déclaration d'une étape du pipeline.
+
+    Attributes
+    ----------
+    name : str
+        Nom de l'étape (nom du script sans extension).
+    inputs : tuple of str
+        Fichiers lus, relatifs à la racine du projet.
+    outputs : tuple of str
+        Fichiers produits, relatifs à la racine du projet.
+    config : tuple of str
+        Constantes de module dont la valeur conditionne les sorties.
+    code : tuple of str
+        Modules de ``src/`` importés par le script (en plus de ``utils.py``).
+    """
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+    config: tuple[str, ...] = ()
+    code: tuple[str, ...] = ()
+
+    @property
+    def script(self) -> str:
+        return f"src/{self.name}.py"
+
+    @property
+    def figures(self) -> tuple[str, ...]:
+        """Sorties de ``reports/figures/`` (absentes en mode ``--figures off``)."""
+        return tuple(rel for rel in self.outputs if rel.startswith(f"{FIGURES}/"))
+
+    def expected_outputs(self, figures: str = FIGURE_MODE) -> tuple[str, ...]:
+        """Sorties produites dans le mode de figures ``figures``."""
+        if figures != "off":
+            return self.outputs
+        return tuple(rel for rel in self.outputs if rel not in self.figures)
+
+
+STAGES = [
+    Stage(
+        "00_download",
+        inputs=(),
+        outputs=(f"{RAW}/agaricus-lepiota.data", f"{RAW}/agaricus-lepiota.names"),
+        config=("BASE_URL", "FILES"),
+    ),
+    Stage(
+        "01_prepare",
+        inputs=(f"{RAW}/agaricus-lepiota.data",),
+        outputs=PROCESSED_DATA + (CV_FOLDS_FILE,),
+        config=("COLUMN_NAMES", "MODALITIES", "MISSING_SENTINEL", "CV_FOLDS"),
+        code=("src/validation.py",),
+    ),
+    Stage(
+        "02_describe",
+        inputs=PROCESSED_DATA,
+        outputs=(
+            f"{TABLES}/univariate_summary.csv",
+            f"{TABLES}/target_distribution.csv",
+            f"{FIGURES}/desc_target_bar.png",
+            f"{FIGURES}/desc_top_modalities_odor.png",
+            f"{FIGURES}/desc_top_modalities_gill-color.png",
+            f"{FIGURES}/desc_top_modalities_spore-print-color.png",
+        ),
+        config=("KEY_VARIABLES", "TARGET_COLORS"),
+    ),
+    Stage(
+        "03_mca",
+        inputs=PROCESSED_DATA,
+        outputs=MCA_COORDS + (
+            MCA_MODEL,
+            f"{TABLES}/mca_eigenvalues.csv",
+            f"{TABLES}/mca_modalities_contrib_axis1.csv",
+            f"{TABLES}/mca_modalities_contrib_axis2.csv",
+            f"{FIGURES}/acm_scree.png",
+            f"{FIGURES}/acm_modalities_12.png",
+            f"{FIGURES}/acm_individuals_12_color_target.png",
+        ),
+        config=(
+            "N_COMPONENTS", "INERTIA_THRESHOLD", "TOP_CONTRIB", "RANDOM_STATE",
+            "MCA_ENGINE", "MCA_CHUNK_SIZE", "FIGURE_SAMPLE",
+        ),
+        code=("src/mca_engine.py",),
+    ),
+    Stage(
+        "04_cluster",
+        inputs=PROCESSED_DATA + MCA_COORDS,
+        outputs=(
+            f"{TABLES}/cluster_sizes.csv",
+            f"{TABLES}/cluster_vs_target.csv",
+            f"{TABLES}/cluster_profiles.csv",
+            f"{TABLES}/cluster_modality_stats.csv",
+            f"{TABLES}/cluster_cah_cuts.csv",
+            f"{FIGURES}/cluster_dendrogram.png",
+            f"{FIGURES}/cluster_on_acm12.png",
+        ),
+        config=(
+            "K_AXES", "N_CLUSTERS", "CAH_MAX_CLUSTERS", "N_MICRO_CLUSTERS", "DENDRO_LEAVES",
+            "OVER_REP_THRESHOLD", "UNDER_REP_THRESHOLD", "RANDOM_STATE", "KMEANS_BACKEND",
+        ),
+        code=("src/clustering.py",),
+    ),
+    Stage(
+        "05_discriminant",
+        inputs=PROCESSED_DATA + MCA_COORDS + (CV_FOLDS_FILE,),
+        outputs=(
+            f"{TABLES}/da_metrics.csv",
+            f"{TABLES}/da_confusion.csv",
+            f"{FIGURES}/da_confusion.png",
+            f"{FIGURES}/da_cv_scores.png",
+            f"{FIGURES}/da_confusion_cv.png",
+            f"{MODELS_DIR}/lda.joblib",
+        ),
+        config=("K_AXES", "TARGET_NAMES"),
+        code=("src/validation.py",),
+    ),
+    Stage(
+        "06_sensitivity",
+        inputs=PROCESSED_DATA + MCA_COORDS + (CV_FOLDS_FILE, f"{TABLES}/mca_eigenvalues.csv"),
+        outputs=(
+            f"{TABLES}/sensitivity_k.csv",
+            f"{TABLES}/sensitivity_grid.csv",
+            f"{PROCESSED}/sensitivity_sweep.jsonl",
+            f"{FIGURES}/sensitivity_k_analysis.png",
+            f"{FIGURES}/sensitivity_inertia_vs_accuracy.png",
+        ),
+        config=(
+            "K_VALUES", "N_CLUSTERS", "RANDOM_STATE", "KMEANS_BACKEND", "SILHOUETTE_MODE",
+            "CLUSTER_VALUES", "SEEDS", "LDA_REPEATS",
+        ),
+        code=("src/clustering.py", "src/validation.py"),
+    ),
+    Stage(
+        "07_model_comparison",
+        inputs=PROCESSED_DATA + MCA_COORDS + (CV_FOLDS_FILE,),
+        outputs=(
+            f"{TABLES}/model_comparison.csv",
+            f"{FIGURES}/model_comparison.png",
+            f"{FIGURES}/model_comparison_boxplot.png",
+            f"{MODELS_DIR}/comparison_lda.joblib",
+            f"{MODELS_DIR}/comparison_logistic_regression.joblib",
+            f"{MODELS_DIR}/comparison_random_forest.joblib",
+            f"{MODELS_DIR}/comparison_svm_rbf.joblib",
+        ),
+        config=("K_AXES", "RANDOM_STATE", "MODELS"),
+        code=("src/validation.py",),
+    ),
+    Stage(
+        "08_dashboard",
+        inputs=PROCESSED_DATA + MCA_COORDS + (CV_FOLDS_FILE,),
+        outputs=(
+            f"{DASHBOARD}/clustering_grid.npz",
+            f"{DASHBOARD}/clustering_labels.npy",
+            f"{DASHBOARD}/classification_grid.npz",
+            f"{DASHBOARD}/density_tiles.npz",
+        ),
+        config=(
+            "K_VALUES", "CLUSTER_VALUES", "RANDOM_STATE", "KMEANS_BACKEND", "SILHOUETTE_MODE",
+            "TILE_LEVELS",
+        ),
+        code=("src/clustering.py", "src/precomputed.py", "src/validation.py"),
+    ),
+]
+
+
+# ── Empreintes ─────────────────────────────────────────────
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileHasher:
+    """Hache des fichiers en réutilisant l'empreinte si (taille, mtime) est inchangé."""
+
+    def __init__(self, cache: dict[str, list]):
+        self.cache = cache
+
+    def digest(self, rel_path: str) -> str | None:
+        path = PROJECT_ROOT / rel_path
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self.cache.pop(rel_path, None)
+            return None
+        key = [st.st_size, st.st_mtime_ns]
+        cached = self.cache.get(rel_path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        self.cache[rel_path] = key + [digest]
+        return digest
+
+
+def config_digests(stage: Stage) -> dict[str, str]:
+    """Empreinte du code source de chaque constante déclarée dans ``stage.config``.
+
+    Le script n'est pas importé : les affectations de premier niveau sont
+    lues par analyse syntaxique, ce qui évite de charger pandas/sklearn.
+    """
+    source = (PROJECT_ROOT / stage.script).read_text(encoding="utf-8")
+    segments = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in stage.config:
+                    segments[target.id] = ast.get_source_segment(source, node.value)
+    missing = set(stage.config) - set(segments)
+    if missing:
+        raise KeyError(f"{stage.name} : constantes introuvables {sorted(missing)}")
+    return {f"config:{name}": _sha256(segments[name].encode()) for name in stage.config}
+
+
+def input_digests(stage: Stage, hasher: FileHasher) -> dict[str, str | None]:
+    """Empreintes de toutes les entrées d'une étape (données, config, code)."""
+    digests: dict[str, str | None] = {}
+    for rel in (stage.script, *SHARED_CODE, *stage.code):
+        digests[f"code:{rel}"] = hasher.digest(rel)
+    for rel in stage.inputs:
+        digests[f"file:{rel}"] = hasher.digest(rel)
+    digests.update(config_digests(stage))
+    return digests
+
+
+# ── État ───────────────────────────────────────────────────
+
+def load_state() -> dict:
+    if STATE_FILE.exists():
+        try:
+            return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            pass
+    return {"stages": {}, "files": {}}
+
+
+def save_state(state: dict) -> None:
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(STATE_FILE)
+
+
+def stale_reasons(stage: Stage, state: dict, hasher: FileHasher, figures: str = FIGURE_MODE) -> list[str]:
+    """Liste les raisons pour lesquelles une étape doit être ré-exécutée.
+
+    Une étape dont les figures ont été produites dans un mode inférieur à
+    ``figures`` est obsolète.
+
+    Returns
+    -------
+    list of str
+        Vide si l'étape est à jour.
+    """
+    record = state["stages"].get(stage.name)
+    if record is None:
+        return ["jamais exécutée"]
+
+    reasons = []
+    current = input_digests(stage, hasher)
+    previous = record.get("inputs", {})
+    for key in sorted(set(current) | set(previous)):
+        if current.get(key) != previous.get(key):
+            reasons.append(f"{key} modifié")
+
+    previous_figures = record.get("figures", FIGURE_MODE)
+    if stage.figures and FIGURE_MODES.index(figures) > FIGURE_MODES.index(previous_figures):
+        reasons.append(f"figures {previous_figures} -> {figures}")
+
+    for rel in stage.expected_outputs(figures):
+        digest = hasher.digest(rel)
+        if digest is None:
+            reasons.append(f"sortie manquante : {rel}")
+        elif digest != record.get("outputs", {}).get(rel):
+            reasons.append(f"sortie modifiée : {rel}")
+    return reasons
+
+
+# ── Ordonnancement ─────────────────────────────────────────
+
+def dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    """Graphe des dépendances : une étape dépend de celles qui produisent ses entrées.
+
+    Seules les étapes de ``stages`` sont prises en compte ; les entrées
+    produites par une étape non sélectionnée sont considérées disponibles.
+    """
+    names = {s.name for s in stages}
+    producers = {out: s.name for s in STAGES for out in s.outputs}
+    return {
+        s.name: {
+            producers[rel] for rel in s.inputs
+            if producers.get(rel) in names and producers[rel] != s.name
+        }
+        for s in stages
+    }
+
+
+def _child_env(cpus: int) -> dict[str, str]:
+    """Environnement d'une étape disposant de ``cpus`` CPU (budget et threads BLAS)."""
+    env = dict(os.environ)
+    env[CPU_BUDGET_VAR] = str(cpus)
+    for var in BLAS_THREAD_VARS:
+        env.setdefault(var, str(cpus))
+    return env
+
+
+def _launch(stage: Stage, env: dict[str, str], args: tuple[str, ...] = ()) -> tuple[subprocess.Popen, IO[str]]:
+    """Démarre le script d'une étape, sortie redirigée vers ``.pipeline/logs/<étape>.log``."""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log = open(LOG_DIR / f"{stage.name}.log", "w", encoding="utf-8")
+    proc = subprocess.Popen(
+        [sys.executable, "-u", str(PROJECT_ROOT / stage.script), *args],
+        cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return proc, log
+
+
+def _print_log_tail(name: str, n_lines: int = 20) -> None:
+    lines = (LOG_DIR / f"{name}.log").read_text(encoding="utf-8", errors="replace").splitlines()
+    for line in lines[-n_lines:]:
+        print(f"    | {line}")
+
+
+def _describe(reasons: list[str]) -> str:
+    text = "; ".join(reasons[:3])
+    if len(reasons) > 3:
+        text += f" (+{len(reasons) - 3})"
+    return text
+
+
+def run_pipeline(
+    selected: list[str] | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    cpus: int = DEFAULT_CPUS,
+    stage_args: tuple[str, ...] = (),
+    figures: str = FIGURE_MODE,
+) -> int:
+    """Exécute les étapes obsolètes en parallèle, dans l'ordre du graphe de dépendances.
+
+    Une étape démarre dès que toutes ses dépendances sont terminées, dans
+    la limite de ``jobs`` processus simultanés. Au premier échec, aucune
+    nouvelle étape n'est lancée et les étapes en cours sont interrompues ;
+    leur état n'est pas enregistré, elles seront donc relancées au
+    prochain appel.
+
+    Parameters
+    ----------
+    selected : list of str, optional
+        Étapes à considérer (défaut : toutes).
+    force : bool
+        Ré-exécuter les étapes sélectionnées même si elles sont à jour.
+    dry_run : bool
+        Afficher l'état sans rien exécuter ; les dépendants d'une étape
+        obsolète sont signalés obsolètes.
+    jobs : int
+        Nombre maximal d'étapes exécutées simultanément.
+    cpus : int
+        Budget CPU total, partagé à parts égales entre les étapes en
+        cours au lancement de chacune.
+    stage_args : tuple of str
+        Arguments transmis à chaque script (ex. ``("--profile",)``).
+    figures : str
+        Mode de figures (``FIGURE_MODES``), transmis aux étapes qui en
+        produisent.
+
+    Returns
+    -------
+    int
+        Code de sortie (0 si succès).
+    """
+    stages = {s.name: s for s in STAGES if selected is None or s.name in selected}
+    deps = dependencies(list(stages.values()))
+    state = load_state()
+    hasher = FileHasher(state["files"])
+
+    print("=" * 60)
+    print(f"  Pipeline incrémental ({jobs} worker{'s' if jobs > 1 else ''}, {cpus} CPU)")
+    print("=" * 60)
+    print()
+
+    start = time.perf_counter()
+    pending = list(stages)
+    done: set[str] = set()
+    stale: set[str] = set()
+    running: dict[str, tuple[subprocess.Popen, IO[str], float]] = {}
+    n_run = 0
+    failed = None
+
+    while pending or running:
+        # Lancer les étapes prêtes
+        ready = []
+        for name in [n for n in pending if deps[n] <= done]:
+            if failed or len(running) + len(ready) >= jobs:
+                break
+            pending.remove(name)
+            stage = stages[name]
+            reasons = ["--force"] if force else stale_reasons(stage, state, hasher, figures)
+            if dry_run:
+                # Rien n'est exécuté : les dépendants d'une étape obsolète le sont aussi
+                reasons += [f"{dep} obsolète" for dep in sorted(deps[name] & stale)]
+            if not reasons:
+                print(f"  [skip] {name} (à jour)")
+                done.add(name)
+                continue
+            if dry_run:
+                print(f"  [run]  {name} — {_describe(reasons)}", flush=True)
+                stale.add(name)
+                done.add(name)
+                continue
+            ready.append((stage, reasons))
+        # Budget partagé entre les étapes en cours et celles qui démarrent
+        share = max(1, cpus // (len(running) + len(ready))) if ready else cpus
+        for stage, reasons in ready:
+            print(f"  [run]  {stage.name} — {_describe(reasons)} ({share} CPU)", flush=True)
+            args = stage_args + (("--figures", figures) if stage.figures else ())
+            running[stage.name] = (*_launch(stage, _child_env(share), args), time.perf_counter())
+
+        if failed and not running:
+            break
+        if not running:
+            if pending and not any(deps[n] <= done for n in pending):
+                raise RuntimeError(f"Dépendances cycliques : {pending}")
+            continue
+
+        # Attendre la fin d'une étape
+        time.sleep(POLL_INTERVAL)
+        for name, (proc, log, t0) in list(running.items()):
+            code = proc.poll()
+            if code is None:
+                continue
+            log.close()
+            del running[name]
+            duration = time.perf_counter() - t0
+
+            if failed:
+                print(f"  [stop] {name} (interrompue)")
+                continue
+            if code != 0:
+                failed = name
+                print(f"  [fail] {name} (code {code}, {duration:.1f} s) — .pipeline/logs/{name}.log")
+                _print_log_tail(name)
+                for other_proc, _, _ in running.values():
+                    other_proc.terminate()
+                continue
+
+            state["stages"][name] = {
+                "inputs": input_digests(stages[name], hasher),
+                "outputs": {rel: hasher.digest(rel) for rel in stages[name].expected_outputs(figures)},
+                "duration_s": round(duration, 2),
+            }
+            if stages[name].figures:
+                state["stages"][name]["figures"] = figures
+            save_state(state)
+            done.add(name)
+            n_run += 1
+            print(f"  [done] {name} ({duration:.1f} s)", flush=True)
+
+    if not dry_run:
+        save_state(state)
+    print()
+    if failed:
+        print(f"  Échec de {failed} — pipeline interrompu après {time.perf_counter() - start:.2f} s")
+        print()
+        return 1
+    if dry_run:
+        print(f"  {len(stale)} étape(s) à exécuter, {len(stages) - len(stale)} à jour")
+    else:
+        print(f"  {n_run} étape(s) exécutée(s), {len(stages) - n_run} à jour "
+              f"— {time.perf_counter() - start:.2f} s")
+    print()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    names = [s.name for s in STAGES]
+    parser = argparse.ArgumentParser(description="Pipeline incrémental (hachage des entrées).")
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help=f"Étapes à exécuter parmi {', '.join(names)} (défaut : toutes)")
+    parser.add_argument("--force", action="store_true",
+                        help="Ré-exécuter les étapes même si elles sont à jour")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Afficher les étapes obsolètes sans les exécuter")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Étapes exécutées simultanément (défaut : {DEFAULT_JOBS})")
+    parser.add_argument("--cpus", type=int, default=DEFAULT_CPUS,
+                        help=f"Budget CPU partagé entre les étapes en cours (défaut : {DEFAULT_CPUS})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profiler chaque étape exécutée (reports/perf/<run>.json)")
+    parser.add_argument("--profile-flame", action="store_true",
+                        help="Avec --profile : échantillonner aussi les piles (flamegraph)")
+    parser.add_argument("--figures", choices=FIGURE_MODES, default=FIGURE_MODE,
+                        help="Figures des étapes : off (aucune), fast (basse résolution) ou full "
+                             f"(défaut : {FIGURE_MODE})")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.stages) - set(names))
+    if unknown:
+        parser.error(f"étapes inconnues : {', '.join(unknown)}")
+    if args.jobs < 1:
+        parser.error("--jobs doit être >= 1")
+    if args.cpus < 1:
+        parser.error("--cpus doit être >= 1")
+    stage_args = tuple(flag for flag, on in (("--profile", args.profile or args.profile_flame),
+                                             ("--profile-flame", args.profile_flame)) if on)
+    return run_pipeline(
+        args.stages or None, force=args.force, dry_run=args.dry_run, jobs=args.jobs, cpus=args.cpus,
+        stage_args=stage_args, figures=args.figures,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
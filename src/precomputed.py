@@ -0,0 +1,786 @@
+"""
+Pré-calculs du dashboard — The Mushroom Project.
+
+Artefacts produits par ``08_dashboard.py`` dans ``data/processed/dashboard/``
+et lus par ``app.py``, qui n'a plus à relancer les calculs à chaque
+interaction.
+
+Grille de clustering (:class:`ClusteringGrid`) : pour chaque combinaison
+(nombre d'axes ACM, nombre de clusters) des curseurs de la page
+Clustering, la partition K-Means, son inertie, sa silhouette et les
+effectifs cluster x classe, dont se déduisent le tableau croisé et les
+puretés. Les étiquettes (``uint8``, une ligne par combinaison) sont dans
+``clustering_labels.npy``, projeté en mémoire ; le reste, quelques Ko, dans
+``clustering_grid.npz``. Les combinaisons lues sont gardées dans un cache
+LRU (:meth:`ClusteringGrid.cell`).
+
+Grille de classification (:class:`ClassificationGrid`) : pour chaque nombre
+d'axes de la page Classification, les scores de la LDA sur les plis
+persistés, l'accuracy d'entraînement, la matrice de confusion et le
+rapport de classification hors pli (``classification_grid.npz``).
+
+Tuiles de densité (:class:`DensityTiles`) : pour chacun des 45 couples
+d'axes ACM, histogrammes 2-D du nuage à plusieurs niveaux de zoom
+(``TILE_LEVELS`` cases par axe), ventilés par classe et par modalité de
+chaque variable. Seules les cases occupées sont stockées (case, code,
+effectif), les numéros de case en écarts successifs et les entiers au
+plus petit type suffisant, dans ``density_tiles.npz`` compressé. Le
+dashboard y lit le nuage agrégé sans parcourir les individus.
+
+Chaque grille porte l'empreinte (SHA-256) des données dont elle est issue
+(:func:`inputs_digest`) : une grille dont les données ont changé depuis est
+périmée. Le dashboard indexe ses caches sur l'empreinte des fichiers de la
+grille (:func:`files_digest`), ce qui les invalide à chaque régénération ;
+les combinaisons absentes sont calculées à la demande, une seule fois pour
+toutes les sessions (:class:`BackgroundTasks`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+# ── Configuration ──────────────────────────────────────────
+
+DASHBOARD_DIR = Path("data") / "processed" / "dashboard"
+# Données lues par le dashboard et par 08_dashboard.py
+INPUT_FILES = (
+    Path("data") / "processed" / "mushroom_processed.arrow",
+    Path("data") / "processed" / "mca_coords.npy",
+    Path("data") / "processed" / "cv_folds.npz",
+)
+GRID_VERSION = 2
+CELL_CACHE_SIZE = 128          # combinaisons conservées par le cache LRU
+BACKGROUND_WORKERS = 1         # calculs à la demande simultanés
+BACKGROUND_RESULTS = 256       # résultats à la demande conservés
+TILE_LEVELS = (128, 256, 512)  # cases par axe de chaque niveau de zoom
+TILE_MAX_FILL = 0.5            # niveau plus fin tant que les entrées du précédent < fraction des individus
+VIEW_BINS = 120                # cases au moins sur la largeur de la vue (sinon niveau plus fin)
+CLASS_NAMES = ("Comestible", "Vénéneux")   # codes 0 (e) et 1 (p)
+TARGET_NAMES = ("Vénéneux", "Comestible")  # cible LDA 0 (p) et 1 (e)
+MISSING_NAME = "Manquant"
+
+
+def class_codes(target: pd.Series) -> np.ndarray:
+    """Code ``int8`` de la classe de chaque individu (0 = comestible, 1 = vénéneux)."""
+    return (target.astype(str).to_numpy() == "p").astype(np.int8)
+
+
+def variable_codes(df: pd.DataFrame, variable: str) -> tuple[np.ndarray, list[str]]:
+    """Code de chaque individu et nom de chaque code pour une variable du dataset.
+
+    ``class`` : :func:`class_codes` et ``CLASS_NAMES`` ; autres variables :
+    codes des modalités, les valeurs manquantes ayant le dernier code
+    (``MISSING_NAME``).
+    """
+    if variable == "class":
+        return class_codes(df["class"]), list(CLASS_NAMES)
+    values = pd.Categorical(df[variable])
+    codes = np.where(values.codes < 0, len(values.categories), values.codes).astype(np.int16)
+    return codes, [str(c) for c in values.categories] + [MISSING_NAME]
+
+
+# ── Empreintes ─────────────────────────────────────────────
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def files_digest(paths: Iterable[str | Path]) -> str:
+    """Empreinte SHA-256 d'un ensemble de fichiers (absents compris).
+
+    Le contenu n'est relu que si la taille ou la date d'un fichier a changé.
+    """
+    digests = []
+    for path in paths:
+        try:
+            st = Path(path).stat()
+        except FileNotFoundError:
+            digests.append(None)
+            continue
+        digests.append(_file_digest(str(path), st.st_size, st.st_mtime_ns))
+    return hashlib.sha256(json.dumps(digests).encode()).hexdigest()
+
+
+def inputs_digest(root: str | Path) -> str:
+    """Empreinte des données d'entrée des grilles (``INPUT_FILES``)."""
+    return files_digest(Path(root) / path for path in INPUT_FILES)
+
+
+def _open_grid(path: Path, n_rows: int | None, inputs: str | None) -> dict:
+    """Lit un ``.npz`` de grille et vérifie version, taille et empreinte des données."""
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Grille introuvable : {path}\n"
+            "Exécuter d'abord : python src/08_dashboard.py"
+        )
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    version = int(arrays.pop("version"))
+    if version != GRID_VERSION:
+        raise ValueError(
+            f"{path.name} version {version}, attendu {GRID_VERSION} : "
+            "relancer python src/08_dashboard.py"
+        )
+    if n_rows is not None and int(arrays["n_rows"]) != n_rows:
+        raise ValueError(
+            f"{path.name} périmée : {int(arrays['n_rows']):,} individus au lieu de {n_rows:,}\n"
+            "Exécuter d'abord : python src/08_dashboard.py"
+        )
+    if inputs is not None and str(arrays["inputs"]) != inputs:
+        raise ValueError(
+            f"{path.name} périmée : données modifiées depuis le pré-calcul\n"
+            "Exécuter d'abord : python src/08_dashboard.py"
+        )
+    return arrays
+
+
+# ── Clustering ─────────────────────────────────────────────
+
+@dataclass
+class ClusteringCell:
+    """Partition K-Means d'une combinaison (axes, clusters).
+
+    Attributes
+    ----------
+    k_axes, n_clusters : int
+        Combinaison.
+    labels : np.ndarray
+        Cluster de chaque individu (``uint8``).
+    inertia : float
+        Inertie intra-clusters.
+    silhouette, silhouette_ci_low, silhouette_ci_high : float
+        Silhouette moyenne et intervalle de confiance (mode ``sampled`` ;
+        égal au score sinon).
+    silhouette_mode : str
+        Mode de silhouette utilisé (voir ``clustering.silhouette``).
+    class_counts : np.ndarray
+        Effectifs cluster x classe (``n_clusters`` x 2, ordre de ``CLASS_NAMES``).
+    """
+
+    k_axes: int
+    n_clusters: int
+    labels: np.ndarray
+    inertia: float
+    silhouette: float
+    silhouette_mode: str
+    silhouette_ci_low: float
+    silhouette_ci_high: float
+    class_counts: np.ndarray
+
+    def crosstab(self) -> pd.DataFrame:
+        """Tableau croisé cluster x classe avec marges (``pd.crosstab(..., margins=True)``)."""
+        table = pd.DataFrame(
+            self.class_counts,
+            index=pd.Index(range(self.n_clusters), name="Cluster"),
+            columns=pd.Index(CLASS_NAMES, name="class"),
+        )
+        table["All"] = table.sum(axis=1)
+        table.loc["All"] = table.sum(axis=0)
+        return table
+
+    def purity(self) -> pd.DataFrame:
+        """Taille, effectifs par classe, classe dominante et pureté (%) de chaque cluster."""
+        n_e, n_p = self.class_counts[:, 0], self.class_counts[:, 1]
+        size = n_e + n_p
+        return pd.DataFrame({
+            "Cluster": np.arange(self.n_clusters),
+            "Taille": size,
+            "Comestibles": n_e,
+            "Vénéneux": n_p,
+            "Dominant": np.where(n_e > n_p, CLASS_NAMES[0], CLASS_NAMES[1]),
+            "Pureté (%)": np.round(np.maximum(n_e, n_p) / np.maximum(size, 1) * 100, 1),
+        })
+
+
+def compute_cell(
+    X: np.ndarray,
+    classes: np.ndarray,
+    k_axes: int,
+    n_clusters: int,
+    backend: str = "auto",
+    silhouette_mode: str = "auto",
+    random_state: int | None = None,
+    n_jobs: int | None = None,
+) -> ClusteringCell:
+    """K-Means et silhouette d'une combinaison (hors ligne ou à la volée).
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées ACM (n x d, éventuellement projetées en mémoire).
+    classes : np.ndarray
+        Code de classe de chaque individu (:func:`class_codes`).
+    k_axes : int
+        Nombre de premiers axes utilisés.
+    n_clusters : int
+        Nombre de clusters (au plus 255).
+    backend : str
+        Moteur K-Means (voir ``clustering.KMEANS_BACKENDS``).
+    silhouette_mode : str
+        Mode de silhouette (voir ``clustering.SILHOUETTE_MODES``).
+    random_state : int, optional
+        Graine (K-Means et silhouette).
+    n_jobs : int, optional
+        Threads du K-Means (voir ``clustering.fit_kmeans``).
+
+    Returns
+    -------
+    ClusteringCell
+    """
+    from clustering import fit_kmeans, silhouette
+
+    kmeans = fit_kmeans(
+        X, n_clusters, k_axes=k_axes, backend=backend, random_state=random_state, n_jobs=n_jobs,
+    )
+    sil = silhouette(X, kmeans.labels, k_axes=k_axes, mode=silhouette_mode, random_state=random_state)
+    labels = kmeans.labels.astype(np.uint8)
+    counts = np.bincount(labels.astype(np.intp) * 2 + classes, minlength=2 * n_clusters)
+    return ClusteringCell(
+        k_axes, n_clusters, labels, float(kmeans.inertia),
+        float(sil.score), sil.mode, float(sil.ci_low), float(sil.ci_high),
+        counts.reshape(n_clusters, 2),
+    )
+
+
+class ClusteringGrid:
+    """Grille de partitions pré-calculées, indexée par (axes, clusters).
+
+    Parameters
+    ----------
+    k_values, cluster_values : sequence of int
+        Nombres d'axes et de clusters de la grille.
+    labels : np.ndarray
+        Étiquettes ``uint8`` (axes x clusters x individus).
+    metrics : dict of np.ndarray
+        ``inertia``, ``silhouette``, ``silhouette_ci_low``,
+        ``silhouette_ci_high``, ``silhouette_mode`` (axes x clusters) et
+        ``class_counts`` (axes x clusters x max(clusters) x 2).
+    inputs : str
+        Empreinte des données d'entrée (:func:`inputs_digest`).
+    """
+
+    METRICS = ("inertia", "silhouette", "silhouette_ci_low", "silhouette_ci_high", "silhouette_mode")
+    FILES = ("clustering_grid.npz", "clustering_labels.npy")
+
+    def __init__(
+        self, k_values, cluster_values, labels: np.ndarray, metrics: dict[str, np.ndarray],
+        inputs: str = "",
+    ):
+        self.k_values = [int(k) for k in k_values]
+        self.cluster_values = [int(c) for c in cluster_values]
+        self.labels = labels
+        self.metrics = metrics
+        self.inputs = inputs
+        self._k_index = {k: i for i, k in enumerate(self.k_values)}
+        self._cluster_index = {c: j for j, c in enumerate(self.cluster_values)}
+        # Cache propre à l'instance (partagée entre sessions par le dashboard)
+        self.cell = lru_cache(maxsize=CELL_CACHE_SIZE)(self._cell)
+
+    @property
+    def n_rows(self) -> int:
+        return self.labels.shape[2]
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        k_axes, n_clusters = key
+        return k_axes in self._k_index and n_clusters in self._cluster_index
+
+    def _cell(self, k_axes: int, n_clusters: int) -> ClusteringCell:
+        """Combinaison (axes, clusters) ; ``KeyError`` si hors de la grille."""
+        if (k_axes, n_clusters) not in self:
+            raise KeyError(f"Combinaison non pré-calculée : {k_axes} axes, {n_clusters} clusters")
+        i, j = self._k_index[k_axes], self._cluster_index[n_clusters]
+        values = {name: self.metrics[name][i, j] for name in self.METRICS}
+        return ClusteringCell(
+            k_axes, n_clusters, np.array(self.labels[i, j]),
+            float(values["inertia"]), float(values["silhouette"]), str(values["silhouette_mode"]),
+            float(values["silhouette_ci_low"]), float(values["silhouette_ci_high"]),
+            np.array(self.metrics["class_counts"][i, j, :n_clusters]),
+        )
+
+    @classmethod
+    def from_cells(cls, cells: list[ClusteringCell], n_rows: int, inputs: str = "") -> "ClusteringGrid":
+        """Assemble une grille complète à partir de ses combinaisons."""
+        k_values = sorted({cell.k_axes for cell in cells})
+        cluster_values = sorted({cell.n_clusters for cell in cells})
+        shape = (len(k_values), len(cluster_values))
+        labels = np.zeros(shape + (n_rows,), dtype=np.uint8)
+        metrics = {name: np.full(shape, np.nan) for name in cls.METRICS[:-1]}
+        metrics["silhouette_mode"] = np.full(shape, "", dtype="<U16")
+        metrics["class_counts"] = np.zeros(shape + (max(cluster_values), 2), dtype=np.int64)
+        filled = np.zeros(shape, dtype=bool)
+        for cell in cells:
+            i, j = k_values.index(cell.k_axes), cluster_values.index(cell.n_clusters)
+            labels[i, j] = cell.labels
+            for name in cls.METRICS:
+                metrics[name][i, j] = getattr(cell, name)
+            metrics["class_counts"][i, j, :cell.n_clusters] = cell.class_counts
+            filled[i, j] = True
+        if not filled.all():
+            raise ValueError(f"Grille incomplète : {int((~filled).sum())} combinaisons manquantes")
+        return cls(k_values, cluster_values, labels, metrics, inputs)
+
+    def save(self, directory: str | Path) -> Path:
+        """Enregistre la grille (``clustering_grid.npz`` + ``clustering_labels.npy``)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "clustering_labels.npy", np.ascontiguousarray(self.labels))
+        path = directory / "clustering_grid.npz"
+        np.savez(
+            path,
+            version=np.int64(GRID_VERSION),
+            inputs=np.array(self.inputs),
+            n_rows=np.int64(self.n_rows),
+            k_values=np.array(self.k_values),
+            cluster_values=np.array(self.cluster_values),
+            **self.metrics,
+        )
+        return path
+
+    @classmethod
+    def load(cls, directory: str | Path, n_rows: int | None = None, inputs: str | None = None) -> "ClusteringGrid":
+        """Charge une grille enregistrée par :meth:`save` (étiquettes projetées en mémoire).
+
+        Raises
+        ------
+        FileNotFoundError
+            Si la grille n'existe pas (exécuter ``08_dashboard.py`` d'abord).
+        ValueError
+            Si la version, le nombre d'individus ou l'empreinte des données
+            (``inputs``) ne correspond pas.
+        """
+        directory = Path(directory)
+        arrays = _open_grid(directory / "clustering_grid.npz", n_rows, inputs)
+        metrics = {name: arrays[name] for name in cls.METRICS + ("class_counts",)}
+        return cls(
+            arrays["k_values"], arrays["cluster_values"],
+            np.load(directory / "clustering_labels.npy", mmap_mode="r"), metrics, str(arrays["inputs"]),
+        )
+
+
+# ── Classification ─────────────────────────────────────────
+
+@dataclass
+class ClassificationCell:
+    """Validation croisée de la LDA sur les ``k_axes`` premiers axes.
+
+    Attributes
+    ----------
+    k_axes : int
+        Nombre d'axes ACM.
+    fold_scores : np.ndarray
+        Accuracy de chaque pli persisté.
+    train_accuracy : float
+        Accuracy d'entraînement sur tout le jeu.
+    confusion : np.ndarray
+        Matrice de confusion hors pli (2 x 2, ordre de ``TARGET_NAMES``).
+    report : pd.DataFrame
+        Rapport de classification hors pli
+        (``pd.DataFrame(classification_report(..., output_dict=True)).T``).
+    """
+
+    k_axes: int
+    fold_scores: np.ndarray
+    train_accuracy: float
+    confusion: np.ndarray
+    report: pd.DataFrame
+
+
+def compute_classification(
+    X: np.ndarray, y: np.ndarray, folds: np.ndarray, k_values: list[int],
+) -> list[ClassificationCell]:
+    """LDA en forme close pour plusieurs nombres d'axes (``validation.lda_sweep``).
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées ACM (n x d).
+    y : np.ndarray
+        Cible (1 = comestible, 0 = vénéneux).
+    folds : np.ndarray
+        Plis persistés.
+    k_values : list of int
+        Nombres d'axes.
+
+    Returns
+    -------
+    list of ClassificationCell
+    """
+    from sklearn.metrics import classification_report, confusion_matrix
+    from validation import lda_sweep
+
+    lda = lda_sweep(X, y, folds, k_values)
+    cells = []
+    for j, k in enumerate(k_values):
+        report = classification_report(y, lda.y_pred[j], target_names=list(TARGET_NAMES), output_dict=True)
+        cells.append(ClassificationCell(
+            k, lda.scores[0, :, j].copy(), float(lda.train_accuracy[j]),
+            confusion_matrix(y, lda.y_pred[j], labels=[0, 1]), pd.DataFrame(report).T,
+        ))
+    return cells
+
+
+class ClassificationGrid:
+    """Résultats de validation croisée pré-calculés, indexés par nombre d'axes.
+
+    Parameters
+    ----------
+    cells : list of ClassificationCell
+        Un résultat par nombre d'axes.
+    n_rows : int
+        Nombre d'individus.
+    inputs : str
+        Empreinte des données d'entrée (:func:`inputs_digest`).
+    """
+
+    FILES = ("classification_grid.npz",)
+
+    def __init__(self, cells: list[ClassificationCell], n_rows: int, inputs: str = ""):
+        self.cells = {cell.k_axes: cell for cell in cells}
+        self.n_rows = n_rows
+        self.inputs = inputs
+
+    @property
+    def k_values(self) -> list[int]:
+        return sorted(self.cells)
+
+    def __contains__(self, k_axes: int) -> bool:
+        return k_axes in self.cells
+
+    def cell(self, k_axes: int) -> ClassificationCell:
+        """Résultat pour ``k_axes`` axes ; ``KeyError`` si hors de la grille."""
+        if k_axes not in self.cells:
+            raise KeyError(f"Nombre d'axes non pré-calculé : {k_axes}")
+        return self.cells[k_axes]
+
+    def save(self, directory: str | Path) -> Path:
+        """Enregistre la grille (``classification_grid.npz``)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        cells = [self.cells[k] for k in self.k_values]
+        path = directory / "classification_grid.npz"
+        np.savez(
+            path,
+            version=np.int64(GRID_VERSION),
+            inputs=np.array(self.inputs),
+            n_rows=np.int64(self.n_rows),
+            k_values=np.array(self.k_values),
+            fold_scores=np.stack([cell.fold_scores for cell in cells]),
+            train_accuracy=np.array([cell.train_accuracy for cell in cells]),
+            confusion=np.stack([cell.confusion for cell in cells]),
+            report=np.stack([cell.report.to_numpy(dtype=np.float64) for cell in cells]),
+            report_index=np.array(cells[0].report.index.tolist()),
+            report_columns=np.array(cells[0].report.columns.tolist()),
+        )
+        return path
+
+    @classmethod
+    def load(cls, directory: str | Path, n_rows: int | None = None, inputs: str | None = None) -> "ClassificationGrid":
+        """Charge une grille enregistrée par :meth:`save`.
+
+        Raises
+        ------
+        FileNotFoundError
+            Si la grille n'existe pas (exécuter ``08_dashboard.py`` d'abord).
+        ValueError
+            Si la version, le nombre d'individus ou l'empreinte des données
+            (``inputs``) ne correspond pas.
+        """
+        arrays = _open_grid(Path(directory) / "classification_grid.npz", n_rows, inputs)
+        index, columns = arrays["report_index"].tolist(), arrays["report_columns"].tolist()
+        cells = [
+            ClassificationCell(
+                int(k), arrays["fold_scores"][j], float(arrays["train_accuracy"][j]),
+                arrays["confusion"][j], pd.DataFrame(arrays["report"][j], index=index, columns=columns),
+            )
+            for j, k in enumerate(arrays["k_values"])
+        ]
+        return cls(cells, int(arrays["n_rows"]), str(arrays["inputs"]))
+
+
+# ── Calculs à la demande ───────────────────────────────────
+
+class BackgroundTasks:
+    """Calculs à la demande, partagés entre les sessions du dashboard.
+
+    Un calcul par clé : les sessions qui demandent la même combinaison
+    attendent le même résultat, calculé une seule fois dans un pool de fils
+    dédié. Un calcul en échec est relancé à la demande suivante ; au-delà de
+    ``max_results`` résultats, les plus anciens sont oubliés.
+
+    Parameters
+    ----------
+    workers : int
+        Calculs simultanés.
+    max_results : int
+        Résultats conservés.
+    """
+
+    def __init__(self, workers: int = BACKGROUND_WORKERS, max_results: int = BACKGROUND_RESULTS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dashboard")
+        self._futures: OrderedDict[Hashable, Future] = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_results = max_results
+
+    def submit(self, key: Hashable, fn: Callable, *args, **kwargs) -> Future:
+        """Résultat (futur) du calcul ``fn(*args, **kwargs)`` identifié par ``key``."""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._pool.submit(fn, *args, **kwargs)
+                self._futures[key] = future
+            self._futures.move_to_end(key)
+            while len(self._futures) > self.max_results:
+                oldest = next(iter(self._futures))
+                if not self._futures[oldest].done():
+                    break
+                del self._futures[oldest]
+            return future
+
+
+# ── Tuiles de densité ──────────────────────────────────────
+
+def _bin_index(values: np.ndarray, low: float, high: float, bins: int) -> np.ndarray:
+    scale = bins / (high - low) if high > low else 0.0
+    return np.clip(((values - low) * scale).astype(np.intp), 0, bins - 1)
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """Entiers positifs au plus petit type non signé suffisant."""
+    return values.astype(np.min_scalar_type(int(values.max()) if len(values) else 0))
+
+
+class DensityTiles:
+    """Histogrammes 2-D pré-calculés du nuage ACM, par couple d'axes et niveau de zoom.
+
+    Pour le couple (i, j), i < j, et le niveau ``l``, les cases (``B`` x ``B``,
+    ``B = levels[l]``, sur l'étendue de chaque axe) sont numérotées
+    ``iy * B + ix`` ; chaque variable (``class`` comprise) y est décrite par
+    les triplets (case, code, effectif) de ses cases occupées, par case
+    croissante. Les niveaux sont calculés du plus grossier au plus fin tant
+    qu'ils agrègent (``TILE_MAX_FILL``) : au-delà, les individus eux-mêmes
+    sont moins coûteux à stocker et à dessiner.
+
+    Parameters
+    ----------
+    variables : list of str
+        Variables ventilées, ``class`` en tête.
+    names : list of list of str
+        Nom de chaque code, par variable (cf. :func:`variable_codes`).
+    extent : np.ndarray
+        Étendue (min, max) de chaque axe (d x 2).
+    levels : sequence of int
+        Cases par axe de chaque niveau.
+    n_levels : dict
+        Niveaux conservés par couple ``(i, j)``.
+    arrays : mapping
+        Tableaux ``p{i}_{j}_l{l}_{bins,codes,counts,offsets}`` (``bins`` :
+        écarts entre cases successives de chaque variable).
+    n_rows : int
+        Nombre d'individus.
+    inputs : str
+        Empreinte des données d'entrée (:func:`inputs_digest`).
+    """
+
+    FILES = ("density_tiles.npz",)
+
+    def __init__(self, variables, names, extent, levels, n_levels, arrays, n_rows: int, inputs: str = ""):
+        self.variables = list(variables)
+        self.names = {var: list(n) for var, n in zip(self.variables, names)}
+        self.extent = np.asarray(extent, dtype=np.float64)
+        self.levels = [int(b) for b in levels]
+        self.n_levels = n_levels
+        self.n_rows = n_rows
+        self.inputs = inputs
+        self._arrays = arrays
+        self._lock = threading.Lock()
+        self._tile = lru_cache(maxsize=CELL_CACHE_SIZE)(self._read_tile)
+
+    @classmethod
+    def build(
+        cls, X: np.ndarray, df: pd.DataFrame, n_axes: int | None = None,
+        levels: tuple[int, ...] = TILE_LEVELS, max_fill: float = TILE_MAX_FILL, inputs: str = "",
+    ) -> "DensityTiles":
+        """Calcule les tuiles de tous les couples d'axes.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Coordonnées ACM (n x d, éventuellement projetées en mémoire).
+        df : pd.DataFrame
+            Dataset (``class`` et variables catégorielles).
+        n_axes : int, optional
+            Nombre de premiers axes (défaut : tous).
+        levels : tuple of int
+            Cases par axe de chaque niveau, croissantes.
+        max_fill : float
+            Un niveau plus fin n'est calculé que si le précédent compte
+            moins de ``max_fill`` x n entrées (toutes variables).
+        inputs : str
+            Empreinte des données d'entrée, enregistrée avec les tuiles.
+
+        Returns
+        -------
+        DensityTiles
+        """
+        n_axes = n_axes or X.shape[1]
+        variables = ["class"] + [c for c in df.columns if c != "class"]
+        channels = [variable_codes(df, var) for var in variables]
+        columns = [np.asarray(X[:, a], dtype=np.float64) for a in range(n_axes)]
+        extent = np.array([[col.min(), col.max()] for col in columns])
+        n_rows = len(df)
+        arrays, n_levels = {}, {}
+        for i in range(n_axes):
+            for j in range(i + 1, n_axes):
+                for l, bins in enumerate(levels):
+                    flat = (_bin_index(columns[j], *extent[j], bins) * bins
+                            + _bin_index(columns[i], *extent[i], bins))
+                    parts = []
+                    for codes, names in channels:
+                        m = len(names)
+                        counts = np.bincount(flat * m + codes, minlength=bins * bins * m)
+                        occupied = np.flatnonzero(counts)
+                        parts.append((np.diff(occupied // m, prepend=0), occupied % m, counts[occupied]))
+                    prefix = f"p{i}_{j}_l{l}"
+                    for k, name in enumerate(("bins", "codes", "counts")):
+                        arrays[f"{prefix}_{name}"] = _compact(np.concatenate([p[k] for p in parts]))
+                    offsets = np.cumsum([0] + [len(p[0]) for p in parts])
+                    arrays[f"{prefix}_offsets"] = offsets
+                    n_levels[i, j] = l + 1
+                    if offsets[-1] >= max_fill * n_rows:
+                        break
+        return cls(variables, [n for _, n in channels], extent, levels, n_levels, arrays, n_rows, inputs)
+
+    def save(self, directory: str | Path) -> Path:
+        """Enregistre les tuiles (``density_tiles.npz``, compressé)."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        pairs = sorted(self.n_levels)
+        path = directory / "density_tiles.npz"
+        np.savez_compressed(
+            path,
+            version=np.int64(GRID_VERSION),
+            inputs=np.array(self.inputs),
+            n_rows=np.int64(self.n_rows),
+            variables=np.array(self.variables),
+            names=np.array(["\x1f".join(self.names[var]) for var in self.variables]),
+            extent=self.extent,
+            levels=np.array(self.levels),
+            pairs=np.array(pairs, dtype=np.int64).reshape(-1, 2),
+            n_levels=np.array([self.n_levels[p] for p in pairs]),
+            **self._arrays,
+        )
+        return path
+
+    @classmethod
+    def load(cls, directory: str | Path, n_rows: int | None = None, inputs: str | None = None) -> "DensityTiles":
+        """Charge des tuiles enregistrées par :meth:`save` (lues à la demande).
+
+        Raises
+        ------
+        FileNotFoundError
+            Si les tuiles n'existent pas (exécuter ``08_dashboard.py`` d'abord).
+        ValueError
+            Si la version, le nombre d'individus ou l'empreinte des données
+            (``inputs``) ne correspond pas.
+        """
+        path = Path(directory) / "density_tiles.npz"
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Tuiles de densité introuvables : {path}\n"
+                "Exécuter d'abord : python src/08_dashboard.py"
+            )
+        data = np.load(path, allow_pickle=False)
+        header = {name: data[name] for name in ("version", "inputs", "n_rows")}
+        if int(header["version"]) != GRID_VERSION:
+            raise ValueError(
+                f"{path.name} version {int(header['version'])}, attendu {GRID_VERSION} : "
+                "relancer python src/08_dashboard.py"
+            )
+        if n_rows is not None and int(header["n_rows"]) != n_rows:
+            raise ValueError(
+                f"{path.name} périmé : {int(header['n_rows']):,} individus au lieu de {n_rows:,}\n"
+                "Exécuter d'abord : python src/08_dashboard.py"
+            )
+        if inputs is not None and str(header["inputs"]) != inputs:
+            raise ValueError(
+                f"{path.name} périmé : données modifiées depuis le pré-calcul\n"
+                "Exécuter d'abord : python src/08_dashboard.py"
+            )
+        n_levels = {tuple(int(a) for a in p): int(n) for p, n in zip(data["pairs"], data["n_levels"])}
+        return cls(
+            data["variables"].tolist(), [n.split("\x1f") for n in data["names"].tolist()],
+            data["extent"], data["levels"], n_levels, data, int(header["n_rows"]), str(header["inputs"]),
+        )
+
+    def _read_tile(self, i: int, j: int, level: int) -> tuple[np.ndarray, ...]:
+        prefix = f"p{i}_{j}_l{level}"
+        # Archive partagée entre sessions : lectures sérialisées
+        with self._lock:
+            gaps, codes, counts, offsets = (
+                self._arrays[f"{prefix}_{name}"] for name in ("bins", "codes", "counts", "offsets")
+            )
+        bins = np.concatenate([
+            np.cumsum(gaps[start:stop], dtype=np.int64) for start, stop in zip(offsets[:-1], offsets[1:])
+        ])
+        return bins, codes, counts.astype(np.int64), offsets
+
+    def level_for(self, i: int, j: int, x_range=None, y_range=None) -> int | None:
+        """Niveau le plus grossier offrant ``VIEW_BINS`` cases sur la vue (``None`` : trop fin)."""
+        a, b = min(i, j), max(i, j)
+        if a == b or (a, b) not in self.n_levels:
+            return None
+        ranges = (x_range, y_range) if i < j else (y_range, x_range)
+        fraction = max(
+            1.0 if r is None else (r[1] - r[0]) / max(self.extent[axis, 1] - self.extent[axis, 0], 1e-12)
+            for axis, r in zip((a, b), ranges)
+        )
+        for level in range(self.n_levels[a, b]):
+            if self.levels[level] * min(fraction, 1.0) >= VIEW_BINS:
+                return level
+        return None
+
+    def points(self, i: int, j: int, variable: str, x_range=None, y_range=None):
+        """Cases occupées de la vue, axe ``i`` en abscisse et ``j`` en ordonnée.
+
+        Returns
+        -------
+        tuple of np.ndarray or None
+            Centres des cases ``x``, ``y`` (``float32``), code et effectif de
+            chaque (case, code) ; ``None`` si aucun niveau ne convient
+            (axes identiques, zoom au-delà du niveau le plus fin).
+        """
+        level = self.level_for(i, j, x_range, y_range)
+        if level is None:
+            return None
+        a, b = min(i, j), max(i, j)
+        bins, codes, counts, offsets = self._tile(a, b, level)
+        v = self.variables.index(variable)
+        rows = slice(offsets[v], offsets[v + 1])
+        size = self.levels[level]
+        centers = []
+        for axis, index in ((a, bins[rows] % size), (b, bins[rows] // size)):
+            low, high = self.extent[axis]
+            centers.append((low + (index + 0.5) * ((high - low) / size)).astype(np.float32))
+        x, y = centers if i < j else centers[::-1]
+        mask = np.ones(len(x), dtype=bool)
+        for values, r in ((x, x_range), (y, y_range)):
+            if r is not None:
+                mask &= (values >= r[0]) & (values <= r[1])
+        return x[mask], y[mask], codes[rows][mask], counts[rows][mask]
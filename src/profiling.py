@@ -0,0 +1,298 @@
+"""
+Profilage des étapes — The Mushroom Project.
+
+Mode ``--profile`` commun à tous les scripts ``src/0X_*.py`` (et transmis
+par ``pipeline.py --profile``). Chaque ``print_section`` / ``print_step``
+ouvre un intervalle chronométré, qui court jusqu'au message suivant ; pour
+chacun sont consignés :
+
+  - la durée (horloge) et le temps CPU du processus ;
+  - le pic de mémoire résidente de l'intervalle (Linux ; ailleurs, pic du
+    processus depuis son démarrage) ;
+  - le pic des allocations Python / NumPy tracées (``tracemalloc``).
+
+Les allocations les plus lourdes (fichier:ligne) sont relevées à la fin de
+l'intervalle où la mémoire tracée est la plus haute. Avec
+``--profile-flame``, un fil d'échantillonnage relève la pile du fil
+principal toutes les ``FLAME_INTERVAL`` secondes et écrit les piles
+agrégées au format « folded » (``flamegraph.pl``, speedscope).
+
+Le profil est écrit dans ``reports/perf/<run>.json`` (``<run>`` =
+``<étape>-<date>``) et résumé dans un tableau en fin d'exécution. Les
+processus de calcul des étapes 06 et 07 ne sont comptés que dans le temps
+CPU total (à leur fin). ``tracemalloc`` ralentit l'exécution : les durées
+d'un profil se comparent entre elles, pas à une exécution normale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from utils import get_project_root, proc_status_kb, set_profiler
+
+
+# ── Configuration ──────────────────────────────────────────
+
+PROFILE_DIR = "reports/perf"
+TOP_ALLOCATIONS = 15           # allocations relevées (fichier:ligne)
+FLAME_INTERVAL = 0.005         # s entre deux échantillons de pile
+LABEL_WIDTH = 48               # largeur des libellés dans le résumé
+
+# Allocations du chargement des modules, sans intérêt pour le profil d'une étape
+_IGNORED_TRACES = [
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<frozen abc>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+# ── Mesures ────────────────────────────────────────────────
+
+# ``resource`` n'existe pas sous Windows : importé seulement en mode profil,
+# pour que les étapes (qui importent ce module) y restent utilisables.
+
+def _cpu_seconds(children: bool = False) -> float:
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _reset_peak_rss() -> bool:
+    """Remet à zéro le pic de mémoire résidente du processus (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        return proc_status_kb("VmHWM") / 1024
+    except (OSError, KeyError):
+        import resource
+
+        scale = 1 if sys.platform == "darwin" else 1024     # octets sous macOS, Ko ailleurs
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+class FlameSampler(threading.Thread):
+    """Échantillonneur de pile du fil principal (piles agrégées « folded »)."""
+
+    def __init__(self, interval: float = FLAME_INTERVAL):
+        super().__init__(name="flame-sampler", daemon=True)
+        self.interval = interval
+        self.target = threading.main_thread().ident
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def write(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# ── Profileur ──────────────────────────────────────────────
+
+class StageProfiler:
+    """Profil d'une étape, alimenté par ``utils.print_section`` / ``print_step``.
+
+    Parameters
+    ----------
+    stage : str
+        Nom de l'étape (nom du script sans extension).
+    flame : bool
+        Échantillonner aussi les piles (``--profile-flame``).
+    """
+
+    def __init__(self, stage: str, flame: bool = False):
+        self.stage = stage
+        self.run_id = f"{stage}-{time.strftime('%Y%m%d-%H%M%S')}"
+        self.spans: list[dict] = []
+        self.top_allocations: list[dict] = []
+        self._section = None
+        self._current: Optional[dict] = None
+        self._largest_traced = -1
+        self._overhead = 0.0               # relevés tracemalloc, exclus des durées
+        self._sampler = FlameSampler() if flame else None
+
+    # Intervalles
+
+    def _open(self, label: str) -> None:
+        self._close()
+        self._rss_resettable = _reset_peak_rss()
+        tracemalloc.reset_peak()
+        self._current = {
+            "section": self._section, "label": label,
+            "start_s": time.perf_counter() - self._start,
+            "_wall": time.perf_counter(), "_cpu": _cpu_seconds(),
+        }
+
+    def _close(self) -> None:
+        span, self._current = self._current, None
+        if span is None:
+            return
+        span["wall_s"] = time.perf_counter() - span.pop("_wall")
+        span["cpu_s"] = _cpu_seconds() - span.pop("_cpu")
+        span["peak_rss_mb"] = _peak_rss_mb()
+        current, peak = tracemalloc.get_traced_memory()
+        span["traced_peak_mb"] = peak / 2**20
+        if current > self._largest_traced:
+            start = time.perf_counter()
+            self._largest_traced = current
+            self.top_allocations = [
+                {"location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 "size_mb": stat.size / 2**20, "count": stat.count, "span": span["label"]}
+                for stat in tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES).statistics("lineno")[:TOP_ALLOCATIONS]
+            ]
+            self._overhead += time.perf_counter() - start
+        self.spans.append(span)
+
+    def section(self, title: str) -> None:
+        self._section = title
+        self._open(title)
+
+    def step(self, message: str) -> None:
+        self._open(message)
+
+    # Cycle de vie
+
+    def start(self) -> None:
+        tracemalloc.start()
+        self._start = time.perf_counter()
+        self._cpu_start = _cpu_seconds()
+        self._children_start = _cpu_seconds(children=True)
+        if self._sampler:
+            self._sampler.start()
+        set_profiler(self)
+        self._open("(démarrage)")
+
+    def finish(self, status: str = "ok") -> Path:
+        """Clôt le profil, l'écrit dans ``reports/perf/<run>.json`` et affiche le résumé."""
+        wall, cpu = time.perf_counter() - self._start, _cpu_seconds() - self._cpu_start
+        self._close()
+        set_profiler(None)
+        if self._sampler:
+            self._sampler.stop()
+        tracemalloc.stop()
+
+        out_dir = get_project_root() / PROFILE_DIR
+        out_dir.mkdir(parents=True, exist_ok=True)
+        flame_path = None
+        if self._sampler:
+            flame_path = out_dir / f"{self.run_id}.folded"
+            self._sampler.write(flame_path)
+        profile = {
+            "run": self.run_id,
+            "stage": self.stage,
+            "status": status,
+            "argv": sys.argv[1:],
+            "pid": os.getpid(),
+            "wall_s": wall - self._overhead,
+            "cpu_s": cpu - self._overhead,
+            "profiler_overhead_s": self._overhead,
+            "children_cpu_s": _cpu_seconds(children=True) - self._children_start,
+            "peak_rss_mb": max([span["peak_rss_mb"] for span in self.spans], default=_peak_rss_mb()),
+            "peak_rss_per_span": self._rss_resettable,
+            "spans": self.spans,
+            "top_allocations": self.top_allocations,
+            "flame": str(flame_path.relative_to(get_project_root())) if flame_path else None,
+        }
+        path = out_dir / f"{self.run_id}.json"
+        path.write_text(json.dumps(profile, indent=2, ensure_ascii=False), encoding="utf-8")
+        print_summary(profile)
+        print(f"  [perf]   {path.relative_to(get_project_root())}")
+        if flame_path:
+            print(f"  [perf]   {profile['flame']} ({sum(self._sampler.stacks.values()):,} échantillons)")
+        return path
+
+
+def print_summary(profile: dict) -> None:
+    """Tableau récapitulatif d'un profil : intervalles, totaux, allocations principales."""
+    print()
+    print("=" * 60)
+    print(f"  Profil — {profile['stage']} ({profile['status']})")
+    print("=" * 60)
+    print(f"  {'Intervalle':<{LABEL_WIDTH}} {'Durée s':>9} {'CPU s':>9} {'RSS Mo':>8} {'Tracé Mo':>9}")
+    for span in profile["spans"]:
+        label = span["label"] if len(span["label"]) <= LABEL_WIDTH else span["label"][:LABEL_WIDTH - 1] + "…"
+        print(f"  {label:<{LABEL_WIDTH}} {span['wall_s']:>9.3f} {span['cpu_s']:>9.3f} "
+              f"{span['peak_rss_mb']:>8.0f} {span['traced_peak_mb']:>9.1f}")
+    print(f"  {'Total':<{LABEL_WIDTH}} {profile['wall_s']:>9.3f} {profile['cpu_s']:>9.3f} "
+          f"{profile['peak_rss_mb']:>8.0f}")
+    if profile["children_cpu_s"]:
+        print(f"  CPU des sous-processus : {profile['children_cpu_s']:.3f} s")
+    if profile["top_allocations"]:
+        print()
+        print(f"  Allocations principales (fin de « {profile['top_allocations'][0]['span'][:40]} ») :")
+        for alloc in profile["top_allocations"][:5]:
+            location = alloc["location"]
+            if len(location) > 60:
+                location = "…" + location[-59:]
+            print(f"    {alloc['size_mb']:>8.1f} Mo  {alloc['count']:>8,}  {location}")
+
+
+# ── Interface ──────────────────────────────────────────────
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Ajoute ``--profile`` et ``--profile-flame`` à l'analyseur d'un script."""
+    group = parser.add_argument_group("profilage")
+    group.add_argument("--profile", action="store_true",
+                       help=f"Profiler l'exécution (durées, mémoire par étape) -> {PROFILE_DIR}/<run>.json")
+    group.add_argument("--profile-flame", action="store_true",
+                       help="Avec --profile : échantillonner les piles (format folded, flamegraph)")
+
+
+@contextmanager
+def profiled(stage: str, args: argparse.Namespace) -> Iterator[Optional[StageProfiler]]:
+    """Exécute le bloc sous profil si ``args.profile`` (sinon sans effet).
+
+    Le profil est écrit même si le bloc échoue ou est interrompu
+    (``status`` : ``failed`` / ``interrupted``).
+    """
+    if not (getattr(args, "profile", False) or getattr(args, "profile_flame", False)):
+        yield None
+        return
+    if sys.platform == "win32":
+        raise SystemExit("--profile : indisponible sous Windows (module resource)")
+    profiler = StageProfiler(stage, flame=args.profile_flame)
+    profiler.start()
+    status = "ok"
+    try:
+        yield profiler
+    except KeyboardInterrupt:
+        status = "interrupted"
+        raise
+    except BaseException as exc:
+        status = "ok" if isinstance(exc, SystemExit) and not exc.code else "failed"
+        raise
+    finally:
+        profiler.finish(status)
@@ -0,0 +1,210 @@
+"""
+Nuages de points du dashboard — The Mushroom Project.
+
+Rendu WebGL (``go.Scattergl``) des nuages d'individus de ``app.py``, avec
+des coordonnées ``float32`` : Plotly les transmet au navigateur en
+tableaux binaires (base64) au lieu de listes JSON de flottants.
+
+Au-delà de ``MAX_POINTS`` individus dans la vue, le nuage est agrégé côté
+serveur (:func:`decimate`) : la vue est découpée en ``BINS`` x ``BINS``
+cases, et chaque case occupée par une catégorie est dessinée par un seul
+point, placé au barycentre de ses individus. Son opacité est celle de
+``n`` points superposés d'opacité ``a`` (``1 - (1 - a)^n``) : le rendu
+conserve la densité apparente du nuage complet, et les individus isolés
+restent visibles. Une vue restreinte (zoom) est ré-agrégée sur sa propre
+étendue, donc affichée à pleine résolution dès qu'elle contient moins de
+``MAX_POINTS`` individus.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+# ── Configuration ──────────────────────────────────────────
+
+MAX_POINTS = 20_000            # individus dessinés tels quels au-delà : agrégation
+BINS = 400                     # cases par axe pour l'agrégation (de l'ordre du pixel)
+OPACITY = 0.5
+MARKER_SIZE = 4
+
+Range = Optional[tuple[float, float]]
+
+
+# ── Agrégation ─────────────────────────────────────────────
+
+@dataclass
+class ScatterPoints:
+    """Points à dessiner : individus, ou barycentres de cases agrégées.
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        Coordonnées (``float32``).
+    codes : np.ndarray
+        Catégorie de chaque point.
+    counts : np.ndarray or None
+        Individus représentés par chaque point (``None`` : individus bruts).
+    n_total : int
+        Individus du nuage complet.
+    n_view : int
+        Individus dans la vue.
+    """
+
+    x: np.ndarray
+    y: np.ndarray
+    codes: np.ndarray
+    counts: Optional[np.ndarray]
+    n_total: int
+    n_view: int
+
+    @property
+    def aggregated(self) -> bool:
+        return self.counts is not None
+
+
+def _extent(values: np.ndarray, bounds: Range) -> tuple[float, float]:
+    low, high = bounds if bounds is not None else (float(values.min()), float(values.max()))
+    return (low, high) if high > low else (low - 0.5, low + 0.5)
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    codes: np.ndarray,
+    n_categories: int,
+    x_range: Range = None,
+    y_range: Range = None,
+    max_points: int = MAX_POINTS,
+    bins: int = BINS,
+) -> ScatterPoints:
+    """Restreint le nuage à la vue et l'agrège au-delà de ``max_points`` individus.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Coordonnées des individus.
+    codes : np.ndarray
+        Catégorie de chaque individu, dans ``[0, n_categories)``.
+    n_categories : int
+        Nombre de catégories.
+    x_range, y_range : tuple of float, optional
+        Vue (défaut : tout le nuage).
+    max_points : int
+        Individus dessinés sans agrégation, au plus.
+    bins : int
+        Cases par axe.
+
+    Returns
+    -------
+    ScatterPoints
+    """
+    x, y, codes = np.asarray(x), np.asarray(y), np.asarray(codes)
+    n_total = len(x)
+    if x_range is not None or y_range is not None:
+        mask = np.ones(n_total, dtype=bool)
+        if x_range is not None:
+            mask &= (x >= x_range[0]) & (x <= x_range[1])
+        if y_range is not None:
+            mask &= (y >= y_range[0]) & (y <= y_range[1])
+        x, y, codes = x[mask], y[mask], codes[mask]
+    n_view = len(x)
+    if n_view <= max_points:
+        return ScatterPoints(
+            x.astype(np.float32), y.astype(np.float32), codes, None, n_total, n_view,
+        )
+
+    (x0, x1), (y0, y1) = _extent(x, x_range), _extent(y, y_range)
+    ix = np.clip(((x - x0) * (bins / (x1 - x0))).astype(np.intp), 0, bins - 1)
+    iy = np.clip(((y - y0) * (bins / (y1 - y0))).astype(np.intp), 0, bins - 1)
+    key = (codes.astype(np.intp) * bins + iy) * bins + ix
+    size = n_categories * bins * bins
+    counts = np.bincount(key, minlength=size)
+    occupied = np.flatnonzero(counts)
+    counts = counts[occupied]
+    sum_x = np.bincount(key, weights=x, minlength=size)[occupied]
+    sum_y = np.bincount(key, weights=y, minlength=size)[occupied]
+    return ScatterPoints(
+        (sum_x / counts).astype(np.float32), (sum_y / counts).astype(np.float32),
+        occupied // (bins * bins), counts, n_total, n_view,
+    )
+
+
+# ── Figure ─────────────────────────────────────────────────
+
+def stacked_opacity(counts: np.ndarray, opacity: float = OPACITY) -> np.ndarray:
+    """Opacité de ``counts`` points superposés d'opacité ``opacity``."""
+    return (1.0 - (1.0 - opacity) ** counts).astype(np.float32)
+
+
+def scatter_figure(
+    points: ScatterPoints,
+    names: Sequence[str],
+    colors: Optional[Mapping[str, str]] = None,
+    legend_title: str = "",
+    x_title: str = "",
+    y_title: str = "",
+    x_range: Range = None,
+    y_range: Range = None,
+    size: float = MARKER_SIZE,
+    opacity: float = OPACITY,
+) -> go.Figure:
+    """Figure WebGL, une trace par catégorie (légende et couleurs comme ``px.scatter``).
+
+    Parameters
+    ----------
+    points : ScatterPoints
+        Points à dessiner (:func:`decimate`).
+    names : sequence of str
+        Nom de chaque catégorie.
+    colors : mapping, optional
+        Couleur par nom de catégorie (défaut : palette qualitative Plotly).
+    legend_title, x_title, y_title : str
+        Titres de la légende et des axes.
+    x_range, y_range : tuple of float, optional
+        Vue affichée (défaut : ajustée aux points).
+    size : float
+        Taille des marqueurs.
+    opacity : float
+        Opacité d'un individu.
+
+    Returns
+    -------
+    go.Figure
+    """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    palette = qualitative.Plotly
+    fig = go.Figure()
+    order = np.argsort(points.codes, kind="stable")
+    bounds = np.searchsorted(points.codes[order], np.arange(len(names) + 1))
+    for code, name in enumerate(names):
+        rows = order[bounds[code]:bounds[code + 1]]
+        if not len(rows):
+            continue
+        color = colors.get(name) if colors else None
+        marker = dict(size=size, color=color or palette[code % len(palette)], opacity=opacity)
+        trace = dict(x=points.x[rows], y=points.y[rows], mode="markers", name=str(name), legendgroup=str(name))
+        if points.aggregated:
+            counts = points.counts[rows]
+            marker["opacity"] = stacked_opacity(counts, opacity)
+            trace.update(
+                customdata=counts.astype(np.int32),
+                hovertemplate=f"{name}<br>%{{customdata}} individus<br>(%{{x:.3f}}, %{{y:.3f}})<extra></extra>",
+            )
+        else:
+            trace["hovertemplate"] = f"{name}<br>(%{{x:.3f}}, %{{y:.3f}})<extra></extra>"
+        fig.add_trace(go.Scattergl(marker=marker, **trace))
+    fig.update_layout(
+        legend_title_text=legend_title,
+        xaxis=dict(title=x_title, range=list(x_range) if x_range else None),
+        yaxis=dict(title=y_title, range=list(y_range) if y_range else None),
+    )
+    return fig
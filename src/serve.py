@@ -0,0 +1,540 @@
+"""
+Service de prédiction — The Mushroom Project.
+
+Classe des spécimens bruts (22 attributs en codes UCI) : projection sur le
+modèle ACM persisté (``mca_model.npz``, étape 03), puis classifieur
+persisté (LDA de l'étape 05 par défaut, ou un modèle de ``MODELS`` de
+l'étape 07 avec ``--model``). Les modèles sont chargés une seule fois au
+démarrage.
+
+Sous-commandes :
+  - ``serve``   : service HTTP local (JSON) ; les requêtes concurrentes
+    sont regroupées en micro-lots avant projection et prédiction ;
+  - ``predict`` : scoring par lots d'un fichier au format ``.data`` ;
+  - ``bench``   : client de charge (débit cible, latences p50/p99).
+
+Usage :
+    python src/serve.py serve [--port 8000] [--model "Random Forest"]
+    python src/serve.py predict data/raw/agaricus-lepiota.data > predictions.csv
+    python src/serve.py bench --rate 10000 --duration 10
+
+API HTTP :
+    POST /predict  {"specimens": ["x,s,n,t,p,f,c,n,k,e,e,s,s,w,w,p,w,o,p,k,s,u", ...]}
+                   -> {"model", "classes", "predictions", "probabilities"}
+    GET  /stats    volume, débit, taille des lots, latences p50/p99
+    GET  /health
+
+Un spécimen est une ligne ``.data`` (22 champs, ou 23 avec la classe en
+tête, ignorée), une liste de 22 codes ou un objet ``{attribut: code}``.
+``?`` ou une valeur absente désigne une valeur manquante.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from utils import (
+    get_project_root, load_classifier, load_mca_model, print_section, print_step,
+)
+
+
+# ── Configuration ──────────────────────────────────────────
+
+HOST = "127.0.0.1"
+PORT = 8000
+MAX_BATCH_ROWS = 4096          # spécimens par micro-lot
+MAX_WAIT_MS = 1.0              # attente de requêtes concurrentes avant un lot
+STATS_WINDOW = 100_000         # latences conservées pour les percentiles
+PREDICT_BATCH = 65_536         # lignes par lot en mode CLI
+MISSING_VALUES = {"?", ""}
+
+REASONS = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 500: b"Internal Server Error"}
+
+
+# ── Modèle ─────────────────────────────────────────────────
+
+class Scorer:
+    """Projection ACM + classifieur, chargés une fois.
+
+    Parameters
+    ----------
+    model_name : str, optional
+        Modèle de ``07_model_comparison.MODELS`` ; LDA de l'étape 05 par défaut.
+
+    Raises
+    ------
+    ValueError
+        Si le classifieur ne fournit pas de probabilités ou attend plus
+        d'axes que le modèle ACM n'en contient.
+    """
+
+    def __init__(self, model_name: Optional[str] = None):
+        self.mca = load_mca_model()
+        bundle = load_classifier(model_name)
+        self.name = bundle["name"]
+        self.classifier = bundle["model"]
+        self.k_axes = bundle["k_axes"]
+        self.classes = bundle["classes"]
+        if not hasattr(self.classifier, "predict_proba"):
+            raise ValueError(f"{self.name} ne fournit pas de probabilités (predict_proba)")
+        if self.k_axes > self.mca.n_components:
+            raise ValueError(
+                f"{self.name} attend {self.k_axes} axes, le modèle ACM en a {self.mca.n_components}"
+            )
+
+    def parse(self, specimen) -> list:
+        """Valeurs d'un spécimen, dans l'ordre des variables du modèle ACM.
+
+        Raises
+        ------
+        ValueError
+            Si le spécimen n'est ni un texte, ni une liste, ni un objet, ou
+            si une valeur n'est pas un texte.
+        """
+        if isinstance(specimen, str):
+            values = specimen.strip().split(",")
+        elif isinstance(specimen, dict):
+            values = [specimen.get(var) for var in self.mca.variables]
+        elif isinstance(specimen, (list, tuple)):
+            values = list(specimen)
+        else:
+            raise ValueError(
+                f"spécimen de type {type(specimen).__name__} : ligne .data, liste ou objet attendu"
+            )
+        if len(values) == len(self.mca.variables) + 1:
+            values = values[1:]
+        for var, value in zip(self.mca.variables, values):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"{var!r} : valeur de type {type(value).__name__}, code texte attendu")
+        return [None if value is None or value in MISSING_VALUES else value for value in values]
+
+    def encode(self, specimens: Iterable) -> np.ndarray:
+        return self.mca.encode(self.parse(specimen) for specimen in specimens)
+
+    def predict_proba(self, indices: np.ndarray) -> np.ndarray:
+        """Probabilités (n x classes) de spécimens encodés par :meth:`encode`."""
+        coords = self.mca.project(indices)[:, :self.k_axes]
+        return self.classifier.predict_proba(coords)
+
+
+class LatencyStats:
+    """Compteurs et latences récentes du service."""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.started = None
+
+    def record(self, latency: float, rows: int) -> None:
+        if self.started is None:
+            self.started = time.perf_counter() - latency
+        self.latencies.append(latency)
+        self.requests += 1
+        self.rows += rows
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started if self.started else 0.0
+        latencies = np.array(self.latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "mean_batch_rows": round(self.rows / self.batches, 1) if self.batches else 0.0,
+            "throughput_rps": round(self.requests / elapsed, 1) if elapsed else 0.0,
+            "rows_per_s": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "latency_p50_ms": round(float(p50), 3),
+            "latency_p99_ms": round(float(p99), 3),
+        }
+
+
+# ── Service HTTP ───────────────────────────────────────────
+
+class PredictionServer:
+    """Service HTTP/1.1 (keep-alive) à micro-lots.
+
+    Chaque requête ``/predict`` est encodée dans la boucle d'événements,
+    puis placée en file ; une tâche unique regroupe les requêtes en attente
+    (au plus ``max_batch_rows`` spécimens) et exécute projection et
+    prédiction en un seul appel vectorisé, dans un thread dédié.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer,
+        max_batch_rows: int = MAX_BATCH_ROWS,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.scorer = scorer
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.stats = LatencyStats()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        """Sert jusqu'à SIGINT / SIGTERM."""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):  # Windows : KeyboardInterrupt
+                loop.add_signal_handler(sig, stop.set)
+        batcher = asyncio.create_task(self._batch_loop())
+        server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        print_step(f"Service prêt : http://{host}:{port} (modèle {self.scorer.name})")
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            batcher.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            if self.queue.empty() and self.max_wait:
+                await asyncio.sleep(self.max_wait)
+            rows = len(batch[0][0])
+            while rows < self.max_batch_rows and not self.queue.empty():
+                item = self.queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+
+            indices = np.concatenate([item[0] for item in batch])
+            try:
+                proba = await loop.run_in_executor(
+                    self.executor, self.scorer.predict_proba, indices,
+                )
+            except Exception as exc:  # transmis à chaque requête du lot
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.stats.batches += 1
+            start = 0
+            for item_indices, future in batch:
+                if not future.done():
+                    future.set_result(proba[start:start + len(item_indices)])
+                start += len(item_indices)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(" ", 2)
+                headers = {}
+                for line in lines[1:]:
+                    key, sep, value = line.partition(":")
+                    if sep:
+                        headers[key.strip().lower()] = value.strip()
+                length = headers.get("content-length", "0")
+                if not length.isdigit():
+                    # Corps de taille inconnue : réponse puis fermeture
+                    await self._respond(writer, 400, {"error": f"Content-Length invalide : {length!r}"})
+                    break
+                body = await reader.readexactly(int(length))
+
+                status, payload = await self._route(method, path, body)
+                await self._respond(writer, status, payload)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n" % (status, REASONS[status], len(data)) + data
+        )
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if method == "POST" and path == "/predict":
+            return await self._predict(body)
+        if method == "GET" and path == "/stats":
+            return 200, self.stats.summary()
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "model": self.scorer.name}
+        return 404, {"error": f"{method} {path} inconnu"}
+
+    async def _predict(self, body: bytes) -> tuple[int, dict]:
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body)
+            specimens = payload.get("specimens") if isinstance(payload, dict) else payload
+            if not isinstance(specimens, list):
+                raise ValueError("liste de spécimens attendue (ou objet {\"specimens\": [...]})")
+            indices = self.scorer.encode(specimens)
+        except (ValueError, TypeError, KeyError) as exc:
+            return 400, {"error": str(exc) or type(exc).__name__}
+
+        if len(indices):
+            future = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait((indices, future))
+            try:
+                proba = await future
+            except Exception as exc:
+                return 500, {"error": str(exc)}
+        else:
+            proba = np.empty((0, len(self.scorer.classes)))
+        self.stats.record(time.perf_counter() - start, len(indices))
+
+        classes = self.scorer.classes
+        return 200, {
+            "model": self.scorer.name,
+            "classes": classes,
+            "predictions": [classes[i] for i in proba.argmax(axis=1)],
+            "probabilities": proba.round(6).tolist(),
+        }
+
+
+def print_stats(title: str, stats: dict) -> None:
+    """Affiche un tableau de statistiques de service."""
+    print_section(title)
+    width = max(len(key) for key in stats)
+    for key, value in stats.items():
+        print(f"    {key:<{width}}  {value:,}" if isinstance(value, int) else f"    {key:<{width}}  {value}")
+    print()
+
+
+def run_server(model_name: Optional[str], host: str, port: int, max_batch_rows: int, max_wait_ms: float) -> None:
+    """Lance le service HTTP jusqu'à interruption (Ctrl+C, SIGTERM)."""
+    print_section("Service de prédiction")
+    scorer = Scorer(model_name)
+    print_step(
+        f"Modèles chargés : ACM ({scorer.mca.n_components} axes) + {scorer.name} (k={scorer.k_axes})"
+    )
+    server = PredictionServer(scorer, max_batch_rows, max_wait_ms)
+    try:
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    print_stats("Service arrêté — statistiques", server.stats.summary())
+
+
+# ── CLI : scoring de fichier ───────────────────────────────
+
+def predict_file(
+    source: Optional[Path],
+    model_name: Optional[str] = None,
+    output: Optional[Path] = None,
+    batch_size: int = PREDICT_BATCH,
+) -> None:
+    """Score un fichier ``.data`` (ou l'entrée standard) par lots.
+
+    Écrit un CSV (``prediction`` + une probabilité par classe) sur la
+    sortie standard ou dans ``output`` ; débit et latences par lot sont
+    affichés sur la sortie d'erreur.
+
+    Raises
+    ------
+    ValueError
+        Si une ligne est mal formée (numéro de ligne du fichier dans le message).
+    """
+    scorer = Scorer(model_name)
+    columns = ["prediction"] + [f"proba_{c}" for c in scorer.classes]
+    latencies, n_rows = [], 0
+
+    lines = (source.open(encoding="utf-8") if source else sys.stdin)
+    out = output.open("w", encoding="utf-8") if output else sys.stdout
+    start = time.perf_counter()
+    try:
+        out.write(",".join(columns) + "\n")
+        batch, numbers = [], []
+        for number, line in enumerate(lines, start=1):
+            if line.strip():
+                batch.append(line)
+                numbers.append(number)
+            if len(batch) == batch_size:
+                n_rows += _score_lines(scorer, batch, out, latencies, numbers)
+                batch, numbers = [], []
+        if batch:
+            n_rows += _score_lines(scorer, batch, out, latencies, numbers)
+    finally:
+        if source:
+            lines.close()
+        if output:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99]) if latencies else (0.0, 0.0)
+    print(
+        f"  -> {n_rows:,} spécimens en {elapsed:.2f} s ({n_rows / elapsed:,.0f}/s) — "
+        f"{len(latencies)} lot(s), latence par lot p50={p50:.1f} ms p99={p99:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+def _score_lines(scorer: Scorer, lines: list[str], out, latencies: list[float], numbers: list[int]) -> int:
+    """Score un lot de lignes ; ``numbers`` : numéro de chaque ligne dans le fichier."""
+    start = time.perf_counter()
+    try:
+        indices = scorer.encode(lines)
+    except ValueError:
+        for number, line in zip(numbers, lines):
+            try:
+                scorer.encode([line])
+            except ValueError as exc:
+                raise ValueError(f"ligne {number} : {exc}") from None
+        raise
+    proba = scorer.predict_proba(indices)
+    latencies.append(time.perf_counter() - start)
+    predicted = np.array(scorer.classes)[proba.argmax(axis=1)]
+    out.writelines(
+        f"{label},{','.join(f'{p:.6f}' for p in row)}\n" for label, row in zip(predicted, proba)
+    )
+    return len(lines)
+
+
+# ── Client de charge ───────────────────────────────────────
+
+async def _load_worker(
+    host: str, port: int, bodies: list[bytes], schedule: np.ndarray,
+    t0: float, latencies: list[float], errors: list[int],
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i, offset in enumerate(schedule):
+            delay = t0 + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            body = bodies[i % len(bodies)]
+            writer.write(
+                b"POST /predict HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n" % (host.encode(), len(body)) + body
+            )
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            # Latence mesurée depuis l'instant prévu : le retard pris est compté
+            latencies.append(time.perf_counter() - (t0 + offset))
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(1)
+    finally:
+        writer.close()
+
+
+async def load_test(
+    url: str, rate: float, duration: float, connections: int, batch: int,
+    specimens: list[str], seed: int = 0,
+) -> dict:
+    """Charge le service à débit cible (boucle ouverte) et mesure les latences.
+
+    Les requêtes sont planifiées à intervalles réguliers sur ``connections``
+    connexions keep-alive ; la latence est comptée depuis l'instant prévu
+    d'envoi, ce qui inclut l'attente si le service ne suit pas le débit.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname or HOST, parts.port or PORT
+    rng = np.random.default_rng(seed)
+    bodies = [
+        json.dumps({"specimens": [specimens[j] for j in rng.integers(len(specimens), size=batch)]}).encode()
+        for _ in range(256)
+    ]
+
+    n_requests = int(rate * duration)
+    offsets = np.arange(n_requests) / rate
+    latencies, errors = [], []
+    t0 = time.perf_counter() + 0.2
+    await asyncio.gather(*(
+        _load_worker(host, port, bodies, offsets[c::connections], t0, latencies, errors)
+        for c in range(connections)
+    ))
+    elapsed = time.perf_counter() - t0
+
+    ms = np.array(latencies) * 1000
+    p50, p99, p999 = np.percentile(ms, [50, 99, 99.9]) if len(ms) else (0.0, 0.0, 0.0)
+    return {
+        "target_rps": rate,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "specimens_per_request": batch,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_p50_ms": round(float(p50), 3),
+        "latency_p99_ms": round(float(p99), 3),
+        "latency_p999_ms": round(float(p999), 3),
+        "latency_max_ms": round(float(ms.max()), 3) if len(ms) else 0.0,
+    }
+
+
+def run_load_test(url: str, rate: float, duration: float, connections: int, batch: int, source: Path) -> None:
+    """Lance le client de charge et affiche le bilan."""
+    if not source.exists():
+        raise FileNotFoundError(
+            f"Spécimens introuvables : {source}\n"
+            "Exécuter d'abord : python src/00_download.py"
+        )
+    specimens = [line.strip() for line in source.read_text(encoding="utf-8").splitlines() if line.strip()]
+    print_section("Client de charge")
+    print_step(
+        f"{url} — {rate:,.0f} req/s pendant {duration:g} s, {connections} connexions, "
+        f"{batch} spécimen(s) par requête"
+    )
+    print_stats("Bilan de charge", asyncio.run(
+        load_test(url, rate, duration, connections, batch, specimens),
+    ))
+
+
+if __name__ == "__main__":
+    default_data = get_project_root() / "data" / "raw" / "agaricus-lepiota.data"
+
+    parser = argparse.ArgumentParser(description="Service de prédiction mushroom.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="Service HTTP local")
+    p_serve.add_argument("--model", default=None, help="Modèle de 07 (défaut : LDA de 05)")
+    p_serve.add_argument("--host", default=HOST)
+    p_serve.add_argument("--port", type=int, default=PORT)
+    p_serve.add_argument("--max-batch", type=int, default=MAX_BATCH_ROWS,
+                         help=f"Spécimens par micro-lot (défaut : {MAX_BATCH_ROWS})")
+    p_serve.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS,
+                         help=f"Attente avant un lot (défaut : {MAX_WAIT_MS} ms)")
+
+    p_predict = sub.add_parser("predict", help="Scoring d'un fichier .data")
+    p_predict.add_argument("input", nargs="?", type=Path, help="Fichier (défaut : entrée standard)")
+    p_predict.add_argument("--model", default=None, help="Modèle de 07 (défaut : LDA de 05)")
+    p_predict.add_argument("-o", "--output", type=Path, help="CSV de sortie (défaut : sortie standard)")
+    p_predict.add_argument("--batch-size", type=int, default=PREDICT_BATCH)
+
+    p_bench = sub.add_parser("bench", help="Client de charge")
+    p_bench.add_argument("--url", default=f"http://{HOST}:{PORT}")
+    p_bench.add_argument("--rate", type=float, default=10_000, help="Requêtes/s visées")
+    p_bench.add_argument("--duration", type=float, default=10.0, help="Durée (s)")
+    p_bench.add_argument("--connections", type=int, default=64)
+    p_bench.add_argument("--batch", type=int, default=1, help="Spécimens par requête")
+    p_bench.add_argument("--data", type=Path, default=default_data, help="Spécimens (.data)")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        run_server(args.model, args.host, args.port, args.max_batch, args.max_wait_ms)
+    elif args.command == "predict":
+        try:
+            predict_file(args.input, args.model, args.output, args.batch_size)
+        except ValueError as exc:
+            sys.exit(f"Erreur : {exc}")
+    else:
+        run_load_test(args.url, args.rate, args.duration, args.connections, args.batch, args.data)
@@ -0,0 +1,385 @@
+"""
+Générateur de spécimens synthétiques — The Mushroom Project.
+
+Apprend la structure jointe des modalités de ``mushroom_processed`` par un
+réseau bayésien conditionnel à la classe : la classe est parente de chaque
+attribut, et les attributs forment un arbre de Chow-Liu (arbre couvrant
+de poids maximal pour l'information mutuelle conditionnelle
+``I(Xi ; Xj | classe)``). Chaque attribut est tiré selon sa loi
+conditionnelle à (classe, parent) : les marges par classe et les
+co-occurrences le long de l'arbre sont reproduites, et sans lissage
+(``SMOOTHING = 0``) aucun triplet (classe, parent, modalité) absent du jeu
+réel n'est produit. Une valeur manquante (``?``) est une modalité comme une
+autre.
+
+Le tirage est vectorisé (inversion de la fonction de répartition par
+table guide, un accès indexé par attribut et par bloc) et déterministe :
+une même graine produit le même flux, quelle que soit la taille des blocs. Deux formats de sortie, en flux :
+
+  - ``raw``      : lignes ``agaricus-lepiota.data`` (classe en tête), à
+    donner à ``01_prepare.py`` ;
+  - ``prepared`` : format préparé binaire (``mushroom_processed.arrow``,
+    ``modalities.json``, ``cv_folds.npz``), lu directement par les étapes
+    02 à 07.
+
+Usage :
+    python src/synthetic.py 1000000 > specimens.data
+    python src/synthetic.py 10000000 -o big.data --seed 7
+    python src/synthetic.py 1000000 --format prepared -o /tmp/work/data/processed
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+import numpy as np
+
+from utils import load_code_matrix, load_modalities, print_section, print_step
+
+
+# ── Configuration ──────────────────────────────────────────
+
+BATCH_ROWS = 1 << 18           # lignes par bloc généré
+GUIDE_BINS = 1 << 10           # cases de la table guide de chaque loi conditionnelle
+SMOOTHING = 0.0                # pseudo-effectif ajouté à chaque cellule des lois conditionnelles
+RANDOM_STATE = 0
+MISSING = "?"
+
+
+# ── Modèle ─────────────────────────────────────────────────
+
+@dataclass
+class SpecimenModel:
+    """Réseau bayésien conditionnel à la classe (arbre de Chow-Liu).
+
+    Les états d'une colonne sont ``code + 1`` : l'état 0 est la valeur
+    manquante.
+
+    Attributes
+    ----------
+    columns : list of str
+        Colonnes (``class`` en tête), dans l'ordre de ``modalities.json``.
+    modalities : dict
+        Modalités de chaque colonne.
+    class_cdf : np.ndarray
+        Fonction de répartition de la classe (états).
+    order : list of int
+        Attributs (indices de colonne) dans un ordre compatible avec l'arbre.
+    parents : dict
+        Parent de chaque attribut dans l'arbre (-1 pour la racine).
+    cdf : dict
+        Pour chaque attribut, fonctions de répartition conditionnelles
+        aplaties (ligne ``r = classe x n_états(parent) + état(parent)``).
+    guides : dict
+        Pour chaque attribut, table guide aplatie (``GUIDE_BINS`` cases par
+        ligne) : état tiré pour une uniforme de la case si la case tient
+        dans un seul état, sinon ``-(premier état candidat) - 1``.
+    """
+
+    columns: list
+    modalities: dict
+    class_cdf: np.ndarray
+    order: list
+    parents: dict
+    cdf: dict
+    guides: dict
+
+    def n_states(self, col: int) -> int:
+        return len(self.modalities[self.columns[col]]) + 1
+
+    def _draw(self, col: int, rows: np.ndarray, u: np.ndarray, bins: np.ndarray) -> np.ndarray:
+        """Inverse de la fonction de répartition (premier état de répartition > u).
+
+        La table guide donne l'état de la case de ``u`` ; seuls les rares
+        tirages dont la case chevauche une frontière d'états sont résolus
+        en avançant état par état depuis le premier candidat. Tirage exact.
+        """
+        state = self.guides[col][rows * GUIDE_BINS + bins]
+        border = np.flatnonzero(state < 0)
+        if len(border):
+            cdf = self.cdf[col]
+            base, u_border = rows[border] * self.n_states(col), u[border]
+            candidate = -state[border] - 1
+            ahead = np.flatnonzero(cdf[base + candidate] <= u_border)
+            while len(ahead):
+                candidate[ahead] += 1
+                ahead = ahead[cdf[base[ahead] + candidate[ahead]] <= u_border[ahead]]
+            state[border] = candidate
+        return state
+
+    def sample_states(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Tire ``n`` spécimens (matrice d'états ``int8``, n x colonnes)."""
+        # Uniformes consommées ligne à ligne (indépendance vis-à-vis du bloc), lues par colonne
+        u = rng.random((n, len(self.columns))).T.copy()
+        bins = (u * GUIDE_BINS).astype(np.int32)
+        states = np.empty((len(self.columns), n), dtype=np.int8)
+        states[0] = np.minimum(np.searchsorted(self.class_cdf, u[0], side="right"), len(self.class_cdf) - 1)
+        cls = states[0].astype(np.int32)
+        for col in self.order:
+            parent = self.parents[col]
+            rows = cls if parent < 0 else cls * self.n_states(parent) + states[parent]
+            states[col] = self._draw(col, rows, u[col], bins[col])
+        return states.T
+
+
+def _conditional_mutual_information(states: np.ndarray, sizes: list[int]) -> np.ndarray:
+    """Information mutuelle ``I(Xi ; Xj | classe)`` de chaque paire d'attributs."""
+    n, m = states.shape
+    cls = states[:, 0].astype(np.int64)
+    n_cls = sizes[0]
+    mi = np.zeros((m, m))
+    for i in range(1, m):
+        for j in range(i + 1, m):
+            si, sj = sizes[i], sizes[j]
+            joint = np.bincount((cls * si + states[:, i]) * sj + states[:, j],
+                                minlength=n_cls * si * sj).reshape(n_cls, si, sj) / n
+            p_c = joint.sum(axis=(1, 2), keepdims=True)
+            p_ci = joint.sum(axis=2, keepdims=True)
+            p_cj = joint.sum(axis=1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                terms = joint * np.log(joint * p_c / (p_ci * p_cj))
+            mi[i, j] = mi[j, i] = np.nansum(terms)
+    return mi
+
+
+def _chow_liu_tree(mi: np.ndarray) -> tuple[list[int], dict[int, int]]:
+    """Arbre couvrant de poids maximal sur les attributs (Prim), enraciné au plus informatif."""
+    attributes = list(range(1, len(mi)))
+    root = max(attributes, key=lambda a: mi[a].sum())
+    order, parents = [root], {root: -1}
+    best = {a: (mi[root, a], root) for a in attributes if a != root}
+    while best:
+        col = max(best, key=lambda a: best[a][0])
+        parents[col] = best.pop(col)[1]
+        order.append(col)
+        for a in best:
+            if mi[col, a] > best[a][0]:
+                best[a] = (mi[col, a], col)
+    return order, parents
+
+
+def fit_specimen_model(
+    codes: Optional[np.ndarray] = None,
+    modalities: Optional[dict[str, list[str]]] = None,
+    smoothing: float = SMOOTHING,
+) -> SpecimenModel:
+    """Apprend le réseau bayésien sur le dataset nettoyé.
+
+    Parameters
+    ----------
+    codes : np.ndarray, optional
+        Matrice de codes (n x 23, -1 = manquant ; défaut :
+        :func:`utils.load_code_matrix`).
+    modalities : dict, optional
+        Modalités de chaque colonne (défaut : :func:`utils.load_modalities`).
+    smoothing : float
+        Pseudo-effectif ajouté à chaque cellule des lois conditionnelles
+        (0 : seules les combinaisons observées sont produites).
+
+    Returns
+    -------
+    SpecimenModel
+    """
+    if modalities is None:
+        modalities = load_modalities()
+    if codes is None:
+        codes = load_code_matrix()
+    columns = list(modalities)
+    sizes = [len(modalities[col]) + 1 for col in columns]
+    states = codes.astype(np.int64) + 1
+
+    order, parents = _chow_liu_tree(_conditional_mutual_information(states, sizes))
+
+    cls = states[:, 0]
+    class_counts = np.bincount(cls, minlength=sizes[0]).astype(np.float64)
+    class_counts[1:] += smoothing                  # la classe n'est jamais manquante
+    cdf_tables, guides = {}, {}
+    bins = np.arange(GUIDE_BINS) / GUIDE_BINS
+    for col in order:
+        parent = parents[col]
+        n_parent = sizes[parent] if parent >= 0 else 1
+        rows = cls * n_parent + (states[:, parent] if parent >= 0 else 0)
+        counts = np.bincount(rows * sizes[col] + states[:, col], minlength=sizes[0] * n_parent * sizes[col])
+        counts = counts.reshape(-1, sizes[col]).astype(np.float64)
+        if smoothing:
+            observed = np.bincount(states[:, col], minlength=sizes[col]) > 0
+            counts[:, observed] += smoothing
+        # Lignes jamais observées (jamais tirées sans lissage) : loi de l'attribut sachant la classe
+        empty = counts.sum(axis=1) == 0
+        if empty.any():
+            marginal = np.bincount(cls * sizes[col] + states[:, col], minlength=sizes[0] * sizes[col])
+            marginal = marginal.reshape(sizes[0], sizes[col]).astype(np.float64) + 1e-12
+            counts[empty] = marginal[np.flatnonzero(empty) // n_parent]
+        cdf = np.cumsum(counts / counts.sum(axis=1, keepdims=True), axis=1)
+        cdf[:, -1] = 1.0
+        cdf_tables[col] = cdf.ravel()
+        first = np.stack([np.searchsorted(row, bins, side="right") for row in cdf])
+        pure = np.take_along_axis(cdf, first, axis=1) >= bins + 1 / GUIDE_BINS
+        guides[col] = np.where(pure, first, -first - 1).astype(np.int8).ravel()
+
+    class_cdf = np.cumsum(class_counts / class_counts.sum())
+    class_cdf[-1] = 1.0
+    return SpecimenModel(
+        columns=columns, modalities=modalities, class_cdf=class_cdf,
+        order=order, parents=parents, cdf=cdf_tables, guides=guides,
+    )
+
+
+# ── Génération ─────────────────────────────────────────────
+
+def iter_specimens(
+    model: SpecimenModel, n_rows: int, seed: int = RANDOM_STATE, batch_rows: int = BATCH_ROWS,
+) -> Iterator[np.ndarray]:
+    """Génère ``n_rows`` spécimens par blocs.
+
+    Le flux ne dépend que de ``seed`` : les uniformes sont consommées
+    ligne à ligne, quel que soit ``batch_rows``.
+
+    Yields
+    ------
+    np.ndarray
+        Matrice de codes ``int8`` (au plus ``batch_rows`` lignes x 23
+        colonnes, ordre de ``modalities.json``) ; -1 code une valeur manquante.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, batch_rows):
+        yield model.sample_states(min(batch_rows, n_rows - start), rng) - 1
+
+
+def format_raw(codes: np.ndarray, model: SpecimenModel) -> bytes:
+    """Encode des codes au format ``agaricus-lepiota.data`` (une lettre par champ).
+
+    Toutes les modalités UCI tiennent en un caractère : chaque ligne fait
+    exactement ``2 x colonnes`` octets, ce qui permet un encodage par
+    matrice d'octets.
+    """
+    n, m = codes.shape
+    out = np.full((n, 2 * m), ord(","), dtype=np.uint8)
+    out[:, -1] = ord("\n")
+    for j, col in enumerate(model.columns):
+        lut = np.frombuffer((MISSING + "".join(model.modalities[col])).encode("ascii"), dtype=np.uint8)
+        out[:, 2 * j] = lut[codes[:, j].astype(np.int64) + 1]
+    return out.tobytes()
+
+
+def write_raw(
+    model: SpecimenModel, n_rows: int, stream: BinaryIO,
+    seed: int = RANDOM_STATE, batch_rows: int = BATCH_ROWS,
+) -> int:
+    """Écrit ``n_rows`` spécimens au format ``.data`` dans ``stream``.
+
+    Returns
+    -------
+    int
+        Octets écrits.
+    """
+    written = 0
+    for codes in iter_specimens(model, n_rows, seed, batch_rows):
+        written += stream.write(format_raw(codes, model))
+    return written
+
+
+def write_prepared(
+    model: SpecimenModel, n_rows: int, processed_dir: Path,
+    seed: int = RANDOM_STATE, batch_rows: int = BATCH_ROWS, cv_folds: int = 5,
+) -> Path:
+    """Écrit ``n_rows`` spécimens au format préparé binaire dans ``processed_dir``.
+
+    ``mushroom_processed.arrow`` (Arrow/Feather non compressé, colonnes
+    dictionnaire ``int8`` comme ``utils.save_processed_data``) est écrit
+    bloc par bloc ; ``modalities.json`` et ``cv_folds.npz`` (plis
+    stratifiés, cf. ``validation.make_folds``) l'accompagnent. Un éventuel
+    ``mushroom_processed.csv`` plus ancien est ignoré par les loaders.
+
+    Returns
+    -------
+    Path
+        Chemin du fichier Arrow.
+    """
+    import pyarrow as pa
+
+    from validation import make_folds
+
+    processed_dir = Path(processed_dir)
+    processed_dir.mkdir(parents=True, exist_ok=True)
+    dictionaries = [pa.array(model.modalities[col], type=pa.large_string()) for col in model.columns]
+    schema = pa.schema([pa.field(col, pa.dictionary(pa.int8(), pa.large_string())) for col in model.columns])
+    path = processed_dir / "mushroom_processed.arrow"
+    edible = np.empty(n_rows, dtype=np.int8)
+    position = 0
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for codes in iter_specimens(model, n_rows, seed, batch_rows):
+            arrays = [
+                pa.DictionaryArray.from_arrays(pa.array(codes[:, j], mask=codes[:, j] < 0), dictionaries[j])
+                for j in range(len(model.columns))
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+            edible[position:position + len(codes)] = codes[:, 0] == model.modalities["class"].index("e")
+            position += len(codes)
+    (processed_dir / "modalities.json").write_text(json.dumps(model.modalities, indent=2), encoding="utf-8")
+    np.savez(processed_dir / "cv_folds.npz", folds=make_folds(edible, cv_folds))
+    return path
+
+
+# ── Contrôle ───────────────────────────────────────────────
+
+def cooccurrence_distance(real: np.ndarray, synthetic: np.ndarray) -> float:
+    """Distance moyenne en variation totale entre les lois jointes de chaque paire de colonnes.
+
+    0 : co-occurrences identiques ; 1 : supports disjoints.
+    """
+    m = real.shape[1]
+    sizes = np.maximum(real.max(axis=0), synthetic.max(axis=0)).astype(np.int64) + 2
+    distances = []
+    for i in range(m):
+        for j in range(i + 1, m):
+            bins = sizes[i] * sizes[j]
+            p = np.bincount((real[:, i] + 1) * sizes[j] + real[:, j] + 1, minlength=bins) / len(real)
+            q = np.bincount((synthetic[:, i] + 1) * sizes[j] + synthetic[:, j] + 1, minlength=bins) / len(synthetic)
+            distances.append(0.5 * np.abs(p - q).sum())
+    return float(np.mean(distances))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Générateur de spécimens synthétiques.")
+    parser.add_argument("rows", type=int, help="Nombre de spécimens")
+    parser.add_argument("--format", choices=("raw", "prepared"), default="raw",
+                        help="raw : lignes .data ; prepared : Arrow + modalités + plis (défaut : raw)")
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="Fichier .data (défaut : sortie standard) ou répertoire du format préparé")
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE, help=f"Graine (défaut : {RANDOM_STATE})")
+    parser.add_argument("--smoothing", type=float, default=SMOOTHING,
+                        help=f"Lissage des lois conditionnelles (défaut : {SMOOTHING})")
+    args = parser.parse_args()
+    if args.rows < 1:
+        parser.error("rows doit etre strictement positif")
+    if args.format == "prepared" and args.output is None:
+        parser.error("--format prepared : --output (répertoire) requis")
+
+    # Messages sur la sortie d'erreur : la sortie standard peut porter les données
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    print_section("Générateur de spécimens synthétiques")
+    start = time.perf_counter()
+    model = fit_specimen_model(smoothing=args.smoothing)
+    edges = ", ".join(f"{model.columns[model.parents[c]]}->{model.columns[c]}" for c in model.order[1:4])
+    print_step(f"Réseau appris en {time.perf_counter() - start:.2f} s (racine {model.columns[model.order[0]]} ; {edges}, ...)")
+
+    start = time.perf_counter()
+    if args.format == "prepared":
+        target = write_prepared(model, args.rows, args.output, args.seed)
+    elif args.output is None:
+        write_raw(model, args.rows, stdout.buffer, args.seed)
+        stdout.flush()
+        target = "sortie standard"
+    else:
+        with open(args.output, "wb") as f:
+            write_raw(model, args.rows, f, args.seed)
+        target = args.output
+    elapsed = time.perf_counter() - start
+    print_step(f"{args.rows:,} spécimens en {elapsed:.2f} s ({args.rows / elapsed:,.0f} lignes/s) -> {target}")
@@ -6,11 +6,20 @@ Fonctions d'I/O, chemins, et helpers réutilisés par l'ensemble du pipeline.
 
 from __future__ import annotations
 
+import json
+import os
+import re
+from contextlib import contextmanager
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    import argparse
+
+    import matplotlib.pyplot as plt
 
 
 # ── Chemins ────────────────────────────────────────────────
@@ -27,31 +36,151 @@ def _ensure_dir(path: Path) -> Path:
 
 
 # ── Chargement des données ─────────────────────────────────
+#
+# Chaque artefact existe en deux formats : un CSV (export lisible) et un
+# binaire colonnaire (Arrow/Feather non compressé pour le dataset, ``.npy``
+# pour les coordonnées). Les loaders lisent le binaire lorsqu'il est
+# présent et à jour, ce qui évite de re-parser le texte à chaque étape et
+# conserve la précision des flottants ; ``mmap=True`` le projette en
+# mémoire sans copie.
+#
+# Le dataset est stocké sous forme catégorielle (codes int8) ; le
+# dictionnaire des modalités de chaque colonne est persisté dans
+# ``modalities.json`` pour restaurer les mêmes codes depuis le CSV.
+
+def _processed_dir() -> Path:
+    return get_project_root() / "data" / "processed"
+
+
+def _fresh_binary(binary: Path, csv: Path) -> bool:
+    """Vrai si le binaire existe et n'est pas plus ancien que le CSV."""
+    if not binary.exists():
+        return False
+    return not csv.exists() or binary.stat().st_mtime_ns >= csv.stat().st_mtime_ns
+
 
-def load_processed_data() -> pd.DataFrame:
-    """Charge le dataset nettoyé depuis ``data/processed/mushroom_processed.csv``.
+def load_modalities() -> dict[str, list[str]]:
+    """Charge le dictionnaire des modalités (``data/processed/modalities.json``).
+
+    Returns
+    -------
+    dict
+        Pour chaque colonne, la liste ordonnée de ses modalités : la
+        position d'une modalité dans la liste est son code entier.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si le fichier n'existe pas (exécuter ``01_prepare.py`` d'abord).
+    """
+    path = _processed_dir() / "modalities.json"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Dictionnaire des modalités introuvable : {path}\n"
+            "Exécuter d'abord : python src/01_prepare.py"
+        )
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_processed_data(mmap: bool = False) -> pd.DataFrame:
+    """Charge le dataset nettoyé (``mushroom_processed.arrow`` ou ``.csv``).
+
+    Parameters
+    ----------
+    mmap : bool
+        Projeter le fichier Arrow en mémoire au lieu de le lire
+        (défaut : False). Sans effet sur le CSV.
 
     Returns
     -------
     pd.DataFrame
-        Dataset avec 23 colonnes (``class`` + 22 variables morphologiques).
+        Dataset avec 23 colonnes catégorielles (``class`` + 22 variables
+        morphologiques).
 
     Raises
     ------
     FileNotFoundError
         Si le fichier n'existe pas (exécuter ``01_prepare.py`` d'abord).
     """
-    path = get_project_root() / "data" / "processed" / "mushroom_processed.csv"
+    path = _processed_dir() / "mushroom_processed.csv"
+    binary = path.with_suffix(".arrow")
+    if _fresh_binary(binary, path):
+        from pyarrow import feather
+        return feather.read_table(binary, memory_map=mmap).to_pandas()
     if not path.exists():
         raise FileNotFoundError(
             f"Dataset introuvable : {path}\n"
             "Exécuter d'abord : python src/01_prepare.py"
         )
-    return pd.read_csv(path)
+    if (_processed_dir() / "modalities.json").exists():
+        dtypes = {col: pd.CategoricalDtype(mods) for col, mods in load_modalities().items()}
+    else:
+        dtypes = "category"
+    return pd.read_csv(path, dtype=dtypes)
+
 
+def load_code_matrix(mmap: bool = False) -> np.ndarray:
+    """Charge le dataset nettoyé sous forme de matrice de codes entiers.
 
-def load_mca_coordinates() -> pd.DataFrame:
-    """Charge les coordonnées ACM depuis ``data/processed/mca_coords.csv``.
+    Parameters
+    ----------
+    mmap : bool
+        Transmis à :func:`load_processed_data`.
+
+    Returns
+    -------
+    np.ndarray
+        Matrice ``int8`` (n lignes x 23 colonnes, dans l'ordre de
+        ``load_modalities()``) ; -1 code une valeur manquante.
+    """
+    df = load_processed_data(mmap=mmap)
+    return np.column_stack([df[col].cat.codes.to_numpy() for col in df.columns])
+
+
+def iter_code_chunks(chunk_size: int) -> Iterator[np.ndarray]:
+    """Parcourt le dataset nettoyé par blocs de lignes, sous forme de codes.
+
+    Seul le bloc courant est matérialisé : le fichier Arrow est projeté en
+    mémoire et découpé sans copie, le CSV est lu par morceaux.
+
+    Parameters
+    ----------
+    chunk_size : int
+        Nombre de lignes par bloc.
+
+    Yields
+    ------
+    np.ndarray
+        Matrice ``int8`` (au plus ``chunk_size`` lignes x 23 colonnes, dans
+        l'ordre de ``load_modalities()``) ; -1 code une valeur manquante.
+    """
+    path = _processed_dir() / "mushroom_processed.csv"
+    binary = path.with_suffix(".arrow")
+    if _fresh_binary(binary, path):
+        from pyarrow import feather
+        table = feather.read_table(binary, memory_map=True)
+        for start in range(0, table.num_rows, chunk_size):
+            block = table.slice(start, chunk_size).to_pandas()
+            yield np.column_stack([block[col].cat.codes.to_numpy() for col in block.columns])
+        return
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Dataset introuvable : {path}\n"
+            "Exécuter d'abord : python src/01_prepare.py"
+        )
+    dtypes = {col: pd.CategoricalDtype(mods) for col, mods in load_modalities().items()}
+    for block in pd.read_csv(path, dtype=dtypes, chunksize=chunk_size):
+        yield np.column_stack([block[col].cat.codes.to_numpy() for col in block.columns])
+
+
+def load_mca_coordinates(mmap: bool = False) -> pd.DataFrame:
+    """Charge les coordonnées ACM (``mca_coords.npy`` ou ``.csv``).
+
+    Parameters
+    ----------
+    mmap : bool
+        Projeter le fichier ``.npy`` en mémoire, en lecture seule
+        (défaut : False). Sans effet sur le CSV.
 
     Returns
     -------
@@ -63,7 +192,12 @@ def load_mca_coordinates() -> pd.DataFrame:
     FileNotFoundError
         Si le fichier n'existe pas (exécuter ``03_mca.py`` d'abord).
     """
-    path = get_project_root() / "data" / "processed" / "mca_coords.csv"
+    path = _processed_dir() / "mca_coords.csv"
+    binary = path.with_suffix(".npy")
+    if _fresh_binary(binary, path):
+        values = np.load(binary, mmap_mode="r" if mmap else None)
+        columns = [f"Dim{i+1}" for i in range(values.shape[1])]
+        return pd.DataFrame(values, columns=columns, copy=False)
     if not path.exists():
         raise FileNotFoundError(
             f"Coordonnées ACM introuvables : {path}\n"
@@ -72,9 +206,145 @@ def load_mca_coordinates() -> pd.DataFrame:
     return pd.read_csv(path)
 
 
+def load_mca_model():
+    """Charge le modèle ACM persisté (``data/processed/mca_model.npz``).
+
+    Returns
+    -------
+    mca_engine.MCAModel
+        Projection des individus supplémentaires (``model.transform(X)``).
+
+    Raises
+    ------
+    FileNotFoundError
+        Si le fichier n'existe pas (exécuter ``03_mca.py`` d'abord).
+    """
+    from mca_engine import MCAModel
+
+    path = _processed_dir() / "mca_model.npz"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Modèle ACM introuvable : {path}\n"
+            "Exécuter d'abord : python src/03_mca.py"
+        )
+    return MCAModel.load(path)
+
+
+def load_cv_folds(n_rows: Optional[int] = None) -> np.ndarray:
+    """Charge les plis de validation croisée (``data/processed/cv_folds.npz``).
+
+    Parameters
+    ----------
+    n_rows : int, optional
+        Nombre d'individus attendu ; vérifié s'il est fourni.
+
+    Returns
+    -------
+    np.ndarray
+        Numéro de pli ``int8`` de chaque individu.
+
+    Raises
+    ------
+    FileNotFoundError
+        Si le fichier n'existe pas (exécuter ``01_prepare.py`` d'abord).
+    ValueError
+        Si le nombre d'individus ne correspond pas.
+    """
+    path = _processed_dir() / "cv_folds.npz"
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Plis de validation introuvables : {path}\n"
+            "Exécuter d'abord : python src/01_prepare.py"
+        )
+    with np.load(path, allow_pickle=False) as data:
+        folds = data["folds"]
+    if n_rows is not None and len(folds) != n_rows:
+        raise ValueError(
+            f"Plis de validation périmés : {len(folds):,} individus au lieu de {n_rows:,}\n"
+            "Exécuter d'abord : python src/01_prepare.py"
+        )
+    return folds
+
+
+def _classifier_path(name: Optional[str]) -> Path:
+    models_dir = _processed_dir() / "models"
+    if name is None:
+        return models_dir / "lda.joblib"
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return models_dir / f"comparison_{slug}.joblib"
+
+
+def load_classifier(name: Optional[str] = None) -> dict:
+    """Charge un classifieur ajusté sur les coordonnées ACM.
+
+    Parameters
+    ----------
+    name : str, optional
+        Nom d'un modèle de ``07_model_comparison.MODELS`` ; par défaut, la
+        LDA de ``05_discriminant.py``.
+
+    Returns
+    -------
+    dict
+        ``{"name", "model", "k_axes", "classes"}`` : estimateur scikit-learn,
+        nombre d'axes ACM en entrée, et code UCI de chaque classe prédite
+        (dans l'ordre de ``model.classes_``).
+
+    Raises
+    ------
+    FileNotFoundError
+        Si le fichier n'existe pas (exécuter ``05`` ou ``07`` d'abord).
+    """
+    import joblib
+
+    path = _classifier_path(name)
+    if not path.exists():
+        script = "05_discriminant.py" if name is None else "07_model_comparison.py"
+        raise FileNotFoundError(
+            f"Classifieur introuvable : {path}\n"
+            f"Exécuter d'abord : python src/{script}"
+        )
+    return joblib.load(path)
+
+
+# ── Figures ────────────────────────────────────────────────
+#
+# Mode ``--figures`` commun aux scripts qui produisent des figures (et
+# transmis par ``pipeline.py --figures``) : ``full`` (300 dpi), ``fast``
+# (basse résolution) ou ``off`` (aucune figure). Les scripts importent
+# matplotlib / seaborn dans leurs blocs de figures, exécutés seulement si
+# :func:`figures_enabled`.
+
+FIGURE_MODES = ("off", "fast", "full")
+FIGURE_MODE = "full"
+FIGURE_DPI = {"fast": 72, "full": 300}
+
+_figure_mode = FIGURE_MODE
+
+
+def set_figure_mode(mode: str) -> None:
+    """Choisit le mode de figures du processus (``FIGURE_MODES``)."""
+    global _figure_mode
+    if mode not in FIGURE_MODES:
+        raise ValueError(f"Mode de figures inconnu : {mode!r} (parmi {', '.join(FIGURE_MODES)})")
+    _figure_mode = mode
+
+
+def figures_enabled() -> bool:
+    """Les figures sont-elles demandées (mode ``fast`` ou ``full``) ?"""
+    return _figure_mode != "off"
+
+
+def add_figure_arguments(parser: argparse.ArgumentParser) -> None:
+    """Ajoute ``--figures`` à l'analyseur d'un script (à appliquer par :func:`set_figure_mode`)."""
+    parser.add_argument("--figures", choices=FIGURE_MODES, default=FIGURE_MODE,
+                        help=f"Figures : off (aucune), fast ({FIGURE_DPI['fast']} dpi) ou full "
+                             f"({FIGURE_DPI['full']} dpi) (défaut : {FIGURE_MODE})")
+
+
 # ── Sauvegarde ─────────────────────────────────────────────
 
-def save_figure(fig: plt.Figure, filename: str, dpi: int = 300) -> Path:
+def save_figure(fig: plt.Figure, filename: str, dpi: Optional[int] = None) -> Path:
     """Sauvegarde une figure matplotlib dans ``reports/figures/``.
 
     Parameters
@@ -83,17 +353,19 @@ def save_figure(fig: plt.Figure, filename: str, dpi: int = 300) -> Path:
         Figure à sauvegarder.
     filename : str
         Nom du fichier (ex: ``acm_scree.png``).
-    dpi : int
-        Résolution (défaut : 300).
+    dpi : int, optional
+        Résolution (défaut : celle du mode de figures, ``FIGURE_DPI``).
 
     Returns
     -------
     Path
         Chemin absolu du fichier sauvegardé.
     """
+    import matplotlib.pyplot as plt
+
     figures_dir = _ensure_dir(get_project_root() / "reports" / "figures")
     filepath = figures_dir / filename
-    fig.savefig(filepath, dpi=dpi, bbox_inches="tight", facecolor="white")
+    fig.savefig(filepath, dpi=dpi or FIGURE_DPI.get(_figure_mode, FIGURE_DPI["full"]), bbox_inches="tight", facecolor="white")
     plt.close(fig)
     print(f"  [figure] {filepath.relative_to(get_project_root())}")
     return filepath
@@ -123,10 +395,275 @@ def save_table(df: pd.DataFrame, filename: str, index: bool = False) -> Path:
     return filepath
 
 
+def save_processed_data(df: pd.DataFrame) -> Path:
+    """Sauvegarde le dataset nettoyé (CSV + Arrow + modalités) dans ``data/processed/``.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataset nettoyé, à colonnes catégorielles.
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier Arrow.
+    """
+    from pyarrow import feather
+
+    processed_dir = _ensure_dir(_processed_dir())
+    modalities = {col: list(df[col].cat.categories) for col in df.columns}
+    (processed_dir / "modalities.json").write_text(
+        json.dumps(modalities, indent=2), encoding="utf-8",
+    )
+    csv_path = processed_dir / "mushroom_processed.csv"
+    df.to_csv(csv_path, index=False)
+    binary = csv_path.with_suffix(".arrow")
+    # Non compressé : condition nécessaire à la projection mémoire sans copie
+    feather.write_feather(df, binary, compression="uncompressed")
+    return binary
+
+
+def save_cv_folds(folds: np.ndarray) -> Path:
+    """Sauvegarde les plis de validation croisée (``cv_folds.npz``).
+
+    Parameters
+    ----------
+    folds : np.ndarray
+        Numéro de pli de chaque individu (cf. ``validation.make_folds``).
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier.
+    """
+    path = _ensure_dir(_processed_dir()) / "cv_folds.npz"
+    np.savez(path, folds=np.asarray(folds, dtype=np.int8))
+    return path
+
+
+def save_mca_coordinates(coords: pd.DataFrame) -> Path:
+    """Sauvegarde les coordonnées ACM (CSV + ``.npy``) dans ``data/processed/``.
+
+    Parameters
+    ----------
+    coords : pd.DataFrame
+        Coordonnées factorielles (colonnes ``Dim1`` ... ``Dimk``).
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier ``.npy``.
+    """
+    processed_dir = _ensure_dir(_processed_dir())
+    csv_path = processed_dir / "mca_coords.csv"
+    coords.to_csv(csv_path, index=False)
+    binary = csv_path.with_suffix(".npy")
+    np.save(binary, np.ascontiguousarray(coords.to_numpy(dtype=np.float64)))
+    return binary
+
+
+def open_mca_coordinates(n_rows: int, n_components: int) -> np.memmap:
+    """Crée ``mca_coords.npy`` et le projette en mémoire en écriture.
+
+    Utilisé par le mode hors mémoire de ``03_mca.py`` : les coordonnées
+    sont écrites bloc par bloc, puis :func:`export_mca_coordinates_csv`
+    produit le CSV.
+
+    Parameters
+    ----------
+    n_rows : int
+        Nombre d'individus.
+    n_components : int
+        Nombre d'axes.
+
+    Returns
+    -------
+    np.memmap
+        Tableau ``float64`` (n_rows x n_components), initialisé à zéro.
+    """
+    binary = _ensure_dir(_processed_dir()) / "mca_coords.npy"
+    return np.lib.format.open_memmap(
+        binary, mode="w+", dtype=np.float64, shape=(n_rows, n_components),
+    )
+
+
+def export_mca_coordinates_csv(chunk_size: int) -> Path:
+    """Écrit ``mca_coords.csv`` à partir de ``mca_coords.npy``, bloc par bloc.
+
+    Parameters
+    ----------
+    chunk_size : int
+        Nombre de lignes par bloc.
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier ``.npy``.
+    """
+    processed_dir = _processed_dir()
+    csv_path = processed_dir / "mca_coords.csv"
+    binary = csv_path.with_suffix(".npy")
+    values = np.load(binary, mmap_mode="r")
+    columns = [f"Dim{i+1}" for i in range(values.shape[1])]
+    with open(csv_path, "w", encoding="utf-8", newline="") as handle:
+        for start in range(0, len(values), chunk_size):
+            block = pd.DataFrame(values[start:start + chunk_size], columns=columns)
+            block.to_csv(handle, index=False, header=start == 0)
+    # Le binaire reste la source de référence des loaders (cf. _fresh_binary)
+    os.utime(binary)
+    return binary
+
+
+def save_mca_model(model) -> Path:
+    """Sauvegarde le modèle ACM (``mca_model.npz``) dans ``data/processed/``.
+
+    Parameters
+    ----------
+    model : mca_engine.MCAModel
+        Modèle à sauvegarder.
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier.
+    """
+    return model.save(_ensure_dir(_processed_dir()) / "mca_model.npz")
+
+
+def save_classifier(model, k_axes: int, name: Optional[str] = None) -> Path:
+    """Sauvegarde un classifieur ajusté dans ``data/processed/models/``.
+
+    Parameters
+    ----------
+    model : estimateur scikit-learn
+        Classifieur ajusté sur les ``k_axes`` premières coordonnées ACM,
+        cible 1 = comestible, 0 = vénéneux.
+    k_axes : int
+        Nombre d'axes ACM en entrée.
+    name : str, optional
+        Nom du modèle (cf. :func:`load_classifier`).
+
+    Returns
+    -------
+    Path
+        Chemin absolu du fichier ``.joblib``.
+    """
+    import joblib
+
+    path = _classifier_path(name)
+    _ensure_dir(path.parent)
+    bundle = {
+        "name": name or "LDA",
+        "model": model,
+        "k_axes": k_axes,
+        "classes": ["e" if c == 1 else "p" for c in model.classes_],
+    }
+    joblib.dump(bundle, path)
+    return path
+
+
+# ── Mesure ─────────────────────────────────────────────────
+
+def proc_status_kb(field: str) -> int:
+    """Champ mémoire de ``/proc/self/status`` (Ko), ex. ``VmRSS``, ``VmHWM`` (Linux).
+
+    Raises
+    ------
+    OSError
+        Hors Linux (fichier absent).
+    KeyError
+        Si le noyau ne publie pas ce champ.
+    """
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+@contextmanager
+def peak_memory() -> Iterator[dict]:
+    """Mesure le pic de mémoire atteint pendant un bloc ``with``.
+
+    Sous Linux, le pic de mémoire résidente du processus est remis à zéro
+    à l'entrée (``/proc/self/clear_refs``) : la mesure couvre aussi les
+    allocations natives (arbres scikit-learn, BLAS). Ailleurs, repli sur
+    le pic des allocations tracées par ``tracemalloc``. Dans les deux cas,
+    le pic du processus entier est remis à zéro : à ne pas utiliser dans un
+    processus profilé (``--profile``), dont les intervalles le relèvent.
+
+    Yields
+    ------
+    dict
+        Rempli à la sortie du bloc : ``peak_mb`` (pic au-dessus de la
+        mémoire à l'entrée, Mo) et ``method`` (``"rss"`` ou ``"tracemalloc"``).
+    """
+    result: dict = {}
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        baseline = proc_status_kb("VmRSS")
+        proc_status_kb("VmHWM")
+    except (OSError, KeyError):
+        import tracemalloc
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        try:
+            yield result
+        finally:
+            result["peak_mb"] = (tracemalloc.get_traced_memory()[1] - baseline) / 2**20
+            result["method"] = "tracemalloc"
+            if started:
+                tracemalloc.stop()
+        return
+    try:
+        yield result
+    finally:
+        result["peak_mb"] = max(0, proc_status_kb("VmHWM") - baseline) / 1024
+        result["method"] = "rss"
+
+
+# ── Parallélisme ───────────────────────────────────────────
+#
+# Budget CPU d'une étape : ``pipeline.py`` le transmet dans
+# ``CPU_BUDGET_VAR``, en partageant ``--cpus`` entre les étapes lancées
+# ensemble. ``OMP_NUM_THREADS`` reste un nombre de threads BLAS par
+# processus : les étapes à pool de processus en dérivent seulement les
+# threads de chaque worker (budget // processus).
+
+CPU_BUDGET_VAR = "PIPELINE_CPUS"
+
+
+def cpu_budget() -> int:
+    """Budget CPU de l'étape : ``PIPELINE_CPUS`` s'il est fixé, sinon le nombre de CPU."""
+    try:
+        return max(1, int(os.environ[CPU_BUDGET_VAR]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
 # ── Affichage ──────────────────────────────────────────────
+#
+# Sous ``--profile`` (cf. ``profiling.py``), chaque section et chaque étape
+# affichées ouvrent un intervalle chronométré du profil.
+
+_profiler = None
+
+
+def set_profiler(profiler) -> None:
+    """Branche (ou débranche, ``None``) le profileur appelé par l'affichage."""
+    global _profiler
+    _profiler = profiler
+
 
 def print_section(title: str) -> None:
     """Affiche un titre de section formaté."""
+    if _profiler is not None:
+        _profiler.section(title)
     width = 60
     print()
     print("=" * width)
@@ -136,4 +673,6 @@ def print_section(title: str) -> None:
 
 def print_step(message: str) -> None:
     """Affiche un message d'étape avec indicateur visuel."""
+    if _profiler is not None:
+        _profiler.step(message)
     print(f"  -> {message}")
@@ -0,0 +1,378 @@
+"""
+Validation croisée partagée — The Mushroom Project.
+
+Les plis sont générés une seule fois (``01_prepare.py``, plis stratifiés
+non mélangés, identiques à ``cv=5`` de scikit-learn) et persistés dans
+``data/processed/cv_folds.npz`` : les étapes 05, 06, 07 et le dashboard
+évaluent leurs modèles sur les mêmes partitions.
+
+:func:`cross_validate` ajuste chaque pli une seule fois et en tire à la
+fois les scores, les prédictions et probabilités hors pli, et la durée
+d'ajustement / de prédiction de chaque pli ; l'ajustement final sur tout
+le jeu (précision d'entraînement, modèle à persister) est optionnel. Les
+plis sont aussi exposés comme unités indépendantes (:func:`fit_fold`,
+:func:`combine_folds`) pour être répartis entre processus.
+
+:func:`lda_sweep` évalue la LDA en forme close à partir de statistiques
+suffisantes (effectifs, sommes et produits croisés par pli et par classe) :
+les statistiques d'entraînement d'un pli sont les statistiques globales
+moins celles du pli, et celles des k premiers axes sont des sous-matrices
+principales. Tous les plis, toutes les valeurs de k et des centaines de
+répétitions sont évalués en deux passes sur les coordonnées.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+# ── Configuration ──────────────────────────────────────────
+
+CHUNK_ROWS = 1 << 15           # lignes par bloc (produits croisés : bloc x d²)
+
+
+# ── Plis ───────────────────────────────────────────────────
+
+def make_folds(y: np.ndarray, n_splits: int) -> np.ndarray:
+    """Affecte chaque individu à un pli de validation.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        Classe de chaque individu.
+    n_splits : int
+        Nombre de plis.
+
+    Returns
+    -------
+    np.ndarray
+        Numéro de pli ``int8`` de chaque individu (plis stratifiés, non
+        mélangés : ``StratifiedKFold(n_splits)``).
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    folds = np.empty(len(y), dtype=np.int8)
+    for fold, (_, test) in enumerate(StratifiedKFold(n_splits).split(np.zeros(len(y)), y)):
+        folds[test] = fold
+    return folds
+
+
+def make_repeated_folds(
+    y: np.ndarray, n_splits: int, n_repeats: int, random_state: Optional[int] = None,
+) -> np.ndarray:
+    """Plis de validation croisée répétée (stratifiés, mélangés à chaque répétition).
+
+    Returns
+    -------
+    np.ndarray
+        Numéros de pli ``int8`` (n_repeats x n).
+    """
+    from sklearn.model_selection import RepeatedStratifiedKFold
+
+    splitter = RepeatedStratifiedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+    folds = np.empty((n_repeats, len(y)), dtype=np.int8)
+    for i, (_, test) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        folds[i // n_splits, test] = i % n_splits
+    return folds
+
+
+def fold_indices(folds: np.ndarray) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Indices ``(train, test)`` de chaque pli, dans l'ordre des plis."""
+    for fold in range(int(folds.max()) + 1):
+        test = folds == fold
+        yield np.flatnonzero(~test), np.flatnonzero(test)
+
+
+# ── Évaluation ─────────────────────────────────────────────
+
+@dataclass
+class CVResult:
+    """Résultat de :func:`cross_validate`.
+
+    Attributes
+    ----------
+    scores : np.ndarray
+        Accuracy de chaque pli.
+    y_pred : np.ndarray
+        Prédiction hors pli de chaque individu.
+    proba : np.ndarray or None
+        Probabilités hors pli (n x classes), si le modèle les fournit.
+    fit_time : np.ndarray
+        Durée d'ajustement de chaque pli (s).
+    predict_time : np.ndarray
+        Durée de prédiction de chaque pli (s).
+    model : estimateur or None
+        Modèle ajusté sur tout le jeu (``refit=True``).
+    train_accuracy : float or None
+        Accuracy du modèle final sur le jeu d'entraînement.
+    """
+
+    scores: np.ndarray
+    y_pred: np.ndarray
+    proba: Optional[np.ndarray]
+    fit_time: np.ndarray
+    predict_time: np.ndarray
+    model: object = None
+    train_accuracy: Optional[float] = None
+
+
+@dataclass
+class FoldFit:
+    """Résultat d'un pli (cf. :func:`fit_fold`).
+
+    Attributes
+    ----------
+    fold : int
+        Numéro du pli.
+    y_pred : np.ndarray
+        Prédictions sur les individus du pli.
+    proba : np.ndarray or None
+        Probabilités sur les individus du pli, si le modèle les fournit.
+    fit_time : float
+        Durée d'ajustement (s).
+    predict_time : float
+        Durée de prédiction (s).
+    """
+
+    fold: int
+    y_pred: np.ndarray
+    proba: Optional[np.ndarray]
+    fit_time: float
+    predict_time: float
+
+
+def fit_fold(model, X: np.ndarray, y: np.ndarray, folds: np.ndarray, fold: int) -> FoldFit:
+    """Ajuste un clone de ``model`` hors du pli ``fold`` et prédit le pli.
+
+    Unité de travail indépendante : les plis d'un ou plusieurs modèles
+    peuvent être répartis entre processus puis réunis par
+    :func:`combine_folds`.
+    """
+    from sklearn.base import clone
+
+    test = folds == fold
+    estimator = clone(model)
+    start = time.perf_counter()
+    estimator.fit(X[~test], y[~test])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = estimator.predict(X[test])
+    predict_time = time.perf_counter() - start
+    proba = estimator.predict_proba(X[test]) if hasattr(estimator, "predict_proba") else None
+    return FoldFit(fold=fold, y_pred=y_pred, proba=proba, fit_time=fit_time, predict_time=predict_time)
+
+
+def combine_folds(y: np.ndarray, folds: np.ndarray, fits: list[FoldFit]) -> CVResult:
+    """Réunit les plis de :func:`fit_fold` en un :class:`CVResult` (sans modèle final).
+
+    Raises
+    ------
+    ValueError
+        S'il manque un pli.
+    """
+    y = np.asarray(y)
+    n_folds = int(folds.max()) + 1
+    fits = sorted(fits, key=lambda fit: fit.fold)
+    if [fit.fold for fit in fits] != list(range(n_folds)):
+        raise ValueError(f"Plis incomplets : {[fit.fold for fit in fits]} sur {n_folds}")
+
+    y_pred = np.empty_like(y)
+    proba = None
+    scores = np.empty(n_folds)
+    for fit in fits:
+        test = folds == fit.fold
+        y_pred[test] = fit.y_pred
+        if fit.proba is not None:
+            if proba is None:
+                proba = np.zeros((len(y), fit.proba.shape[1]))
+            proba[test] = fit.proba
+        scores[fit.fold] = np.mean(fit.y_pred == y[test])
+    return CVResult(
+        scores=scores, y_pred=y_pred, proba=proba,
+        fit_time=np.array([fit.fit_time for fit in fits]),
+        predict_time=np.array([fit.predict_time for fit in fits]),
+    )
+
+
+def cross_validate(model, X: np.ndarray, y: np.ndarray, folds: np.ndarray, refit: bool = True) -> CVResult:
+    """Validation croisée en un ajustement par pli.
+
+    Parameters
+    ----------
+    model : estimateur scikit-learn
+        Modèle à évaluer (non modifié : chaque pli ajuste un clone ; le
+        modèle final est ``model`` lui-même si ``refit``).
+    X : np.ndarray
+        Variables explicatives (n x p).
+    y : np.ndarray
+        Classe de chaque individu.
+    folds : np.ndarray
+        Numéro de pli de chaque individu (cf. :func:`make_folds`).
+    refit : bool
+        Ajuster aussi le modèle sur tout le jeu (défaut : True).
+
+    Returns
+    -------
+    CVResult
+
+    Raises
+    ------
+    ValueError
+        Si ``folds`` et ``y`` n'ont pas la même longueur.
+    """
+    X = np.asarray(X)
+    y = np.asarray(y)
+    if len(folds) != len(y):
+        raise ValueError(f"Plis ({len(folds):,}) et cible ({len(y):,}) de longueurs différentes")
+
+    n_folds = int(folds.max()) + 1
+    result = combine_folds(y, folds, [fit_fold(model, X, y, folds, fold) for fold in range(n_folds)])
+    if refit:
+        model.fit(X, y)
+        result.model = model
+        result.train_accuracy = float(model.score(X, y))
+    return result
+
+
+# ── LDA par statistiques suffisantes ───────────────────────
+
+@dataclass
+class LDASweepResult:
+    """Résultat de :func:`lda_sweep`.
+
+    Attributes
+    ----------
+    k_values : list of int
+        Nombres d'axes évalués.
+    scores : np.ndarray
+        Accuracy de chaque pli (répétitions x plis x k).
+    train_accuracy : np.ndarray
+        Accuracy d'entraînement sur tout le jeu, par k.
+    y_pred : np.ndarray
+        Prédictions hors pli de la première répétition (k x n).
+    """
+
+    k_values: list
+    scores: np.ndarray
+    train_accuracy: np.ndarray
+    y_pred: np.ndarray
+
+    def cv_mean(self) -> np.ndarray:
+        """Accuracy moyenne par k (tous plis, toutes répétitions)."""
+        return self.scores.mean(axis=(0, 1))
+
+    def cv_std(self) -> np.ndarray:
+        """Écart-type des scores entre plis par k, moyenné sur les répétitions."""
+        return self.scores.std(axis=1).mean(axis=0)
+
+
+def _lda_coefficients(counts, sums, cross, k):
+    """Coefficients et constantes LDA (``solver="svd"`` de scikit-learn, rang plein).
+
+    ``counts`` (..., K), ``sums`` (..., K, d), ``cross`` (..., K, d, d) ;
+    covariance intra-classe groupée divisée par n - K, a priori = fréquences
+    des classes.
+    """
+    n_classes = counts.shape[-1]
+    n = counts.sum(axis=-1)
+    means = sums[..., :k] / counts[..., None]
+    scatter = cross[..., :k, :k].sum(axis=-3) - np.einsum("...c,...ci,...cj->...ij", counts, means, means)
+    cov = scatter / (n - n_classes)[..., None, None]
+    coef = np.linalg.solve(cov, np.swapaxes(means, -1, -2))            # (..., k, K)
+    intercept = -0.5 * np.einsum("...ck,...kc->...c", means, coef) + np.log(counts / n[..., None])
+    return coef, intercept
+
+
+def lda_sweep(
+    X: np.ndarray, y: np.ndarray, folds: np.ndarray, k_values: list[int], chunk_size: int = CHUNK_ROWS,
+) -> LDASweepResult:
+    """Validation croisée de la LDA pour plusieurs k, en forme close.
+
+    Première passe (par blocs) : effectifs, sommes et produits croisés
+    ``x xᵀ`` par (répétition, pli, classe) sur ``max(k_values)`` axes. Les
+    statistiques d'entraînement de chaque pli s'en déduisent par
+    soustraction, celles de chaque k par sous-matrice principale ; les
+    coefficients sont obtenus par résolutions de systèmes empilées. Seconde
+    passe : chaque individu est classé par les coefficients de son pli. Les
+    résultats sont ceux de ``LinearDiscriminantAnalysis()`` (solveur
+    ``svd``, a priori empiriques) tant que la covariance intra-classe est
+    de rang plein, aux erreurs d'arrondi près.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Coordonnées (n x d, éventuellement projetées en mémoire).
+    y : np.ndarray
+        Classe de chaque individu.
+    folds : np.ndarray
+        Numéros de pli (n,) ou, pour une validation répétée, (R x n).
+    k_values : list of int
+        Nombres d'axes (premières colonnes de ``X``) à évaluer.
+    chunk_size : int
+        Lignes par bloc.
+
+    Returns
+    -------
+    LDASweepResult
+    """
+    y = np.asarray(y)
+    folds = np.atleast_2d(folds)
+    classes, y_codes = np.unique(y, return_inverse=True)
+    n_repeats, n_folds, n_classes = len(folds), int(folds.max()) + 1, len(classes)
+    d = max(k_values)
+    n_groups = n_folds * n_classes
+
+    # ── Passe 1 : statistiques par (répétition, pli, classe) ──
+    counts = np.zeros((n_repeats, n_groups))
+    sums = np.zeros((n_repeats, n_groups, d))
+    cross = np.zeros((n_repeats, n_groups, d * d))
+    for start in range(0, len(y), chunk_size):
+        block = np.asarray(X[start:start + chunk_size, :d], dtype=np.float64)
+        outer = (block[:, :, None] * block[:, None, :]).reshape(len(block), d * d)
+        block_codes = y_codes[start:start + chunk_size]
+        for r in range(n_repeats):
+            groups = folds[r, start:start + chunk_size].astype(np.int64) * n_classes + block_codes
+            counts[r] += np.bincount(groups, minlength=n_groups)
+            order = np.argsort(groups, kind="stable")
+            present, first = np.unique(groups[order], return_index=True)
+            sums[r, present] += np.add.reduceat(block[order], first)
+            cross[r, present] += np.add.reduceat(outer[order], first)
+    counts = counts.reshape(n_repeats, n_folds, n_classes)
+    sums = sums.reshape(n_repeats, n_folds, n_classes, d)
+    cross = cross.reshape(n_repeats, n_folds, n_classes, d, d)
+
+    # Statistiques d'entraînement : total - pli (identique pour chaque répétition)
+    total = (counts[0].sum(axis=0), sums[0].sum(axis=0), cross[0].sum(axis=0))
+    train = (total[0] - counts, total[1] - sums, total[2] - cross)
+    fold_models = [_lda_coefficients(*train, k) for k in k_values]     # (R, F, k, K), (R, F, K)
+    full_models = [_lda_coefficients(*total, k) for k in k_values]
+
+    # ── Passe 2 : prédictions hors pli et d'entraînement ──
+    correct = np.zeros((n_repeats, n_folds, len(k_values)))
+    train_correct = np.zeros(len(k_values))
+    y_pred = np.empty((len(k_values), len(y)), dtype=y.dtype)
+    for start in range(0, len(y), chunk_size):
+        block = np.asarray(X[start:start + chunk_size, :d], dtype=np.float64)
+        block_codes = y_codes[start:start + chunk_size]
+        for j, k in enumerate(k_values):
+            coef, intercept = full_models[j]
+            train_correct[j] += np.sum((block[:, :k] @ coef + intercept).argmax(axis=1) == block_codes)
+            coef, intercept = fold_models[j]
+            for r in range(n_repeats):
+                block_folds = folds[r, start:start + chunk_size]
+                decision = np.einsum("mk,mkc->mc", block[:, :k], coef[r, block_folds]) + intercept[r, block_folds]
+                pred = decision.argmax(axis=1)
+                correct[r, :, j] += np.bincount(block_folds, weights=pred == block_codes, minlength=n_folds)
+                if r == 0:
+                    y_pred[j, start:start + len(block)] = classes[pred]
+
+    scores = correct / counts.sum(axis=2)[:, :, None]
+    return LDASweepResult(
+        k_values=list(k_values), scores=scores,
+        train_accuracy=train_correct / len(y), y_pred=y_pred,
+    )